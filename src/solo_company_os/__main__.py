@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import sys
+from typing import List, Optional
+
+from .daemon import forward, should_forward
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """`solo-company` entry point: forward to a warm daemon when one serves this directory.
+
+    Only the standard library is loaded before forwarding; the full CLI is imported
+    when the command runs here. `--no-daemon` (or `SCOS_NO_DAEMON=1`) forces a local run.
+    """
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if "--no-daemon" in argv:
+        argv = [a for a in argv if a != "--no-daemon"]
+    elif should_forward(argv):
+        code = forward(argv)
+        if code is not None:
+            sys.exit(code)
+
+    from .cli import app
+
+    app(args=argv, prog_name="solo-company")
+
+
+if __name__ == "__main__":
+    main()
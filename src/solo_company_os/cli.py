@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import json
 import os
-import yaml
+import time
+from contextvars import ContextVar
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 import typer
 from dotenv import load_dotenv
@@ -12,13 +13,29 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
-from .core.orchestrator import run_mission
-from .core.providers.mock import MockProvider
-from .core.providers.openai_compatible import OpenAICompatibleProvider
-from .core.skill_index import DEFAULT_SKILL_DIRS, SkillIndex, discover_skills, validate_skills
-from .core.utils import default_run_dir
-from .dashboard import create_app
-from .integrations.skillsmp import SkillsMPClient
+# Keep module load cheap: FastAPI/uvicorn, httpx, PyYAML, NumPy and the pack writer
+# are imported inside the commands that use them, so `skills list` and `--help`
+# never pay for a web framework or an HTTP stack (see tests/test_cli_startup.py).
+from .core.orchestrator import DEFAULT_REFERENCE_TOKENS, DEFAULT_SKILL_TOP_K, run_mission
+from .core.providers.replay import ReplayMiss, ReplayProvider
+from .core.run_catalog import RunCatalog
+from .core.skill_cache import SkillDiscoveryCache
+from .core.skill_index import (
+    DEFAULT_SKILL_DIRS,
+    DISCOVERY_WORKERS,
+    DiscoveryReport,
+    SkillIndex,
+    discover_skills,
+    validate_skills,
+)
+from .core.skill_pack import PACK_SUFFIX
+from .core.usage import PriceTable, PriceTableError
+from .core.utils import default_run_dir, new_run_id
+
+if TYPE_CHECKING:
+    from .core.providers.base import LLMProvider
+    from .daemon import WarmState
+    from .integrations.skillsmp import SkillsMPClient
 
 app = typer.Typer(
     add_completion=False,
@@ -31,7 +48,25 @@ app.add_typer(skills_app, name="skills")
 skillsmp_app = typer.Typer(help="Search SkillsMP marketplace (optional API key).")
 app.add_typer(skillsmp_app, name="skillsmp")
 
-console = Console()
+runs_app = typer.Typer(help="Manage the run catalog (runs/catalog.sqlite3).")
+app.add_typer(runs_app, name="runs")
+
+_stdout_console = Console()
+_console: ContextVar[Console] = ContextVar("solo_company_console", default=_stdout_console)
+
+
+class _ConsoleProxy:
+    """The module-level `console`; the daemon points it at a per-request Console."""
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(_console.get(), name)
+
+
+console: Console = _ConsoleProxy()  # type: ignore[assignment]
+
+# Set by `solo-company daemon`: skills and providers kept warm across forwarded
+# commands. None in an ordinary one-shot process.
+_warm: Optional["WarmState"] = None
 
 
 def _load_env() -> None:
@@ -39,6 +74,52 @@ def _load_env() -> None:
     load_dotenv(dotenv_path=Path(".env"), override=False)
 
 
+def _discover(skill_dir: List[str], no_skill_cache: bool) -> DiscoveryReport:
+    return _load_skills(skill_dir, no_skill_cache)[0]
+
+
+def _load_skills(skill_dir: List[str], no_skill_cache: bool) -> Tuple[DiscoveryReport, SkillIndex]:
+    roots = list(DEFAULT_SKILL_DIRS) + skill_dir
+    if _warm is not None and not no_skill_cache:
+        # Re-checks the roots' fingerprint (stats only) and reuses the warm index.
+        idx = _warm.skills.get(roots)
+        report = _warm.skills.report(roots)
+        if report is not None:
+            return report, idx
+    cache = None if no_skill_cache else SkillDiscoveryCache()
+    report = discover_skills(roots=roots, console=_console.get(), cache=cache, workers=DISCOVERY_WORKERS)
+    return report, SkillIndex(report.skills, cache=cache)
+
+
+def _build_provider(provider: str, model: Optional[str]) -> "LLMProvider":
+    if provider == "mock":
+        from .core.providers.mock import MockProvider
+
+        return MockProvider()
+    if provider == "openai":
+        from .core.providers.openai_compatible import OpenAICompatibleProvider
+
+        return OpenAICompatibleProvider.from_env(model=model)
+    raise typer.BadParameter("provider must be one of: mock, openai")
+
+
+def _provider(provider: str, model: Optional[str]) -> "LLMProvider":
+    if _warm is not None:
+        return _warm.provider(provider, model, _build_provider)
+    return _build_provider(provider, model)
+
+
+def _print_timings(report: DiscoveryReport) -> None:
+    table = Table(title="Discovery timings")
+    table.add_column("root")
+    table.add_column("folders", justify="right")
+    table.add_column("skills", justify="right")
+    table.add_column("ms", justify="right")
+    for t in report.timings:
+        table.add_row(str(t.root), str(t.folders), str(t.skills), f"{t.seconds * 1000:.1f}")
+    console.print(table)
+
+
 def _resolve_mission_arg(mission: str) -> str:
     """Allow passing a file path as the mission argument.
 
@@ -50,6 +131,8 @@ def _resolve_mission_arg(mission: str) -> str:
     p = Path(mission)
     if p.exists() and p.is_file():
         if p.suffix.lower() in {".yml", ".yaml"}:
+            import yaml
+
             data = yaml.safe_load(p.read_text(encoding="utf-8")) or {}
             m = data.get("mission")
             if not isinstance(m, str) or not m.strip():
@@ -68,14 +151,77 @@ def dashboard(
         "--run-root",
         help="Runs root directory (default: ./runs).",
     ),
+    workers: int = typer.Option(2, "--workers", min=1, help="Missions executed concurrently."),
+    max_queued: int = typer.Option(
+        100, "--max-queued", min=1, help="Waiting runs accepted before submissions get HTTP 429."
+    ),
+    executor: str = typer.Option(
+        "thread", "--executor", help="Where missions run: thread | process (isolated workers)."
+    ),
+    recycle_after: int = typer.Option(
+        20, "--recycle-after", min=1, help="Replace a worker process after N runs (executor=process)."
+    ),
 ) -> None:
     """Start the local dashboard server."""
     import uvicorn
 
-    app_instance = create_app(run_root=run_root)
+    from .dashboard import create_app
+
+    if executor not in ("thread", "process"):
+        raise typer.BadParameter("executor must be one of: thread, process")
+    app_instance = create_app(
+        run_root=run_root,
+        workers=workers,
+        max_queued=max_queued,
+        executor=executor,
+        max_runs_per_worker=recycle_after,
+    )
     uvicorn.run(app_instance, host=host, port=port, log_level="info")
 
 
+@app.command()
+def daemon(
+    stop: bool = typer.Option(False, "--stop", help="Stop the daemon serving this directory."),
+    status: bool = typer.Option(False, "--status", help="Show the daemon's warm state and counters."),
+) -> None:
+    """Keep a warm process for this directory; `run` and `skills` commands are forwarded to it."""
+    from . import daemon as warm_daemon
+
+    path = warm_daemon.socket_path()
+    if stop or status:
+        reply = warm_daemon.request({"op": "stop" if stop else "status"}, path)
+        if reply is None:
+            console.print(f"No daemon is serving {Path.cwd()}")
+            raise typer.Exit(code=1)
+        if stop:
+            console.print("[green]Daemon stopped.[/green]")
+        else:
+            reply.pop("t", None)
+            console.print(Panel.fit(json.dumps(reply, ensure_ascii=False, indent=2), title="Daemon"))
+        return
+    _load_env()
+    try:
+        warm_daemon.serve(path, console=_console.get())
+    except RuntimeError as e:
+        console.print(Panel.fit(str(e), title="Error", border_style="red"))
+        raise typer.Exit(code=1)
+
+
+def _invoke(argv: List[str], out: Console) -> int:
+    """Run one command in this process with its output on `out` (the daemon's side of forwarding)."""
+    token = _console.set(out)
+    try:
+        rv = typer.main.get_command(app).main(args=argv, prog_name="solo-company", standalone_mode=False)
+    except typer.TyperException as e:  # usage errors / bad parameters
+        out.print(f"[red]Error:[/red] {e.format_message()}")  # type: ignore[attr-defined]
+        return int(getattr(e, "exit_code", 2))
+    except typer.Abort:
+        return 1
+    finally:
+        _console.reset(token)
+    return rv if isinstance(rv, int) else 0
+
+
 @app.command()
 def run(
     mission: str = typer.Argument(..., help="The mission / goal statement."),
@@ -100,14 +246,45 @@ def run(
         "--out",
         help="Run directory (default: runs/<run_id>).",
     ),
+    no_skill_cache: bool = typer.Option(
+        False,
+        "--no-skill-cache",
+        help="Re-parse every SKILL.md instead of using the discovery cache.",
+    ),
+    skill_top_k: int = typer.Option(
+        DEFAULT_SKILL_TOP_K,
+        "--skill-top-k",
+        help="Offer the planner only the K skills most relevant to the mission (0 = all).",
+    ),
+    semantic: bool = typer.Option(
+        False,
+        "--semantic",
+        help="Also rank skills with the local embedding index (needs the 'embeddings' extra).",
+    ),
+    reference_tokens: int = typer.Option(
+        DEFAULT_REFERENCE_TOKENS,
+        "--reference-tokens",
+        help="Token budget for skill reference files injected per work order (0 = none).",
+    ),
+    replay: Optional[Path] = typer.Option(
+        None,
+        "--replay",
+        help="Serve the model responses recorded in a previous run directory instead of calling a provider.",
+    ),
+    replay_strict: bool = typer.Option(
+        False, "--replay-strict", help="With --replay: fail on any prompt that was not recorded."
+    ),
+    price_table: Optional[Path] = typer.Option(
+        None,
+        "--price-table",
+        help="JSON file of per-model prices (USD / 1M tokens) for RUN.md cost; default: $SCOS_PRICE_TABLE.",
+    ),
 ) -> None:
     """Run a mission and generate artifacts into a per-run workspace."""
     _load_env()
     mission = _resolve_mission_arg(mission)
 
-    roots = list(DEFAULT_SKILL_DIRS) + skill_dir
-    report = discover_skills(roots=roots, console=console)
-    idx = SkillIndex(report.skills)
+    report, idx = _load_skills(skill_dir, no_skill_cache)
 
     if report.errors:
         console.print(Panel.fit(
@@ -124,29 +301,275 @@ def run(
         ))
         raise typer.Exit(code=2)
 
-    if provider == "mock":
-        prov = MockProvider()
-    elif provider == "openai":
-        prov = OpenAICompatibleProvider.from_env(model=model)
+    if replay is not None:
+        try:
+            prov = ReplayProvider.from_run_dir(replay, strict=replay_strict)
+        except ReplayMiss as e:
+            raise typer.BadParameter(str(e))
+        provider = f"replay ({replay})"
     else:
-        raise typer.BadParameter("provider must be one of: mock, openai")
+        prov = _provider(provider, model)
+
+    embeddings = None
+    if semantic:
+        from .core.skill_embeddings import EmbeddingsUnavailable, load_or_build
+
+        try:
+            embeddings = load_or_build(idx)
+        except EmbeddingsUnavailable as e:
+            raise typer.BadParameter(str(e))
+
+    try:
+        prices = PriceTable.load(price_table)
+    except PriceTableError as e:
+        raise typer.BadParameter(str(e))
 
     run_dir = out or default_run_dir()
     workspace = run_dir / "workspace"
+    # Only runs under the default run root are cataloged; --out may point anywhere.
+    catalog = RunCatalog(run_dir.parent) if out is None else None
 
     console.print(Panel.fit(
         f"Mission: {mission}\nProvider: {provider}\nSkills loaded: {len(idx.skills)}\nRun dir: {run_dir}",
         title="Solo Company OS",
     ))
 
-    run_mission(
-        mission=mission,
-        skill_index=idx,
-        provider=prov,
-        run_dir=run_dir,
-        workspace=workspace,
-        console=console,
+    try:
+        summary = run_mission(
+            mission=mission,
+            skill_index=idx,
+            provider=prov,
+            run_dir=run_dir,
+            workspace=workspace,
+            console=_console.get(),
+            catalog=catalog,
+            skill_top_k=skill_top_k,
+            skill_embeddings=embeddings,
+            reference_tokens=reference_tokens,
+            prices=prices,
+        )
+    except ReplayMiss as e:
+        console.print(Panel.fit(str(e), title="Replay miss", border_style="red"))
+        raise typer.Exit(code=1)
+    if summary.usage is not None and summary.usage.calls:
+        u = summary.usage
+        parts = [f"{u.calls} call(s)", f"{u.latency_s:.2f}s in provider"]
+        if u.prompt_tokens or u.completion_tokens:
+            parts.append(f"{u.prompt_tokens} prompt + {u.completion_tokens} completion tokens")
+        if u.cached_tokens:
+            parts.append(f"{u.cached_tokens} prompt tokens cached")
+        parts.append(f"${u.cost_usd:.4f}" + (f" ({u.unpriced_calls} call(s) unpriced)" if u.unpriced_calls else ""))
+        console.print("Usage: " + ", ".join(parts))
+    if replay is not None:
+        console.print(f"Replayed {prov.hits} recorded response(s), {prov.fallbacks} by fallback.")  # type: ignore[attr-defined]
+
+
+@app.command("eval")
+def eval_scenarios(
+    paths: Optional[List[Path]] = typer.Argument(
+        None, help="Scenario files or directories (default: scenarios/missions)."
+    ),
+    provider: str = typer.Option("mock", "--provider", "-p", help="LLM provider: mock | openai."),
+    model: Optional[str] = typer.Option(None, "--model", help="Model name (for provider=openai)."),
+    workers: int = typer.Option(
+        min(os.cpu_count() or 1, 8), "--workers", "-j", min=1, help="Scenarios evaluated in parallel (processes)."
+    ),
+    out: Optional[Path] = typer.Option(None, "--out", help="Eval directory (default: runs/evals/<eval_id>)."),
+    skill_dir: List[str] = typer.Option([], "--skill-dir", help="Additional skill roots (repeatable)."),
+) -> None:
+    """Run scenario missions in parallel and check their artifacts against `expect:` rules."""
+    from .core.evals import RESULTS_FILE, EvalError, discover_scenarios, run_evals
+
+    _load_env()
+    try:
+        scenarios = discover_scenarios(paths or [Path("scenarios/missions")])
+    except EvalError as e:
+        console.print(Panel.fit(str(e), title="Error", border_style="red"))
+        raise typer.Exit(code=2)
+    if not scenarios:
+        console.print(Panel.fit("No scenario files found.", title="Error", border_style="red"))
+        raise typer.Exit(code=2)
+
+    out_dir = out or Path("runs") / "evals" / new_run_id()
+    console.print(Panel.fit(
+        f"Scenarios: {len(scenarios)}\nProvider: {provider}\nWorkers: {workers}\nOut: {out_dir}",
+        title="Eval",
+    ))
+
+    def on_result(res: Dict[str, Any]) -> None:
+        style = {"passed": "green", "failed": "red"}.get(res["status"], "yellow")
+        console.print(f"[{style}]{res['status']:>6}[/{style}] {res['scenario']}")
+
+    report = run_evals(
+        scenarios,
+        out_dir=out_dir,
+        provider=provider,
+        model=model,
+        skill_dirs=skill_dir,
+        workers=workers,
+        on_result=on_result,
+    )
+
+    table = Table(title="Eval results")
+    table.add_column("scenario")
+    table.add_column("status")
+    table.add_column("checks", justify="right")
+    table.add_column("run s", justify="right")
+    table.add_column("details")
+    for res in report["results"]:
+        failed = [c for c in res["checks"] if not c["ok"]]
+        details = res.get("error") or "; ".join(f"{c['name']}: {c['detail']}".rstrip(": ") for c in failed)
+        table.add_row(
+            res["scenario"],
+            res["status"],
+            f"{len(res['checks']) - len(failed)}/{len(res['checks'])}",
+            f"{res['timings']['run_s']:.2f}",
+            details[:200],
+        )
+    console.print(table)
+    summary = report["summary"]
+    console.print(
+        f"{summary['passed']}/{summary['total']} passed in {summary['wall_s']:.1f}s "
+        f"(scenario time {summary['scenario_s']:.1f}s). Results: {out_dir / RESULTS_FILE}"
     )
+    if summary["passed"] != summary["total"]:
+        raise typer.Exit(code=1)
+
+
+def _batch_missions(paths: List[Path]) -> List[str]:
+    """Missions from backlog files: one per line in text files (# comments), or YAML mission files / dirs."""
+    missions: List[str] = []
+    for path in paths:
+        if path.is_dir():
+            files = sorted(p for p in path.iterdir() if p.suffix.lower() in {".yml", ".yaml"})
+            missions += [_resolve_mission_arg(str(p)) for p in files]
+        elif path.suffix.lower() in {".yml", ".yaml"}:
+            missions.append(_resolve_mission_arg(str(path)))
+        elif path.is_file():
+            lines = path.read_text(encoding="utf-8").splitlines()
+            missions += [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
+        else:
+            raise typer.BadParameter(f"No such backlog file or directory: {path}")
+    return missions
+
+
+@app.command()
+def batch(
+    backlog: Optional[List[Path]] = typer.Argument(
+        None, help="Mission files (one mission per line), YAML mission files or directories of them."
+    ),
+    backend: str = typer.Option("local", "--backend", help="Batch backend: local (offline stand-in) | openai."),
+    model: Optional[str] = typer.Option(None, "--model", help="Model name (for backend=openai)."),
+    out: Optional[Path] = typer.Option(
+        None, "--out", help="Batch state directory (default: runs/batches/<id>); pass it again to resume."
+    ),
+    run_root: Path = typer.Option(Path("runs"), "--run-root", help="Where the runs of the backlog are written."),
+    wait: bool = typer.Option(True, "--wait/--no-wait", help="Poll until done, or submit/check once and exit."),
+    poll_interval: float = typer.Option(60.0, "--poll-interval", help="Seconds between batch status checks."),
+    skill_dir: List[str] = typer.Option([], "--skill-dir", help="Additional skill roots (repeatable)."),
+    no_skill_cache: bool = typer.Option(False, "--no-skill-cache", help="Re-parse every SKILL.md."),
+    skill_top_k: int = typer.Option(DEFAULT_SKILL_TOP_K, "--skill-top-k", help="Skills offered to the planner."),
+    reference_tokens: int = typer.Option(
+        DEFAULT_REFERENCE_TOKENS, "--reference-tokens", help="Token budget for skill reference files."
+    ),
+    price_table: Optional[Path] = typer.Option(None, "--price-table", help="JSON file of per-model prices."),
+) -> None:
+    """Run a backlog of missions through a batch endpoint (no interactive latency, batch pricing)."""
+    from .core.batch import BatchError, BatchRunner, LocalBatchBackend, OpenAIBatchBackend
+
+    _load_env()
+    missions = _batch_missions(backlog or [])
+    if out is None and not missions:
+        raise typer.BadParameter("Pass a backlog of missions, or --out of a batch to resume.")
+    work_dir = out or run_root / "batches" / new_run_id()
+
+    _, idx = _load_skills(skill_dir, no_skill_cache)
+    if not idx.skills:
+        console.print(Panel.fit("No skills found.", title="Error", border_style="red"))
+        raise typer.Exit(code=2)
+    try:
+        prices = PriceTable.load(price_table)
+    except PriceTableError as e:
+        raise typer.BadParameter(str(e))
+
+    try:
+        if backend == "local":
+            backend_impl = LocalBatchBackend(work_dir / "local")
+            model = model or "mock"
+        elif backend == "openai":
+            backend_impl = OpenAIBatchBackend.from_env()
+            model = model or os.environ.get("OPENAI_MODEL") or os.environ.get("SCOS_MODEL") or "gpt-4o-mini"
+        else:
+            raise typer.BadParameter(f"Unknown batch backend: {backend}")
+
+        console.print(Panel.fit(
+            f"Missions: {len(missions) or '(from state)'}\nBackend: {backend} ({model})\nState: {work_dir}",
+            title="Batch",
+        ))
+        runner = BatchRunner(
+            work_dir=work_dir,
+            backend=backend_impl,
+            model=model,
+            skill_index=idx,
+            run_root=run_root,
+            catalog=RunCatalog(run_root),
+            prices=prices,
+            skill_top_k=skill_top_k,
+            reference_tokens=reference_tokens,
+            poll_interval=poll_interval,
+            on_event=console.print,
+        )
+        report = runner.run(missions, wait=wait)
+    except BatchError as e:
+        console.print(Panel.fit(str(e), title="Batch error", border_style="red"))
+        raise typer.Exit(code=1)
+
+    if report["status"] == "pending":
+        console.print(
+            f"Batches still running. Resume with: solo-company batch --out {work_dir} --backend {backend}"
+        )
+        return
+
+    table = Table(title="Batch runs")
+    table.add_column("mission")
+    table.add_column("status")
+    table.add_column("files", justify="right")
+    table.add_column("cost USD", justify="right")
+    table.add_column("run dir / error")
+    failed = 0
+    for row in report["runs"]:
+        failed += row["status"] != "done"
+        usage = row.get("usage") or {}
+        table.add_row(
+            row["mission"][:60],
+            row["status"],
+            str(row.get("files", "-")),
+            f"{usage['cost_usd']:.4f}" if usage else "-",
+            row.get("error") or row["run_dir"],
+        )
+    console.print(table)
+    console.print(
+        f"{len(report['runs']) - failed}/{len(report['runs'])} mission(s) done from {report['requests']} "
+        f"batched request(s) in {len(report['batches'])} batch(es)."
+    )
+    if failed:
+        raise typer.Exit(code=1)
+
+
+@runs_app.command("reconcile")
+def runs_reconcile(
+    run_root: Path = typer.Option(Path("runs"), "--run-root", help="Runs root directory."),
+    full: bool = typer.Option(False, "--full", help="Re-scan runs already in the catalog too."),
+) -> None:
+    """Index runs created out of band (copied folders, older versions, crashes)."""
+    catalog = RunCatalog(run_root)
+    stats = catalog.reconcile(full=full)
+    console.print(Panel.fit(
+        f"Added: {stats['added']}\nUpdated: {stats['updated']}\nRemoved: {stats['removed']}\n"
+        f"Catalog: {catalog.path}",
+        title="Run Catalog",
+        border_style="green",
+    ))
 
 
 @skills_app.command("list")
@@ -155,17 +578,24 @@ def skills_list(
         [],
         "--skill-dir",
         help="Additional skill root directories to scan (can repeat).",
-    )
+    ),
+    no_skill_cache: bool = typer.Option(
+        False,
+        "--no-skill-cache",
+        help="Re-parse every SKILL.md instead of using the discovery cache.",
+    ),
+    timings: bool = typer.Option(False, "--timings", help="Print per-root scan cost."),
 ) -> None:
     """List discovered skills (name + description)."""
-    roots = list(DEFAULT_SKILL_DIRS) + skill_dir
-    report = discover_skills(roots=roots, console=console)
+    report = _discover(skill_dir, no_skill_cache)
     table = Table(title=f"Discovered Skills ({len(report.skills)})")
     table.add_column("name")
     table.add_column("description")
     for s in sorted(report.skills, key=lambda x: x.frontmatter.name):
         table.add_row(s.frontmatter.name, s.frontmatter.description)
     console.print(table)
+    if timings:
+        _print_timings(report)
     if report.errors:
         console.print(Panel.fit(
             "\n".join(["Errors:"] + [f"- {e}" for e in report.errors]),
@@ -180,11 +610,22 @@ def skills_validate(
         [],
         "--skill-dir",
         help="Additional skill root directories to scan (can repeat).",
-    )
+    ),
+    no_skill_cache: bool = typer.Option(
+        False,
+        "--no-skill-cache",
+        help="Re-parse every SKILL.md instead of using the discovery cache.",
+    ),
+    timings: bool = typer.Option(False, "--timings", help="Print per-root scan cost."),
 ) -> None:
     """Validate skills against the basic Agent Skills spec (frontmatter + naming)."""
-    roots = list(DEFAULT_SKILL_DIRS) + skill_dir
-    report = validate_skills(roots=roots)
+    report = validate_skills(
+        roots=list(DEFAULT_SKILL_DIRS) + skill_dir,
+        cache=None if no_skill_cache else SkillDiscoveryCache(),
+        workers=DISCOVERY_WORKERS,
+    )
+    if timings:
+        _print_timings(report)
     if report.errors:
         console.print(Panel.fit(
             "\n".join([f"Found {len(report.errors)} issue(s):"] + [f"- {e}" for e in report.errors]),
@@ -199,16 +640,77 @@ def skills_validate(
     ))
 
 
+@skills_app.command("search")
+def skills_search(
+    query: str = typer.Argument(..., help="What you need, in any wording (English or Chinese)."),
+    top_k: int = typer.Option(10, "--top-k", "-k", help="Number of results."),
+    skill_dir: List[str] = typer.Option([], "--skill-dir", help="Additional skill roots (repeatable)."),
+    no_skill_cache: bool = typer.Option(False, "--no-skill-cache", help="Bypass the discovery cache."),
+) -> None:
+    """Semantic search over local skills (hashed n-gram embeddings, fully offline)."""
+    _, idx = _load_skills(skill_dir, no_skill_cache)
+    from .core.skill_embeddings import EmbeddingsUnavailable, load_or_build
+
+    try:
+        embeddings = load_or_build(idx)
+    except EmbeddingsUnavailable as e:
+        console.print(Panel.fit(str(e), title="Error", border_style="red"))
+        raise typer.Exit(code=2)
+
+    t0 = time.perf_counter()
+    hits = embeddings.search(query, top_k)
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+
+    table = Table(title=f"Skills matching: {query} ({elapsed_ms:.1f} ms over {len(embeddings)} skills)")
+    table.add_column("score", justify="right")
+    table.add_column("name")
+    table.add_column("description")
+    for name, score in hits:
+        ref = idx.require(name)
+        table.add_row(f"{score:.3f}", name, ref.frontmatter.description)
+    console.print(table)
+
+
+@skills_app.command("pack")
+def skills_pack(
+    out: Path = typer.Option(Path("skills" + PACK_SUFFIX), "--out", "-o", help="Pack file to write."),
+    skill_dir: List[str] = typer.Option([], "--skill-dir", help="Additional skill roots (repeatable)."),
+    no_skill_cache: bool = typer.Option(False, "--no-skill-cache", help="Bypass the discovery cache."),
+) -> None:
+    """Compile discovered skills into one memory-mappable pack file.
+
+    Pass the pack as a skill root (`--skill-dir skills.scpack`) to load skills without
+    walking directories or parsing YAML.
+    """
+    report = _discover(skill_dir, no_skill_cache)
+    if report.errors:
+        console.print(Panel.fit(
+            "\n".join(["Skipped (invalid or duplicate):"] + [f"- {e}" for e in report.errors]),
+            title="Warnings",
+            border_style="yellow",
+        ))
+    if not report.skills:
+        console.print(Panel.fit("No skills found.", title="Error", border_style="red"))
+        raise typer.Exit(code=2)
+    from .core.skill_pack import write_skill_pack
+
+    stats = write_skill_pack(report.skills, out)
+    console.print(Panel.fit(
+        f"Skills: {stats['skills']}\nSize: {stats['bytes']} bytes\nPack: {stats['path']}",
+        title="Skill Pack",
+        border_style="green",
+    ))
+
+
 @skills_app.command("show")
 def skills_show(
     name: str = typer.Argument(..., help="Skill name (folder name)."),
     skill_dir: List[str] = typer.Option([], "--skill-dir", help="Additional skill roots (repeatable)."),
     head: int = typer.Option(80, "--head", help="Print first N lines of SKILL.md body."),
+    no_skill_cache: bool = typer.Option(False, "--no-skill-cache", help="Bypass the discovery cache."),
 ) -> None:
     """Show one skill's frontmatter + body preview."""
-    roots = list(DEFAULT_SKILL_DIRS) + skill_dir
-    report = discover_skills(roots=roots, console=console)
-    idx = SkillIndex(report.skills)
+    _, idx = _load_skills(skill_dir, no_skill_cache)
     s = idx.get(name)
     if not s:
         console.print(f"Skill not found: {name}")
@@ -224,16 +726,23 @@ def skills_show(
 def skillsmp_search(
     query: str = typer.Argument(..., help="Search query."),
     ai: bool = typer.Option(False, "--ai", help="Use AI semantic search endpoint."),
-    limit: int = typer.Option(10, "--limit", help="Max results (keyword search only)."),
+    limit: int = typer.Option(10, "--limit", help="Results per page (keyword search only)."),
+    pages: int = typer.Option(1, "--pages", help="Fetch up to N pages concurrently (keyword search only)."),
     sort_by: str = typer.Option("stars", "--sort-by", help="stars|recent (keyword search only)."),
+    base_url: Optional[str] = typer.Option(
+        None, "--base-url", help="API base URL (default: SKILLSMP_BASE_URL or https://skillsmp.com)."
+    ),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Skip the on-disk response cache."),
 ) -> None:
     """Search SkillsMP marketplace.
 
     Requires SKILLSMP_API_KEY env var. See https://skillsmp.com/docs/api
     """
+    from .integrations.skillsmp import SkillsMPClient, extract_items
+
     _load_env()
     try:
-        client = SkillsMPClient.from_env()
+        client = SkillsMPClient.from_env(base_url=base_url)
     except Exception as e:
         console.print(Panel.fit(
             f"{e}\n\nTip: You can still browse in the website: https://skillsmp.com/search",
@@ -242,20 +751,91 @@ def skillsmp_search(
         ))
         raise typer.Exit(code=2)
 
-    if ai:
-        data = client.ai_search(query)
-    else:
-        data = client.keyword_search(query, limit=limit, sort_by=sort_by)
-
-    # Unknown schema: we print a compact view if possible, else raw JSON.
-    table = Table(title="SkillsMP results")
-    table.add_column("field")
-    table.add_column("value")
-    table.add_row("query", query)
-    table.add_row("mode", "ai" if ai else "keyword")
+    with client:
+        if ai:
+            responses = [client.ai_search(query, use_cache=not no_cache)]
+        else:
+            responses = client.keyword_search_pages(
+                query, pages=pages, limit=limit, sort_by=sort_by, use_cache=not no_cache
+            )
+
+    items = [item for data in responses for item in extract_items(data)]
+    if not items:
+        # Unknown schema: print raw JSON.
+        console.print(Panel.fit(
+            json.dumps(responses[0], ensure_ascii=False, indent=2)[:4000], title="response (truncated)"
+        ))
+        return
+
+    table = Table(title=f"SkillsMP results for '{query}' ({'ai' if ai else 'keyword'}, {len(items)})")
+    table.add_column("name")
+    table.add_column("author")
+    table.add_column("stars", justify="right")
+    table.add_column("description")
+    for item in items:
+        table.add_row(
+            str(item.get("name", "")),
+            str(item.get("author", "")),
+            str(item.get("stars", "")),
+            str(item.get("description", ""))[:120],
+        )
     console.print(table)
 
-    console.print(Panel.fit(json.dumps(data, ensure_ascii=False, indent=2)[:4000], title="response (truncated)"))
+
+@skillsmp_app.command("install")
+def skillsmp_install(
+    names: List[str] = typer.Argument(..., help="Skill names to install."),
+    dest: Path = typer.Option(Path(".agents/skills"), "--dest", help="Where to place installed skills."),
+    mirror: Optional[Path] = typer.Option(
+        None, "--mirror", help="Content-addressed archive mirror (default: ~/.cache/solo-company/mirror)."
+    ),
+    offline: bool = typer.Option(False, "--offline", help="Install only from the mirror, no network."),
+    force: bool = typer.Option(False, "--force", help="Replace skills that already exist in --dest."),
+    concurrency: int = typer.Option(4, "--concurrency", help="Parallel downloads."),
+    base_url: Optional[str] = typer.Option(None, "--base-url", help="SkillsMP API base URL."),
+) -> None:
+    """Download skills concurrently, verify and validate them, then place them in --dest."""
+    from .core.utils import default_cache_dir
+    from .integrations.skill_install import SkillInstaller, SkillMirror
+    from .integrations.skillsmp import SkillsMPClient
+
+    _load_env()
+    client: Optional["SkillsMPClient"] = None
+    if not offline:
+        try:
+            client = SkillsMPClient.from_env(base_url=base_url, max_concurrency=concurrency)
+        except Exception as e:
+            console.print(Panel.fit(
+                f"{e}\n\nTip: use --offline --mirror DIR to install from a local mirror.",
+                title="Missing SkillsMP API Key",
+                border_style="yellow",
+            ))
+            raise typer.Exit(code=2)
+
+    try:
+        with SkillInstaller(
+            dest_dir=dest,
+            mirror=SkillMirror(mirror or default_cache_dir() / "mirror"),
+            skillsmp=client,
+            max_concurrency=concurrency,
+            offline=offline,
+            force=force,
+        ) as installer:
+            results = installer.install(names)
+    finally:
+        if client is not None:
+            client.close()
+
+    table = Table(title="SkillsMP install")
+    table.add_column("name")
+    table.add_column("status")
+    table.add_column("detail")
+    for r in results:
+        style = {"installed": "green", "exists": "yellow"}.get(r.status, "red")
+        table.add_row(r.name, f"[{style}]{r.status}[/{style}]", r.detail)
+    console.print(table)
+    if any(r.status == "failed" for r in results):
+        raise typer.Exit(code=1)
 
 
 def main() -> None:
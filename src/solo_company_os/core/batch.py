@@ -0,0 +1,529 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+from rich.console import Console
+
+from .orchestrator import DEFAULT_REFERENCE_TOKENS, DEFAULT_SKILL_TOP_K, run_mission
+from .prompts import EXEC_SCHEMA_HINT, split_system_message
+from .providers.base import CallUsage, LLMProvider, ResponseParseError
+from .providers.mock import MockProvider
+from .providers.openai_compatible import chat_payload, parse_completion
+from .run_catalog import RunCatalog
+from .skill_index import SkillIndex
+from .trace import TraceRecorder
+from .usage import PriceTable
+from .utils import new_run_id
+
+STATE_FILE = "state.json"
+RESULTS_FILE = "results.jsonl"
+REPORT_FILE = "report.json"
+
+CHAT_ENDPOINT = "/v1/chat/completions"
+
+# OpenAI caps one batch at 50,000 requests.
+MAX_BATCH_REQUESTS = 50_000
+
+_TERMINAL = ("completed", "failed", "expired", "cancelled")
+
+
+class BatchError(RuntimeError):
+    pass
+
+
+class BatchRequestFailed(BatchError, ValueError):
+    """One request of a batch failed or expired. A ValueError, so the orchestrator drops that
+    work order (counted and warned about) instead of failing the whole mission."""
+
+
+class _Pending(Exception):
+    """Raised by BatchProvider for a plan call that has no result yet: nothing after it can be built."""
+
+
+@dataclass
+class BatchRequest:
+    custom_id: str
+    body: Dict[str, Any]
+
+    def line(self) -> Dict[str, Any]:
+        return {"custom_id": self.custom_id, "method": "POST", "url": CHAT_ENDPOINT, "body": self.body}
+
+
+@dataclass
+class BatchStatus:
+    id: str
+    status: str  # validating | in_progress | finalizing | completed | failed | expired | cancelled ...
+    output_file_id: Optional[str] = None
+    error_file_id: Optional[str] = None
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def done(self) -> bool:
+        return self.status in _TERMINAL
+
+
+def request_id(body: Dict[str, Any]) -> str:
+    """`custom_id` of a request: identical requests (same model, prompt and params) share a result."""
+    blob = json.dumps(body, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:32]
+
+
+def _jsonl(lines: List[Dict[str, Any]]) -> bytes:
+    return "".join(json.dumps(x, ensure_ascii=False) + "\n" for x in lines).encode("utf-8")
+
+
+def _parse_jsonl(text: str) -> Iterator[Dict[str, Any]]:
+    for line in text.splitlines():
+        if line.strip():
+            yield json.loads(line)
+
+
+class BatchBackend(ABC):
+    """Where batch files are submitted. Result lines use the OpenAI batch output format:
+    `{"custom_id", "response": {"status_code", "body"}, "error"}`."""
+
+    name: str = "unknown"
+    # Whether the backend enforces the `response_format` JSON schemas in request bodies.
+    structured_output: Optional[bool] = None
+
+    @abstractmethod
+    def submit(self, requests: List[BatchRequest]) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def status(self, batch_id: str) -> BatchStatus:
+        raise NotImplementedError
+
+    @abstractmethod
+    def results(self, status: BatchStatus) -> Iterator[Dict[str, Any]]:
+        raise NotImplementedError
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """OpenAI Batch API: upload a JSONL file, create a batch, poll it, download the output file."""
+
+    name = "openai"
+    structured_output = True
+
+    def __init__(
+        self,
+        *,
+        api_key: str,
+        base_url: str = "https://api.openai.com/v1",
+        completion_window: str = "24h",
+        transport: Optional[httpx.BaseTransport] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.completion_window = completion_window
+        self.client = httpx.Client(
+            headers={"Authorization": f"Bearer {api_key}"}, transport=transport, timeout=120
+        )
+
+    @classmethod
+    def from_env(cls) -> "OpenAIBatchBackend":
+        api_key = os.environ.get("OPENAI_API_KEY") or os.environ.get("SCOS_API_KEY")
+        if not api_key:
+            raise BatchError("Missing OPENAI_API_KEY (or SCOS_API_KEY) for the openai batch backend")
+        return cls(api_key=api_key, base_url=os.environ.get("OPENAI_BASE_URL", "https://api.openai.com/v1"))
+
+    def _json(self, resp: httpx.Response) -> Dict[str, Any]:
+        if resp.status_code >= 400:
+            raise BatchError(f"{resp.request.method} {resp.request.url} -> {resp.status_code}: {resp.text[:500]}")
+        return resp.json()
+
+    def submit(self, requests: List[BatchRequest]) -> str:
+        upload = self._json(self.client.post(
+            f"{self.base_url}/files",
+            data={"purpose": "batch"},
+            files={"file": ("batch.jsonl", _jsonl([r.line() for r in requests]), "application/jsonl")},
+        ))
+        batch = self._json(self.client.post(
+            f"{self.base_url}/batches",
+            json={
+                "input_file_id": upload["id"],
+                "endpoint": CHAT_ENDPOINT,
+                "completion_window": self.completion_window,
+            },
+        ))
+        return str(batch["id"])
+
+    def status(self, batch_id: str) -> BatchStatus:
+        data = self._json(self.client.get(f"{self.base_url}/batches/{batch_id}"))
+        errors = [str(e.get("message", e)) for e in ((data.get("errors") or {}).get("data") or [])]
+        return BatchStatus(
+            id=batch_id,
+            status=str(data.get("status")),
+            output_file_id=data.get("output_file_id"),
+            error_file_id=data.get("error_file_id"),
+            errors=errors,
+        )
+
+    def results(self, status: BatchStatus) -> Iterator[Dict[str, Any]]:
+        for file_id in (status.output_file_id, status.error_file_id):
+            if file_id:
+                resp = self.client.get(f"{self.base_url}/files/{file_id}/content")
+                if resp.status_code >= 400:
+                    raise BatchError(f"Cannot download batch file {file_id}: {resp.status_code}")
+                yield from _parse_jsonl(resp.text)
+
+
+class LocalBatchBackend(BatchBackend):
+    """Offline stand-in: keeps batch files under `root/<batch_id>/` and answers them with a
+    local provider (MockProvider by default) when first polled, in the OpenAI output format."""
+
+    name = "local"
+
+    def __init__(self, root: Path, provider: Optional[LLMProvider] = None):
+        self.root = Path(root)
+        self.provider = provider or MockProvider()
+
+    def submit(self, requests: List[BatchRequest]) -> str:
+        batch_id = f"batch_local_{new_run_id()}"
+        path = self.root / batch_id
+        path.mkdir(parents=True, exist_ok=True)
+        (path / "input.jsonl").write_bytes(_jsonl([r.line() for r in requests]))
+        return batch_id
+
+    def status(self, batch_id: str) -> BatchStatus:
+        path = self.root / batch_id
+        if not (path / "input.jsonl").is_file():
+            raise BatchError(f"Unknown local batch {batch_id}")
+        output = path / "output.jsonl"
+        if not output.is_file():
+            lines = _parse_jsonl((path / "input.jsonl").read_text(encoding="utf-8"))
+            output.write_bytes(_jsonl([self._answer(line) for line in lines]))
+        return BatchStatus(id=batch_id, status="completed", output_file_id=str(output))
+
+    def results(self, status: BatchStatus) -> Iterator[Dict[str, Any]]:
+        if status.output_file_id:
+            yield from _parse_jsonl(Path(status.output_file_id).read_text(encoding="utf-8"))
+
+    def _answer(self, line: Dict[str, Any]) -> Dict[str, Any]:
+        body = line["body"]
+        messages = {m["role"]: m["content"] for m in body["messages"]}
+        system, schema_hint = split_system_message(messages.get("system", ""))
+        try:
+            data, call = self.provider.complete_json_with_usage(
+                system=system,
+                user=messages.get("user", ""),
+                schema_hint=schema_hint,
+                temperature=body.get("temperature", 0.2),
+                max_tokens=body.get("max_tokens", 2000),
+            )
+        except Exception as e:
+            return {"custom_id": line["custom_id"], "response": None, "error": {"code": "local", "message": str(e)}}
+        completion: Dict[str, Any] = {
+            "object": "chat.completion",
+            "model": body.get("model") or call.model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": json.dumps(data)}}],
+        }
+        if call.prompt_tokens is not None:
+            completion["usage"] = {"prompt_tokens": call.prompt_tokens, "completion_tokens": call.completion_tokens}
+        return {
+            "custom_id": line["custom_id"],
+            "response": {"status_code": 200, "body": completion},
+            "error": None,
+        }
+
+
+class BatchProvider(LLMProvider):
+    """Answers calls from collected batch results.
+
+    With a `pending` dict it is in collection mode: an unanswered call is added to
+    `pending`; an unanswered execution returns an empty result so the remaining work
+    orders of the plan are still collected, while an unanswered plan raises `_Pending`.
+    Without `pending`, a missing result is an error.
+    """
+
+    name = "batch"
+
+    def __init__(
+        self,
+        model: str,
+        results: Dict[str, Dict[str, Any]],
+        pending: Optional[Dict[str, BatchRequest]] = None,
+        *,
+        structured_output: Optional[bool] = None,
+    ):
+        self.model = model
+        self.results = results
+        self.pending = pending
+        self.structured_output = structured_output
+
+    def complete_json(self, **kwargs: Any) -> Dict[str, Any]:
+        return self.complete_json_with_usage(**kwargs)[0]
+
+    def complete_json_with_usage(
+        self,
+        *,
+        system: str,
+        user: str,
+        schema_hint: str,
+        temperature: float = 0.2,
+        max_tokens: int = 2000,
+        timeout_s: int = 120,
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Dict[str, Any], CallUsage]:
+        body = chat_payload(
+            self.model,
+            system=system,
+            user=user,
+            schema_hint=schema_hint,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            extra=extra,
+        )
+        custom_id = request_id(body)
+        line = self.results.get(custom_id)
+        if line is None:
+            if self.pending is None:
+                raise BatchError(f"No batch result for request {custom_id}")
+            self.pending[custom_id] = BatchRequest(custom_id, body)
+            if schema_hint != EXEC_SCHEMA_HINT:
+                raise _Pending(custom_id)
+            return {"files": [], "summary": "", "warnings": []}, CallUsage(model=self.model)
+        response = line.get("response") or {}
+        if line.get("error") or response.get("status_code", 200) >= 400:
+            detail = line.get("error") or response.get("body")
+            raise BatchRequestFailed(f"Batch request {custom_id} failed: {detail}")
+        try:
+            result, usage = parse_completion(response["body"], self.model)
+        except ResponseParseError as e:
+            if e.usage is not None:
+                self._stamp(e.usage, body)
+            raise
+        self._stamp(usage, body)
+        return result, usage
+
+    def _stamp(self, usage: CallUsage, body: Dict[str, Any]) -> None:
+        usage.batch = True
+        if "response_format" in body:
+            usage.structured = self.structured_output
+
+
+@dataclass
+class _BatchState:
+    missions: List[Dict[str, str]]  # [{"mission", "run_id"}]
+    batches: List[Dict[str, Any]] = field(default_factory=list)  # [{"id", "requests", "status"}]
+
+
+class BatchRunner:
+    """Runs many missions through a batch backend.
+
+    Plans must come back before the work orders exist, so a backlog takes (at least)
+    two batches: all plans, then every work order of every plan. Between batches each
+    mission is re-run dry (quiet, in a scratch dir) to collect the requests that are
+    still unanswered; once nothing is pending, the missions run for real from the
+    collected results and write their run dir, trace and RUN.md as usual.
+
+    Everything lives in `work_dir` (`state.json`, `results.jsonl`), so a killed or
+    `wait=False` invocation resumes where it stopped without resubmitting requests.
+    """
+
+    def __init__(
+        self,
+        *,
+        work_dir: Path,
+        backend: BatchBackend,
+        model: str,
+        skill_index: SkillIndex,
+        run_root: Path = Path("runs"),
+        catalog: Optional[RunCatalog] = None,
+        prices: Optional[PriceTable] = None,
+        skill_top_k: int = DEFAULT_SKILL_TOP_K,
+        reference_tokens: int = DEFAULT_REFERENCE_TOKENS,
+        poll_interval: float = 60.0,
+        on_event: Optional[Callable[[str], None]] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.work_dir = Path(work_dir)
+        self.backend = backend
+        self.model = model
+        self.skill_index = skill_index
+        self.run_root = Path(run_root)
+        self.catalog = catalog
+        self.prices = prices or PriceTable.load()
+        self.skill_top_k = skill_top_k
+        self.reference_tokens = reference_tokens
+        self.poll_interval = poll_interval
+        self.on_event = on_event or (lambda msg: None)
+        self.sleep = sleep
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    # --- state -----------------------------------------------------------------------
+
+    def _load_state(self, missions: List[str]) -> _BatchState:
+        path = self.work_dir / STATE_FILE
+        if path.is_file():
+            state = _BatchState(**json.loads(path.read_text(encoding="utf-8")))
+            if missions and [m["mission"] for m in state.missions] != missions:
+                raise BatchError(f"{self.work_dir} holds a different backlog; use another --out to start a new one")
+        else:
+            if not missions:
+                raise BatchError("No missions to run")
+            state = _BatchState(missions=[{"mission": m, "run_id": new_run_id()} for m in missions])
+        results = self.work_dir / RESULTS_FILE
+        if results.is_file():
+            for line in _parse_jsonl(results.read_text(encoding="utf-8")):
+                self.results[line["custom_id"]] = line
+        return state
+
+    def _save_state(self, state: _BatchState) -> None:
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.work_dir, prefix=".state-", suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(asdict(state), f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.work_dir / STATE_FILE)
+
+    def _store(self, lines: List[Dict[str, Any]]) -> None:
+        with open(self.work_dir / RESULTS_FILE, "a", encoding="utf-8") as f:
+            for line in lines:
+                self.results[line["custom_id"]] = line
+                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+    # --- batches -----------------------------------------------------------------------
+
+    def _collect(self, state: _BatchState) -> Dict[str, BatchRequest]:
+        """Dry-run every mission and return the requests that have no result yet."""
+        pending: Dict[str, BatchRequest] = {}
+        provider = BatchProvider(self.model, self.results, pending)
+        with tempfile.TemporaryDirectory(prefix="scos-batch-") as tmp:
+            for i, m in enumerate(state.missions):
+                run_dir = Path(tmp) / str(i)
+                try:
+                    run_mission(
+                        mission=m["mission"],
+                        skill_index=self.skill_index,
+                        provider=provider,
+                        run_dir=run_dir,
+                        workspace=run_dir / "workspace",
+                        console=Console(file=io.StringIO()),
+                        skill_top_k=self.skill_top_k,
+                        reference_tokens=self.reference_tokens,
+                        prices=self.prices,
+                    )
+                except Exception:
+                    # _Pending (plan not answered yet), or a failed request that fails the
+                    # same way in the final pass, where it is reported per mission.
+                    pass
+        return pending
+
+    def _finish(self, state: _BatchState, entry: Dict[str, Any], status: BatchStatus) -> None:
+        if status.status == "failed":
+            entry["status"] = "failed"
+            self._save_state(state)
+            raise BatchError(f"Batch {status.id} failed: {'; '.join(status.errors) or 'no details'}")
+        wanted = set(entry["requests"])
+        lines = [line for line in self.backend.results(status) if line.get("custom_id") in wanted]
+        # Expired / cancelled batches return what finished; record the rest as failed requests.
+        answered = {line["custom_id"] for line in lines}
+        for custom_id in entry["requests"]:
+            if custom_id not in answered:
+                lines.append({
+                    "custom_id": custom_id,
+                    "response": None,
+                    "error": {"code": status.status, "message": f"batch {status.id} ended {status.status}"},
+                })
+        self._store(lines)
+        entry["status"] = status.status
+        self._save_state(state)
+        self.on_event(f"Batch {status.id} {status.status}: {len(answered)}/{len(entry['requests'])} result(s)")
+
+    def _poll(self, state: _BatchState, wait: bool) -> bool:
+        """Poll in-flight batches; True when none is left in flight."""
+        while True:
+            open_batches = [b for b in state.batches if b["status"] not in _TERMINAL]
+            for entry in open_batches:
+                status = self.backend.status(entry["id"])
+                if status.done:
+                    self._finish(state, entry, status)
+                elif status.status != entry["status"]:
+                    entry["status"] = status.status
+                    self._save_state(state)
+            if all(b["status"] in _TERMINAL for b in state.batches):
+                return True
+            if not wait:
+                return False
+            self.sleep(self.poll_interval)
+
+    def run(self, missions: List[str], *, wait: bool = True) -> Dict[str, Any]:
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        state = self._load_state(missions)
+        self._save_state(state)
+        while True:
+            if not self._poll(state, wait):
+                return self._report(state, "pending", [])
+            pending = self._collect(state)
+            if not pending:
+                break
+            ids = list(pending)
+            for start in range(0, len(ids), MAX_BATCH_REQUESTS):
+                chunk = ids[start : start + MAX_BATCH_REQUESTS]
+                batch_id = self.backend.submit([pending[i] for i in chunk])
+                state.batches.append({"id": batch_id, "requests": chunk, "status": "submitted"})
+                self._save_state(state)
+                self.on_event(f"Submitted batch {batch_id} ({len(chunk)} request(s)) to {self.backend.name}")
+        return self._report(state, "done", self._execute(state))
+
+    def _execute(self, state: _BatchState) -> List[Dict[str, Any]]:
+        provider = BatchProvider(self.model, self.results, structured_output=self.backend.structured_output)
+        batch_ids = [b["id"] for b in state.batches]
+        runs = []
+        for m in state.missions:
+            run_dir = self.run_root / m["run_id"]
+            row: Dict[str, Any] = {"mission": m["mission"], "run_dir": str(run_dir)}
+            trace = TraceRecorder(run_dir / "trace.jsonl")
+            # A resumed final pass rebuilds the run from the same results; start its trace over.
+            trace.path.unlink(missing_ok=True)
+            trace.emit("batch.results", {"backend": self.backend.name, "batches": batch_ids})
+            try:
+                summary = run_mission(
+                    mission=m["mission"],
+                    skill_index=self.skill_index,
+                    provider=provider,
+                    run_dir=run_dir,
+                    workspace=run_dir / "workspace",
+                    console=Console(file=io.StringIO()),
+                    trace=trace,
+                    catalog=self.catalog,
+                    skill_top_k=self.skill_top_k,
+                    reference_tokens=self.reference_tokens,
+                    prices=self.prices,
+                )
+            except Exception as e:
+                row.update(status="error", error=f"{type(e).__name__}: {e}")
+            else:
+                row.update(
+                    status="done",
+                    files=len(summary.written_files),
+                    warnings=len(summary.warnings),
+                    usage=summary.usage.as_dict() if summary.usage is not None else None,
+                )
+            self.on_event(f"{row['status']:>5} {m['mission'][:80]}")
+            runs.append(row)
+        return runs
+
+    def _report(self, state: _BatchState, status: str, runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        report = {
+            "status": status,
+            "backend": self.backend.name,
+            "model": self.model,
+            "batches": state.batches,
+            "requests": sum(len(b["requests"]) for b in state.batches),
+            "runs": runs,
+        }
+        if runs:
+            (self.work_dir / REPORT_FILE).write_text(
+                json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8"
+            )
+        return report
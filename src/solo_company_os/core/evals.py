@@ -0,0 +1,407 @@
+from __future__ import annotations
+
+import io
+import json
+import multiprocessing as mp
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from .trace import utc_now_iso
+
+
+class EvalError(RuntimeError):
+    pass
+
+
+RESULTS_FILE = "results.json"
+
+_HEADING_RE = re.compile(r"^\s{0,3}#{1,6}\s+(.+?)\s*#*\s*$", re.MULTILINE)
+
+_JSON_TYPES: Dict[str, Any] = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "boolean": bool,
+    "null": type(None),
+    "integer": int,
+    "number": (int, float),
+}
+
+_SCHEMA_KEYWORDS = {
+    "type", "required", "properties", "additionalProperties", "items", "enum", "const",
+    "minItems", "maxItems", "minLength", "maxLength", "pattern", "minimum", "maximum",
+    "$schema", "title", "description",
+}
+
+_CHECK_RULES = ("sections", "regex", "not_regex", "json_schema")
+
+
+@dataclass
+class Check:
+    file: str
+    root: str = "workspace"  # workspace | run
+    sections: List[str] = field(default_factory=list)
+    regex: Optional[str] = None
+    not_regex: Optional[str] = None
+    json_schema: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class Scenario:
+    path: Path
+    mission: str
+    files: List[str] = field(default_factory=list)
+    checks: List[Check] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        return self.path.stem
+
+
+@dataclass
+class CheckResult:
+    name: str
+    ok: bool
+    detail: str = ""
+
+
+def load_scenario(path: Path) -> Scenario:
+    """Parse a mission file and its optional `expect:` block.
+
+    ```yaml
+    mission: |
+      ...
+    expect:
+      files: [docs/PRD.md]            # must exist (workspace-relative)
+      checks:
+        - file: docs/PRD.md
+          sections: [Goals, Acceptance criteria]
+        - file: app/main.py
+          regex: "/healthz"
+        - file: plan.json
+          root: run                   # resolve against the run dir instead
+          json_schema: {type: object, required: [mode, work_orders]}
+    ```
+    """
+    import yaml
+
+    try:
+        data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    except (OSError, yaml.YAMLError) as e:
+        raise EvalError(f"Cannot read scenario {path}: {e}") from e
+    mission = data.get("mission") if isinstance(data, dict) else None
+    if not isinstance(mission, str) or not mission.strip():
+        raise EvalError(f"Scenario {path} must contain a non-empty 'mission' field")
+    expect = data.get("expect") or {}
+    if not isinstance(expect, dict):
+        raise EvalError(f"{path}: 'expect' must be a mapping")
+
+    checks: List[Check] = []
+    for i, raw in enumerate(expect.get("checks") or []):
+        where = f"{path}: expect.checks[{i}]"
+        if not isinstance(raw, dict) or not isinstance(raw.get("file"), str):
+            raise EvalError(f"{where} needs a 'file'")
+        unknown = set(raw) - {"file", "root", *_CHECK_RULES}
+        if unknown:
+            raise EvalError(f"{where}: unknown keys {sorted(unknown)}")
+        if not any(raw.get(rule) for rule in _CHECK_RULES):
+            raise EvalError(f"{where}: one of {', '.join(_CHECK_RULES)} is required")
+        if raw.get("root", "workspace") not in ("workspace", "run"):
+            raise EvalError(f"{where}: root must be workspace or run")
+        for key in ("regex", "not_regex"):
+            if raw.get(key):
+                try:
+                    re.compile(raw[key])
+                except re.error as e:
+                    raise EvalError(f"{where}: bad {key}: {e}") from e
+        if raw.get("json_schema") is not None:
+            _check_schema_keywords(raw["json_schema"], where)
+        checks.append(Check(**raw))
+    return Scenario(
+        path=path,
+        mission=mission.strip(),
+        files=[str(f) for f in expect.get("files") or []],
+        checks=checks,
+    )
+
+
+def discover_scenarios(paths: Iterable[Path]) -> List[Scenario]:
+    """Scenario files from the given files and directories (`*.yaml` / `*.yml`, recursive)."""
+    files: List[Path] = []
+    for p in paths:
+        if p.is_dir():
+            files.extend(sorted(f for f in p.rglob("*") if f.suffix.lower() in (".yaml", ".yml")))
+        elif p.is_file():
+            files.append(p)
+        else:
+            raise EvalError(f"No such scenario file or directory: {p}")
+    return [load_scenario(f) for f in files]
+
+
+def markdown_sections(text: str) -> List[str]:
+    return [m.group(1).strip() for m in _HEADING_RE.finditer(text)]
+
+
+def validate_json_schema(value: Any, schema: Dict[str, Any], where: str = "$") -> List[str]:
+    """Errors for `value` against a JSON Schema subset (see `_SCHEMA_KEYWORDS`)."""
+    errors: List[str] = []
+    expected = schema.get("type")
+    if expected is not None:
+        types = expected if isinstance(expected, list) else [expected]
+        if not any(_is_type(value, t) for t in types):
+            return [f"{where}: expected {'/'.join(types)}, got {type(value).__name__}"]
+    if "enum" in schema and value not in schema["enum"]:
+        errors.append(f"{where}: {value!r} not in {schema['enum']!r}")
+    if "const" in schema and value != schema["const"]:
+        errors.append(f"{where}: expected {schema['const']!r}")
+    if isinstance(value, str):
+        if len(value) < schema.get("minLength", 0):
+            errors.append(f"{where}: shorter than {schema['minLength']}")
+        if "maxLength" in schema and len(value) > schema["maxLength"]:
+            errors.append(f"{where}: longer than {schema['maxLength']}")
+        if "pattern" in schema and not re.search(schema["pattern"], value):
+            errors.append(f"{where}: does not match {schema['pattern']!r}")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        if "minimum" in schema and value < schema["minimum"]:
+            errors.append(f"{where}: below {schema['minimum']}")
+        if "maximum" in schema and value > schema["maximum"]:
+            errors.append(f"{where}: above {schema['maximum']}")
+    if isinstance(value, list):
+        if len(value) < schema.get("minItems", 0):
+            errors.append(f"{where}: fewer than {schema['minItems']} items")
+        if "maxItems" in schema and len(value) > schema["maxItems"]:
+            errors.append(f"{where}: more than {schema['maxItems']} items")
+        if isinstance(schema.get("items"), dict):
+            for i, item in enumerate(value):
+                errors.extend(validate_json_schema(item, schema["items"], f"{where}[{i}]"))
+    if isinstance(value, dict):
+        for key in schema.get("required", []):
+            if key not in value:
+                errors.append(f"{where}: missing '{key}'")
+        props = schema.get("properties", {})
+        for key, sub in props.items():
+            if key in value:
+                errors.extend(validate_json_schema(value[key], sub, f"{where}.{key}"))
+        if schema.get("additionalProperties") is False:
+            extra = sorted(set(value) - set(props))
+            if extra:
+                errors.append(f"{where}: unexpected {extra}")
+    return errors
+
+
+def _is_type(value: Any, name: str) -> bool:
+    if name in ("integer", "number") and isinstance(value, bool):
+        return False
+    return isinstance(value, _JSON_TYPES.get(name, ()))
+
+
+def _check_schema_keywords(schema: Any, where: str) -> None:
+    if not isinstance(schema, dict):
+        raise EvalError(f"{where}: json_schema must be a mapping")
+    unknown = set(schema) - _SCHEMA_KEYWORDS
+    if unknown:
+        raise EvalError(f"{where}: unsupported json_schema keywords {sorted(unknown)}")
+    for sub in (schema.get("properties") or {}).values():
+        _check_schema_keywords(sub, where)
+    if isinstance(schema.get("items"), dict):
+        _check_schema_keywords(schema["items"], where)
+
+
+def check_run(scenario: Scenario, run_dir: Path) -> List[CheckResult]:
+    """Apply a scenario's expectations to a finished run directory."""
+    workspace = run_dir / "workspace"
+    results = [CheckResult(f"exists {f}", (workspace / f).is_file()) for f in scenario.files]
+    for check in scenario.checks:
+        target = (run_dir if check.root == "run" else workspace) / check.file
+        try:
+            text = target.read_text(encoding="utf-8")
+        except OSError:
+            results.append(CheckResult(f"read {check.file}", False, "file missing"))
+            continue
+        if check.sections:
+            found = {s.casefold() for s in markdown_sections(text)}
+            missing = [s for s in check.sections if s.casefold() not in found]
+            results.append(
+                CheckResult(f"sections {check.file}", not missing, f"missing: {missing}" if missing else "")
+            )
+        if check.regex:
+            ok = re.search(check.regex, text, re.MULTILINE) is not None
+            results.append(CheckResult(f"regex {check.file}", ok, "" if ok else f"no match for {check.regex!r}"))
+        if check.not_regex:
+            m = re.search(check.not_regex, text, re.MULTILINE)
+            results.append(
+                CheckResult(f"not_regex {check.file}", m is None, f"matched {m.group(0)!r}" if m else "")
+            )
+        if check.json_schema is not None:
+            try:
+                errors = validate_json_schema(json.loads(text), check.json_schema)
+            except ValueError as e:
+                errors = [f"invalid JSON: {e}"]
+            results.append(CheckResult(f"json_schema {check.file}", not errors, "; ".join(errors[:5])))
+    return results
+
+
+# --- worker side ---------------------------------------------------------------
+
+_worker_skills: Any = None
+_worker_providers: Dict[Any, Any] = {}
+
+
+def _init_worker(skill_dirs: Sequence[str]) -> None:
+    """Discover skills once per worker process; every scenario it runs reuses them."""
+    global _worker_skills
+    from .skill_cache import SkillDiscoveryCache
+    from .skill_index import DEFAULT_SKILL_DIRS, SkillIndex, discover_skills
+
+    cache = SkillDiscoveryCache()
+    report = discover_skills(roots=list(DEFAULT_SKILL_DIRS) + list(skill_dirs), cache=cache)
+    cache.save()
+    _worker_skills = SkillIndex(report.skills, cache=cache)
+
+
+def _provider(name: str, model: Optional[str]) -> Any:
+    key = (name, model)
+    if key not in _worker_providers:
+        if name == "mock":
+            from .providers.mock import MockProvider
+
+            _worker_providers[key] = MockProvider()
+        elif name == "openai":
+            from .providers.openai_compatible import OpenAICompatibleProvider
+
+            _worker_providers[key] = OpenAICompatibleProvider.from_env(model=model)
+        else:
+            raise EvalError("provider must be one of: mock, openai")
+    return _worker_providers[key]
+
+
+def _run_scenario(scenario: Scenario, run_dir: Path, provider: str, model: Optional[str]) -> Dict[str, Any]:
+    from rich.console import Console
+
+    from .orchestrator import run_mission
+
+    t0 = time.perf_counter()
+    result: Dict[str, Any] = {
+        "scenario": scenario.name,
+        "path": str(scenario.path),
+        "run_dir": str(run_dir),
+        "worker_pid": os.getpid(),
+    }
+    try:
+        summary = run_mission(
+            mission=scenario.mission,
+            skill_index=_worker_skills,
+            provider=_provider(provider, model),
+            run_dir=run_dir,
+            workspace=run_dir / "workspace",
+            console=Console(file=io.StringIO()),
+        )
+    except Exception as e:
+        result.update(status="error", passed=False, error=f"{type(e).__name__}: {e}", checks=[])
+        result["timings"] = {"run_s": round(time.perf_counter() - t0, 4), "check_s": 0.0}
+        return result
+    t1 = time.perf_counter()
+    checks = check_run(scenario, run_dir)
+    t2 = time.perf_counter()
+    passed = all(c.ok for c in checks)
+    result.update(
+        status="passed" if passed else "failed",
+        passed=passed,
+        warnings=len(summary.warnings),
+        usage=summary.usage.as_dict() if summary.usage is not None else None,
+        structured=summary.structured.as_dict() if summary.structured is not None else None,
+        checks=[asdict(c) for c in checks],
+        timings={"run_s": round(t1 - t0, 4), "check_s": round(t2 - t1, 4)},
+    )
+    return result
+
+
+# --- parent side ---------------------------------------------------------------
+
+
+def _run_dirs(scenarios: Sequence[Scenario], out_dir: Path) -> List[Path]:
+    seen: Dict[str, int] = {}
+    dirs: List[Path] = []
+    for s in scenarios:
+        seen[s.name] = seen.get(s.name, 0) + 1
+        suffix = f"-{seen[s.name]}" if seen[s.name] > 1 else ""
+        dirs.append(out_dir / f"{s.name}{suffix}")
+    return dirs
+
+
+def run_evals(
+    scenarios: Sequence[Scenario],
+    *,
+    out_dir: Path,
+    provider: str = "mock",
+    model: Optional[str] = None,
+    skill_dirs: Sequence[str] = (),
+    workers: int = 1,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """Run every scenario in a process pool, check its run, and write `results.json`.
+
+    Each worker process discovers skills once (initializer) and keeps its provider,
+    so the per-scenario cost is the mission itself plus the checks. Results are
+    reported through `on_result` as they finish and stored in scenario order.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    run_dirs = _run_dirs(scenarios, out_dir)
+    started_at = utc_now_iso()
+    t0 = time.perf_counter()
+    results: List[Optional[Dict[str, Any]]] = [None] * len(scenarios)
+    workers = max(1, min(workers, len(scenarios) or 1))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(list(skill_dirs),),
+    ) as pool:
+        futures = {
+            pool.submit(_run_scenario, s, d, provider, model): i
+            for i, (s, d) in enumerate(zip(scenarios, run_dirs))
+        }
+        for fut in as_completed(futures):
+            i = futures[fut]
+            try:
+                res = fut.result()
+            except Exception as e:  # worker crashed or could not start
+                res = {
+                    "scenario": scenarios[i].name,
+                    "path": str(scenarios[i].path),
+                    "run_dir": str(run_dirs[i]),
+                    "status": "error",
+                    "passed": False,
+                    "error": f"{type(e).__name__}: {e}",
+                    "checks": [],
+                    "timings": {"run_s": 0.0, "check_s": 0.0},
+                }
+            results[i] = res
+            if on_result is not None:
+                on_result(res)
+    wall = time.perf_counter() - t0
+
+    done = [r for r in results if r is not None]
+    report = {
+        "started_at": started_at,
+        "finished_at": utc_now_iso(),
+        "provider": provider,
+        "model": model,
+        "workers": workers,
+        "summary": {
+            "total": len(done),
+            "passed": sum(1 for r in done if r["passed"]),
+            "failed": sum(1 for r in done if r["status"] == "failed"),
+            "errors": sum(1 for r in done if r["status"] == "error"),
+            "wall_s": round(wall, 3),
+            "scenario_s": round(sum(r["timings"]["run_s"] + r["timings"]["check_s"] for r in done), 3),
+        },
+        "results": done,
+    }
+    (out_dir / RESULTS_FILE).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    return report
@@ -3,15 +3,32 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Sequence
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar
 
+from pydantic import BaseModel, ValidationError
 from rich.console import Console
 from rich.table import Table
 
-from .providers.base import LLMProvider
-from .schema import Plan, SkillExecutionResult
+from .prompts import (
+    EXEC_SCHEMA_HINT,
+    EXEC_SYSTEM,
+    PLAN_SCHEMA_HINT,
+    PLAN_SYSTEM,
+    exec_prompt,
+    plan_prompt,
+    repair_prompt,
+)
+from .providers.base import CallUsage, LLMProvider, ResponseParseError, prompt_fingerprint
+from .run_catalog import RunCatalog
+from .schema import Plan, SkillExecutionResult, StructuredOutputStats, response_format
 from .skill_index import SkillIndex
-from .trace import TraceRecorder
+from .trace import TraceRecorder, utc_now_iso
+from .usage import PriceTable, UsageTotals, usage_payload
+
+if TYPE_CHECKING:
+    from .skill_embeddings import SkillEmbeddingIndex
+
+M = TypeVar("M", bound=BaseModel)
 
 
 @dataclass
@@ -21,17 +38,17 @@ class RunSummary:
     plan: Plan
     written_files: List[Path]
     warnings: List[str]
+    cancelled: bool = False
+    usage: Optional[UsageTotals] = None
+    structured: Optional[StructuredOutputStats] = None
 
 
-PLAN_SCHEMA_HINT = "Plan(mode, work_orders[{id,title,skill,outputs[{path,purpose}]}], assumptions[])"
-
-
-EXEC_SCHEMA_HINT = "SkillExecutionResult(files[{path,content}], summary, warnings[])"
+# Skills offered to the planner. Larger catalogs are shortlisted by BM25 relevance to
+# the mission, so the plan prompt does not grow with the number of installed skills.
+DEFAULT_SKILL_TOP_K = 20
 
-
-def _render_skill_list(skills: Sequence[tuple[str, str]]) -> str:
-    # Keep it compact for tokens.
-    return "\n".join([f"- {name}: {desc}" for name, desc in skills])
+# Prompt budget for skill resource files (references/, scripts/, ...) per work order.
+DEFAULT_REFERENCE_TOKENS = 2000
 
 
 def _safe_write_text(path: Path, content: str) -> None:
@@ -48,6 +65,12 @@ def run_mission(
     workspace: Path,
     console: Optional[Console] = None,
     trace: Optional[TraceRecorder] = None,
+    catalog: Optional[RunCatalog] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+    skill_top_k: int = DEFAULT_SKILL_TOP_K,
+    skill_embeddings: Optional["SkillEmbeddingIndex"] = None,
+    reference_tokens: int = DEFAULT_REFERENCE_TOKENS,
+    prices: Optional[PriceTable] = None,
 ) -> RunSummary:
     console = console or Console()
     trace = trace or TraceRecorder(run_dir / "trace.jsonl")
@@ -55,31 +78,152 @@ def run_mission(
     run_dir.mkdir(parents=True, exist_ok=True)
     workspace.mkdir(parents=True, exist_ok=True)
 
-    trace.emit("mission.start", {"mission": mission})
+    if catalog is not None:
+        catalog.record_start(
+            run_dir.name, mission=mission, provider=provider.name, started_at=utc_now_iso()
+        )
+    try:
+        summary = _run_pipeline(
+            mission=mission,
+            skill_index=skill_index,
+            provider=provider,
+            run_dir=run_dir,
+            workspace=workspace,
+            console=console,
+            trace=trace,
+            should_cancel=should_cancel,
+            skill_top_k=skill_top_k,
+            skill_embeddings=skill_embeddings,
+            reference_tokens=reference_tokens,
+            prices=prices or PriceTable.load(),
+        )
+    except Exception as exc:
+        if catalog is not None:
+            catalog.record_finish(
+                run_dir.name, status="error", finished_at=utc_now_iso(), error=str(exc)
+            )
+        raise
+    if catalog is not None:
+        catalog.record_finish(
+            run_dir.name,
+            status="cancelled" if summary.cancelled else "done",
+            finished_at=utc_now_iso(),
+            work_orders=len(summary.plan.work_orders),
+            files_written=len(summary.written_files),
+            warnings=len(summary.warnings),
+        )
+    return summary
+
+
+def _run_pipeline(
+    *,
+    mission: str,
+    skill_index: SkillIndex,
+    provider: LLMProvider,
+    run_dir: Path,
+    workspace: Path,
+    console: Console,
+    trace: TraceRecorder,
+    should_cancel: Optional[Callable[[], bool]],
+    skill_top_k: int,
+    skill_embeddings: Optional["SkillEmbeddingIndex"],
+    reference_tokens: int,
+    prices: PriceTable,
+) -> RunSummary:
+    usage = UsageTotals()
+    stats = StructuredOutputStats()
+    trace.emit("mission.start", {"mission": mission, "provider": provider.name})
+
+    def call_validated(
+        kind: str,
+        model: Type[M],
+        *,
+        step: str,
+        skill: str,
+        system: str,
+        user: str,
+        schema_hint: str,
+        max_tokens: int,
+        request: Dict[str, Any],
+    ) -> Tuple[Optional[M], Optional[str]]:
+        """One model call constrained to `model`'s JSON schema, validated, and retried once with
+        the validation error appended when the output does not fit. A call that fails outright (a
+        plain ValueError, e.g. a failed batch request) is not retried. Returns (result, last error)."""
+        prompt, error = user, None
+        base = {"skill": skill} if skill else {}
+        for attempt in range(2):
+            info = dict(request, repair=attempt) if attempt else dict(request)
+            info["prompt_fp"] = prompt_fingerprint(system=system, user=prompt, schema_hint=schema_hint)
+            trace.emit(f"{kind}.request", info)
+
+            def account(call: CallUsage) -> Dict[str, Any]:
+                cost = prices.cost(call)
+                usage.add(step if attempt == 0 else f"{step} (repair)", skill, call, cost)
+                stats.record(call.structured)
+                return usage_payload(call, cost)
+
+            try:
+                raw, call = provider.complete_json_with_usage(
+                    system=system,
+                    user=prompt,
+                    schema_hint=schema_hint,
+                    temperature=0.2,
+                    max_tokens=max_tokens,
+                    extra={"response_format": response_format(model)},
+                )
+            except ResponseParseError as e:
+                # Answered, but not with JSON: the tokens were billed, and replay needs the text.
+                error = str(e)
+                call_usage = account(e.usage) if e.usage is not None else None
+                trace.emit(
+                    f"{kind}.response", dict(base, raw=None, raw_text=e.raw_text, error=error, usage=call_usage)
+                )
+            except ValueError as e:
+                # The call itself failed (e.g. a failed batch request); a repair prompt cannot help.
+                trace.emit(f"{kind}.error", dict(request, error=str(e), attempt=attempt))
+                return None, str(e)
+            else:
+                trace.emit(f"{kind}.response", dict(base, raw=raw, usage=account(call)))
+                try:
+                    parsed = model.model_validate(raw)
+                except ValidationError as e:
+                    error = str(e)
+                else:
+                    stats.repaired += attempt
+                    return parsed, None
+            stats.invalid += 1
+            trace.emit(f"{kind}.parse_error", dict(request, error=error, attempt=attempt))
+            prompt = repair_prompt(user, error)
+        return None, error
 
     # --- PLAN ---
     available = skill_index.list_compact()
-    plan_user = (
-        f"MISSION: {mission}\n\n"
-        "You are the Supervisor of a small agent company.\n"
-        "Based on the mission and the available skills, output a plan in JSON.\n"
-        "Rules:\n"
-        "- Use ONLY skills from the available list.\n"
-        "- 4-8 work_orders is ideal.\n"
-        "- Each work_order should list expected output file paths.\n\n"
-        "AVAILABLE_SKILLS:\n"
-        + _render_skill_list(available)
-    )
-    trace.emit("plan.request", {"available_skills": len(available)})
-    plan_json = provider.complete_json(
-        system="You are a planner that produces strict JSON.",
-        user=plan_user,
+    if 0 < skill_top_k < len(available):
+        shortlist = skill_index.shortlist(mission, skill_top_k, semantic=skill_embeddings)
+        trace.emit(
+            "plan.shortlist",
+            {
+                "method": "bm25+embedding" if skill_embeddings is not None else "bm25",
+                "k": skill_top_k,
+                "total": len(available),
+                "skills": [{"name": name, "score": round(score, 4)} for name, score in shortlist],
+            },
+        )
+        keep = {name for name, _ in shortlist}
+        available = [item for item in available if item[0] in keep]
+    plan, error = call_validated(
+        "plan",
+        Plan,
+        step="plan",
+        skill="",
+        system=PLAN_SYSTEM,
+        user=plan_prompt(mission, available),
         schema_hint=PLAN_SCHEMA_HINT,
-        temperature=0.2,
         max_tokens=1800,
+        request={"available_skills": len(available)},
     )
-    trace.emit("plan.response", {"raw": plan_json})
-    plan = Plan.model_validate(plan_json)
+    if plan is None:
+        raise ValueError(f"Provider returned an invalid plan (after one repair attempt): {error}")
     _safe_write_text(run_dir / "plan.json", json.dumps(plan.model_dump(), ensure_ascii=False, indent=2))
 
     console.print(f"\n[bold]Plan[/bold] mode={plan.mode} work_orders={len(plan.work_orders)}")
@@ -87,7 +231,14 @@ def run_mission(
     # --- EXECUTE WORK ORDERS ---
     written: List[Path] = []
     warnings: List[str] = []
-    for wo in plan.work_orders:
+    cancelled = False
+    for i, wo in enumerate(plan.work_orders):
+        # Cancellation is cooperative: checked only between work orders.
+        if should_cancel is not None and should_cancel():
+            cancelled = True
+            remaining = len(plan.work_orders) - i
+            warnings.append(f"Run cancelled before {wo.id}; {remaining} work order(s) not executed")
+            break
         trace.emit("work_order.start", {"id": wo.id, "skill": wo.skill, "title": wo.title})
         ref = skill_index.get(wo.skill)
         if not ref:
@@ -97,37 +248,47 @@ def run_mission(
             continue
 
         skill_body = skill_index.load_body(wo.skill)
-        exec_user = (
-            f"MISSION: {mission}\n"
-            f"WORK_ORDER: {wo.id} - {wo.title}\n"
-            f"SKILL: {wo.skill}\n"
-            f"SKILL_DESCRIPTION: {ref.frontmatter.description}\n\n"
-            "Follow the SKILL instructions carefully.\n"
-            "You MUST generate files as requested by the work order outputs.\n"
-            "Return ONLY JSON matching the schema hint.\n\n"
-            "WORK_ORDER_OUTPUTS:\n"
-            + "\n".join([f"- {o.path}: {o.purpose or ''}" for o in wo.outputs])
-            + "\n\n"
-            "SKILL_INSTRUCTIONS:\n"
-            + skill_body
+        references = skill_index.select_references(
+            wo.skill,
+            "\n".join([mission, wo.title] + [f"{o.path} {o.purpose or ''}" for o in wo.outputs]),
+            reference_tokens,
         )
-
-        trace.emit("skill.exec.request", {"skill": wo.skill, "work_order": wo.id})
-        result_json = provider.complete_json(
-            system="You are a reliable executor. Output JSON only.",
+        if references:
+            trace.emit(
+                "skill.references",
+                {
+                    "skill": wo.skill,
+                    "work_order": wo.id,
+                    "budget": reference_tokens,
+                    "files": [
+                        {"path": res.path, "tokens": res.approx_tokens, "score": score}
+                        for res, _text, score in references
+                    ],
+                },
+            )
+        exec_user = exec_prompt(
+            skill=wo.skill,
+            description=ref.frontmatter.description,
+            body=skill_body,
+            references=[(res.path, text) for res, text, _score in references],
+            mission=mission,
+            work_order=f"{wo.id} - {wo.title}",
+            outputs=[(o.path, o.purpose or "") for o in wo.outputs],
+        )
+        result, error = call_validated(
+            "skill.exec",
+            SkillExecutionResult,
+            step=wo.id,
+            skill=wo.skill,
+            system=EXEC_SYSTEM,
             user=exec_user,
             schema_hint=EXEC_SCHEMA_HINT,
-            temperature=0.2,
             max_tokens=2500,
+            request={"skill": wo.skill, "work_order": wo.id},
         )
-        trace.emit("skill.exec.response", {"skill": wo.skill, "raw": result_json})
-
-        try:
-            result = SkillExecutionResult.model_validate(result_json)
-        except Exception as e:
-            w = f"Failed to parse execution result for {wo.skill}: {e}"
-            warnings.append(w)
-            trace.emit("skill.exec.parse_error", {"skill": wo.skill, "error": str(e)})
+        if result is None:
+            stats.dropped += 1
+            warnings.append(f"Failed to parse execution result for {wo.skill}: {error}")
             continue
 
         for gf in result.files:
@@ -159,9 +320,19 @@ def run_mission(
         report_lines.append("\n## Warnings\n\n")
         for w in warnings:
             report_lines.append(f"- {w}\n")
+    report_lines.append("\n" + usage.markdown())
+    report_lines.append("\n" + stats.markdown())
     _safe_write_text(run_dir / "RUN.md", "".join(report_lines))
 
-    trace.emit("mission.done", {"files_written": len(written), "warnings": len(warnings)})
+    trace.emit(
+        "mission.cancelled" if cancelled else "mission.done",
+        {
+            "files_written": len(written),
+            "warnings": len(warnings),
+            "usage": usage.as_dict(),
+            "structured": stats.as_dict(),
+        },
+    )
 
     # Pretty table output
     table = Table(title="Artifacts")
@@ -171,5 +342,17 @@ def run_mission(
         table.add_row(str(p.relative_to(workspace)), str(p.stat().st_size))
     console.print(table)
 
-    console.print(f"\n[green]Done.[/green] Run directory: {run_dir}")
-    return RunSummary(run_dir=run_dir, workspace=workspace, plan=plan, written_files=written, warnings=warnings)
+    if cancelled:
+        console.print(f"\n[yellow]Cancelled.[/yellow] Run directory: {run_dir}")
+    else:
+        console.print(f"\n[green]Done.[/green] Run directory: {run_dir}")
+    return RunSummary(
+        run_dir=run_dir,
+        workspace=workspace,
+        plan=plan,
+        written_files=written,
+        warnings=warnings,
+        cancelled=cancelled,
+        usage=usage,
+        structured=stats,
+    )
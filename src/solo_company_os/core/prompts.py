@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Sequence, Tuple
+
+# Provider-side prompt caches (OpenAI, DeepSeek, vLLM prefix caching) only reuse the
+# longest byte-identical prefix of a request, so prompts are laid out static first:
+#   system message: fixed per call kind (role + JSON rules + schema hint)
+#   user message:   rules -> skill block -> references -> mission / work order
+# Executions of the same skill then share everything up to the references. Keep
+# per-run values (mission, ids, paths, timestamps) out of the static parts.
+
+PLAN_SYSTEM = "You are a planner that produces strict JSON."
+EXEC_SYSTEM = "You are a reliable executor. Output JSON only."
+
+PLAN_SCHEMA_HINT = "Plan(mode, work_orders[{id,title,skill,outputs[{path,purpose}]}], assumptions[])"
+EXEC_SCHEMA_HINT = "SkillExecutionResult(files[{path,content}], summary, warnings[])"
+
+_PLAN_RULES = (
+    "You are the Supervisor of a small agent company.\n"
+    "Based on the mission and the available skills, output a plan in JSON.\n"
+    "Rules:\n"
+    "- Use ONLY skills from the available list.\n"
+    "- 4-8 work_orders is ideal.\n"
+    "- Each work_order should list expected output file paths.\n\n"
+)
+
+_SCHEMA_HINT_PREFIX = "\nSchema hint: "
+
+_EXEC_RULES = (
+    "Follow the SKILL instructions carefully.\n"
+    "You MUST generate files as requested by the work order outputs.\n"
+    "Return ONLY JSON matching the schema hint.\n\n"
+)
+
+
+@lru_cache(maxsize=16)
+def system_message(system: str, schema_hint: str) -> str:
+    """The full system message a provider sends: identical for every call of one kind."""
+    return (
+        system
+        + "\n\n"
+        + "You MUST output ONLY valid JSON. No Markdown fences, no commentary."
+        + _SCHEMA_HINT_PREFIX
+        + schema_hint
+    )
+
+
+def split_system_message(message: str) -> Tuple[str, str]:
+    """Inverse of `system_message`: (system, schema_hint) from a recorded request body."""
+    head, sep, schema_hint = message.rpartition(_SCHEMA_HINT_PREFIX)
+    if not sep:
+        return message, ""
+    return head.split("\n\n", 1)[0], schema_hint
+
+
+def _render_skill_list(skills: Sequence[Tuple[str, str]]) -> str:
+    # Keep it compact for tokens.
+    return "\n".join([f"- {name}: {desc}" for name, desc in skills])
+
+
+def plan_prompt(mission: str, skills: Sequence[Tuple[str, str]]) -> str:
+    return _PLAN_RULES + "AVAILABLE_SKILLS:\n" + _render_skill_list(skills) + f"\n\nMISSION: {mission}\n"
+
+
+@lru_cache(maxsize=128)
+def skill_preamble(skill: str, description: str, body: str) -> str:
+    """Rules plus the skill block: the cacheable prefix shared by every execution of `skill`."""
+    return (
+        _EXEC_RULES
+        + f"SKILL: {skill}\n"
+        + f"SKILL_DESCRIPTION: {description}\n\n"
+        + "SKILL_INSTRUCTIONS:\n"
+        + body.rstrip()
+        + "\n\n"
+    )
+
+
+def exec_prompt(
+    *,
+    skill: str,
+    description: str,
+    body: str,
+    references: Sequence[Tuple[str, str]],
+    mission: str,
+    work_order: str,
+    outputs: Sequence[Tuple[str, str]],
+) -> str:
+    """`references` are (path, text) pairs; `outputs` are (path, purpose) pairs."""
+    parts = [skill_preamble(skill, description, body)]
+    if references:
+        parts.append("SKILL_REFERENCES:\n" + "\n\n".join(f"--- {path} ---\n{text}" for path, text in references))
+        parts.append("\n\n")
+    parts.append(f"MISSION: {mission}\nWORK_ORDER: {work_order}\n\n")
+    parts.append("WORK_ORDER_OUTPUTS:\n" + "\n".join(f"- {path}: {purpose}" for path, purpose in outputs) + "\n")
+    return "".join(parts)
+
+
+def repair_prompt(user: str, error: str) -> str:
+    """Retry prompt for an output that failed validation; appended, so the cached prefix still applies."""
+    return (
+        user
+        + "\nPREVIOUS_OUTPUT_INVALID:\n"
+        + error[:2000]
+        + "\nReturn the complete, corrected JSON only, matching the schema hint.\n"
+    )
@@ -1,8 +1,43 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+
+def prompt_fingerprint(*, system: str, user: str, schema_hint: str) -> str:
+    """Stable id of one `complete_json` prompt; recorded in traces as `prompt_fp`."""
+    blob = json.dumps([system, user, schema_hint], ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:32]
+
+
+@dataclass
+class CallUsage:
+    """Accounting for one provider call. Token counts are None when the provider did not report them."""
+
+    model: str
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    cached_tokens: Optional[int] = None  # part of prompt_tokens served from the provider's prompt cache
+    ttfb_s: Optional[float] = None  # request sent -> response headers received
+    latency_s: float = 0.0  # request sent -> response fully read and parsed
+    batch: bool = False  # served by a batch job (billed at the batch discount)
+    # JSON-schema `response_format`: True = enforced by the backend, False = requested but
+    # rejected (the call fell back to the prompt hint), None = not supported by this provider.
+    structured: Optional[bool] = None
+
+
+class ResponseParseError(ValueError):
+    """The model answered, but not with JSON. Carries the raw text and the call's usage,
+    since the tokens were billed and the repair retry / replay need them."""
+
+    def __init__(self, message: str, *, raw_text: str, usage: Optional[CallUsage] = None):
+        super().__init__(message)
+        self.raw_text = raw_text
+        self.usage = usage
 
 
 @dataclass
@@ -18,6 +53,9 @@ class LLMProvider(ABC):
     - provide `complete_json()` for structured outputs.
     """
 
+    # Short identifier recorded in traces and the run catalog.
+    name: str = "unknown"
+
     @abstractmethod
     def complete_json(
         self,
@@ -31,3 +69,32 @@ class LLMProvider(ABC):
         extra: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         raise NotImplementedError
+
+    def complete_json_with_usage(
+        self,
+        *,
+        system: str,
+        user: str,
+        schema_hint: str,
+        temperature: float = 0.2,
+        max_tokens: int = 2000,
+        timeout_s: int = 120,
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Dict[str, Any], CallUsage]:
+        """`complete_json` plus usage. Providers that see token counts override this."""
+        t0 = time.perf_counter()
+        try:
+            data = self.complete_json(
+                system=system,
+                user=user,
+                schema_hint=schema_hint,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout_s=timeout_s,
+                extra=extra,
+            )
+        except ResponseParseError as e:
+            if e.usage is None:
+                e.usage = CallUsage(model=self.name, latency_s=time.perf_counter() - t0)
+            raise
+        return data, CallUsage(model=self.name, latency_s=time.perf_counter() - t0)
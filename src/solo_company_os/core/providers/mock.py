@@ -22,6 +22,8 @@ class MockProvider(LLMProvider):
     - CI can run end-to-end
     """
 
+    name = "mock"
+
     def complete_json(
         self,
         *,
@@ -41,7 +43,7 @@ class MockProvider(LLMProvider):
         return {"ok": True, "note": "mock provider fallback", "schema_hint": schema_hint}
 
     def _extract_mission(self, user: str) -> str:
-        m = re.search(r"MISSION:\s*(.+)", user)
+        m = re.search(r"^MISSION:\s*(.+)", user, re.MULTILINE)
         if m:
             return m.group(1).strip()
         # fallback: use first line
@@ -116,7 +118,7 @@ class MockProvider(LLMProvider):
     def _execute(self, user: str) -> Dict[str, Any]:
         # Try to detect skill name
         skill = "unknown-skill"
-        m = re.search(r"SKILL:\s*([a-z0-9-]+)", user)
+        m = re.search(r"^SKILL:\s*([a-z0-9-]+)", user, re.MULTILINE)
         if m:
             skill = m.group(1)
 
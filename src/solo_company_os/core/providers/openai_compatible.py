@@ -3,13 +3,15 @@ from __future__ import annotations
 import json
 import os
 import re
+import threading
+import time
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import httpx
 
-from .base import LLMProvider
-
+from ..prompts import system_message
+from .base import CallUsage, LLMProvider, ResponseParseError
 
 _JSON_RE = re.compile(r"\{.*\}", re.DOTALL)
 
@@ -31,12 +33,35 @@ def _extract_json(text: str) -> Dict[str, Any]:
         return json.loads(m.group(0))
 
 
+def _rejects_response_format(resp: httpx.Response) -> bool:
+    """A 400/422 that blames the schema request itself; other client errors (context length,
+    unknown model, bad parameters) are real and must surface unchanged."""
+    if resp.status_code not in (400, 422):
+        return False
+    text = resp.text.lower()
+    return "response_format" in text or "json_schema" in text
+
+
+def _cached_tokens(usage: Dict[str, Any]) -> Optional[int]:
+    """Prompt tokens served from the provider's prompt cache, if the backend reports them."""
+    details = usage.get("prompt_tokens_details")
+    if isinstance(details, dict) and details.get("cached_tokens") is not None:
+        return int(details["cached_tokens"])
+    # DeepSeek-style gateways report the hit count at the top level.
+    if usage.get("prompt_cache_hit_tokens") is not None:
+        return int(usage["prompt_cache_hit_tokens"])
+    return None
+
+
 @dataclass
 class OpenAICompatibleConfig:
     api_key: str
     base_url: str = "https://api.openai.com/v1"
     model: str = "gpt-4o-mini"  # placeholder default; override in env/CLI
     headers: Optional[Dict[str, str]] = None
+    # Send JSON-schema `response_format`s passed by the orchestrator. Backends that reject
+    # them are detected on the first 400 and get the prompt hint only from then on.
+    structured_output: bool = True
 
 
 class OpenAICompatibleProvider(LLMProvider):
@@ -48,11 +73,30 @@ class OpenAICompatibleProvider(LLMProvider):
     NOTE: In real usage you may want:
     - retries with backoff
     - streaming
-    - structured output features (if your provider supports them)
     """
 
-    def __init__(self, config: OpenAICompatibleConfig):
+    name = "openai"
+
+    def __init__(self, config: OpenAICompatibleConfig, *, transport: Optional[httpx.BaseTransport] = None):
         self.config = config
+        self._transport = transport  # tests pass httpx.MockTransport
+        self._client: Optional[httpx.Client] = None
+        self._lock = threading.Lock()
+        self._schema_rejected = False
+
+    @property
+    def client(self) -> httpx.Client:
+        """One pooled connection per provider, so repeated calls reuse keep-alive/TLS."""
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(transport=self._transport)
+            return self._client
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
 
     @classmethod
     def from_env(cls, *, model: Optional[str] = None) -> "OpenAICompatibleProvider":
@@ -61,7 +105,8 @@ class OpenAICompatibleProvider(LLMProvider):
             raise RuntimeError("Missing OPENAI_API_KEY (or SCOS_API_KEY) for openai provider")
         base_url = os.environ.get("OPENAI_BASE_URL", "https://api.openai.com/v1")
         model = model or os.environ.get("OPENAI_MODEL") or os.environ.get("SCOS_MODEL") or "gpt-4o-mini"
-        return cls(OpenAICompatibleConfig(api_key=api_key, base_url=base_url, model=model))
+        structured = os.environ.get("SCOS_STRUCTURED_OUTPUT", "1").lower() not in ("0", "false", "no")
+        return cls(OpenAICompatibleConfig(api_key=api_key, base_url=base_url, model=model, structured_output=structured))
 
     def complete_json(
         self,
@@ -74,6 +119,27 @@ class OpenAICompatibleProvider(LLMProvider):
         timeout_s: int = 120,
         extra: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
+        return self.complete_json_with_usage(
+            system=system,
+            user=user,
+            schema_hint=schema_hint,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout_s=timeout_s,
+            extra=extra,
+        )[0]
+
+    def complete_json_with_usage(
+        self,
+        *,
+        system: str,
+        user: str,
+        schema_hint: str,
+        temperature: float = 0.2,
+        max_tokens: int = 2000,
+        timeout_s: int = 120,
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Dict[str, Any], CallUsage]:
         url = self.config.base_url.rstrip("/") + "/chat/completions"
         headers = {
             "Authorization": f"Bearer {self.config.api_key}",
@@ -82,34 +148,101 @@ class OpenAICompatibleProvider(LLMProvider):
         if self.config.headers:
             headers.update(self.config.headers)
 
-        # We strongly nudge JSON-only output. For reliability, keep prompts short and explicit.
-        system_msg = (
-            system
-            + "\n\n"
-            + "You MUST output ONLY valid JSON. No Markdown fences, no commentary."
-            + f"\nSchema hint: {schema_hint}"
+        extra = dict(extra or {})
+        structured: Optional[bool] = None
+        if extra.get("response_format", {}).get("type") == "json_schema":
+            structured = self.config.structured_output and not self._schema_rejected
+            if not structured:
+                extra.pop("response_format")
+                structured = False if self.config.structured_output else None
+        payload = chat_payload(
+            self.config.model,
+            system=system,
+            user=user,
+            schema_hint=schema_hint,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            extra=extra,
         )
 
-        payload: Dict[str, Any] = {
-            "model": self.config.model,
-            "messages": [
-                {"role": "system", "content": system_msg},
-                {"role": "user", "content": user},
-            ],
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-        }
-        if extra:
-            payload.update(extra)
-
-        with httpx.Client(timeout=timeout_s) as client:
-            resp = client.post(url, headers=headers, json=payload)
-            resp.raise_for_status()
-            data = resp.json()
-
+        t0 = time.perf_counter()
+        resp, ttfb = self._post(url, headers, payload, timeout_s)
+        if structured and _rejects_response_format(resp):
+            # The backend does not take json_schema response formats: stop sending them.
+            self._schema_rejected = True
+            structured = False
+            payload.pop("response_format")
+            resp, ttfb = self._post(url, headers, payload, timeout_s)
+        resp.raise_for_status()
         try:
-            content = data["choices"][0]["message"]["content"]
-        except Exception as e:
-            raise RuntimeError(f"Unexpected response schema from provider: {data}") from e
-
-        return _extract_json(content)
+            result, usage = parse_completion(resp.json(), self.config.model)
+        except ResponseParseError as e:
+            # The tokens of an unparseable answer were billed too.
+            if e.usage is not None:
+                _stamp(e.usage, structured=structured, ttfb=ttfb, t0=t0)
+            raise
+        _stamp(usage, structured=structured, ttfb=ttfb, t0=t0)
+        return result, usage
+
+    def _post(
+        self, url: str, headers: Dict[str, str], payload: Dict[str, Any], timeout_s: int
+    ) -> Tuple[httpx.Response, float]:
+        t0 = time.perf_counter()
+        # Streamed so the time to the response headers (TTFB) can be told apart from
+        # the time spent receiving the body.
+        with self.client.stream("POST", url, headers=headers, json=payload, timeout=timeout_s) as resp:
+            ttfb = time.perf_counter() - t0
+            resp.read()
+        return resp, ttfb
+
+
+def _stamp(usage: CallUsage, *, structured: Optional[bool], ttfb: float, t0: float) -> None:
+    usage.structured = structured
+    usage.ttfb_s = ttfb
+    usage.latency_s = time.perf_counter() - t0
+
+
+def chat_payload(
+    model: str,
+    *,
+    system: str,
+    user: str,
+    schema_hint: str,
+    temperature: float = 0.2,
+    max_tokens: int = 2000,
+    extra: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """The `/chat/completions` request body; also the `body` of a batch request line."""
+    payload: Dict[str, Any] = {
+        "model": model,
+        "messages": [
+            # Byte-identical per call kind, so it stays inside the provider's prompt cache.
+            {"role": "system", "content": system_message(system, schema_hint)},
+            {"role": "user", "content": user},
+        ],
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }
+    if extra:
+        payload.update(extra)
+    return payload
+
+
+def parse_completion(data: Dict[str, Any], model: str) -> Tuple[Dict[str, Any], CallUsage]:
+    """JSON result and token usage from a chat completion body (timings are left to the caller)."""
+    try:
+        content = data["choices"][0]["message"]["content"]
+    except Exception as e:
+        raise RuntimeError(f"Unexpected response schema from provider: {data}") from e
+
+    usage = data.get("usage") if isinstance(data.get("usage"), dict) else {}
+    call = CallUsage(
+        model=str(data.get("model") or model),
+        prompt_tokens=usage.get("prompt_tokens"),
+        completion_tokens=usage.get("completion_tokens"),
+        cached_tokens=_cached_tokens(usage),
+    )
+    try:
+        return _extract_json(content), call
+    except ValueError as e:
+        raise ResponseParseError(f"Model did not return JSON: {e}", raw_text=str(content), usage=call) from e
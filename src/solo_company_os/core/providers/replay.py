@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import copy
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base import LLMProvider, ResponseParseError, prompt_fingerprint
+
+
+_SKILL_RE = re.compile(r"^SKILL: (.+)$", re.MULTILINE)
+
+# request event -> the event that carries its raw response
+_RESPONSES = {"plan.request": "plan.response", "skill.exec.request": "skill.exec.response"}
+
+Kind = Tuple[str, str]  # ("plan", "") | ("exec", skill)
+
+
+class ReplayMiss(RuntimeError):
+    pass
+
+
+class _Unparsed:
+    """A recorded answer that was not JSON (`raw_text`); replaying it raises the same parse error."""
+
+    def __init__(self, text: str, error: str):
+        self.text = text
+        self.error = error
+
+
+class _Responses:
+    """Recorded responses for one key; repeats serve them in order, then the last one."""
+
+    def __init__(self) -> None:
+        self.items: List[Any] = []
+        self.next = 0
+
+    def take(self) -> Any:
+        item = self.items[min(self.next, len(self.items) - 1)]
+        self.next += 1
+        return copy.deepcopy(item)
+
+
+class ReplayProvider(LLMProvider):
+    """Serves the model responses recorded in a run's `trace.jsonl`; no network, no cost.
+
+    Responses are indexed by the `prompt_fp` of the request event they answered. With
+    `strict=True` a prompt that was never recorded raises `ReplayMiss`. Otherwise it
+    falls back to the next recorded response of the same kind (the plan, or the
+    execution of the same skill), which tolerates prompt drift such as an edited
+    SKILL.md and replays traces written before fingerprints were recorded.
+    """
+
+    name = "replay"
+
+    def __init__(self, trace_path: Path, *, strict: bool = False):
+        self.trace_path = Path(trace_path)
+        self.strict = strict
+        self.hits = 0
+        self.fallbacks = 0
+        self._by_fp: Dict[str, _Responses] = {}
+        self._by_kind: Dict[Kind, _Responses] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @classmethod
+    def from_run_dir(cls, run_dir: Path, *, strict: bool = False) -> "ReplayProvider":
+        path = Path(run_dir)
+        if path.is_dir():
+            path = path / "trace.jsonl"
+        if not path.is_file():
+            raise ReplayMiss(f"No trace.jsonl to replay at {run_dir}")
+        return cls(path, strict=strict)
+
+    def _load(self) -> None:
+        pending: Optional[Tuple[str, Kind, Optional[str]]] = None
+        with open(self.trace_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    evt = json.loads(line)
+                except ValueError:
+                    continue  # a run killed mid-write leaves a partial last line
+                etype = evt.get("type")
+                payload = evt.get("payload") or {}
+                if etype in _RESPONSES:
+                    kind: Kind = ("plan", "") if etype == "plan.request" else ("exec", payload.get("skill", ""))
+                    pending = (_RESPONSES[etype], kind, payload.get("prompt_fp"))
+                elif pending is not None and etype == pending[0]:
+                    _, kind, fp = pending
+                    raw = payload.get("raw")
+                    if raw is None and payload.get("raw_text") is not None:
+                        raw = _Unparsed(payload["raw_text"], payload.get("error") or "Model did not return JSON")
+                    if fp:
+                        self._by_fp.setdefault(fp, _Responses()).items.append(raw)
+                    if not isinstance(raw, _Unparsed):  # fallbacks serve usable answers only
+                        self._by_kind.setdefault(kind, _Responses()).items.append(raw)
+                    pending = None
+        if not self._by_kind:
+            raise ReplayMiss(f"No recorded model responses in {self.trace_path}")
+
+    def complete_json(
+        self,
+        *,
+        system: str,
+        user: str,
+        schema_hint: str,
+        temperature: float = 0.2,
+        max_tokens: int = 2000,
+        timeout_s: int = 120,
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        fp = prompt_fingerprint(system=system, user=user, schema_hint=schema_hint)
+        with self._lock:
+            recorded = self._by_fp.get(fp)
+            if recorded is not None:
+                self.hits += 1
+                item = recorded.take()
+                if isinstance(item, _Unparsed):
+                    raise ResponseParseError(item.error, raw_text=item.text)
+                return item
+            kind = self._kind(user, schema_hint)
+            what = f"execution of skill {kind[1]}" if kind[0] == "exec" else "plan"
+            if self.strict:
+                raise ReplayMiss(f"Prompt {fp} ({what}) was not recorded in {self.trace_path}")
+            fallback = self._by_kind.get(kind)
+            if fallback is None:
+                raise ReplayMiss(f"No recorded response for the {what} in {self.trace_path}")
+            self.fallbacks += 1
+            return fallback.take()
+
+    @staticmethod
+    def _kind(user: str, schema_hint: str) -> Kind:
+        if "SkillExecutionResult" in schema_hint:
+            m = _SKILL_RE.search(user)
+            return ("exec", m.group(1).strip() if m else "")
+        return ("plan", "")
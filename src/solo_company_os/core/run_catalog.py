@@ -0,0 +1,400 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+CATALOG_FILENAME = "catalog.sqlite3"
+
+SORT_COLUMNS = ("run_id", "updated_at", "started_at", "finished_at", "status", "files_written")
+
+_COLUMNS = (
+    "run_id",
+    "mission",
+    "status",
+    "provider",
+    "started_at",
+    "finished_at",
+    "updated_at",
+    "work_orders",
+    "files_written",
+    "warnings",
+    "error",
+    "request",
+    "queued_at",
+    "owner",
+)
+
+# Statuses a run can still move out of; reconcile leaves these rows to their owner.
+ACTIVE_STATUSES = ("queued", "running")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    mission TEXT,
+    status TEXT NOT NULL,
+    provider TEXT,
+    started_at TEXT,
+    finished_at TEXT,
+    updated_at REAL NOT NULL,
+    work_orders INTEGER NOT NULL DEFAULT 0,
+    files_written INTEGER NOT NULL DEFAULT 0,
+    warnings INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    request TEXT,
+    queued_at REAL,
+    owner TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_status ON runs(status);
+CREATE INDEX IF NOT EXISTS runs_updated_at ON runs(updated_at);
+"""
+
+
+class RunCatalog:
+    """SQLite index of the runs under a run root.
+
+    The catalog lives next to the run directories (`<run_root>/catalog.sqlite3`) so the
+    dashboard can list, filter and sort runs without opening every `trace.jsonl`.
+    `run_mission` keeps it current; `reconcile()` picks up runs created out of band
+    (copied folders, older versions, crashed processes).
+    """
+
+    def __init__(self, run_root: Path):
+        self.run_root = run_root
+        self.path = run_root / CATALOG_FILENAME
+        self.run_root.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(_SCHEMA)
+            _ensure_columns(conn)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per operation keeps the catalog safe to use from
+        # background run threads and request handlers alike.
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    # --- writes ---
+
+    def record_queued(
+        self,
+        run_id: str,
+        *,
+        mission: str,
+        provider: Optional[str],
+        request: Dict[str, Any],
+        owner: Optional[str] = None,
+    ) -> None:
+        """Persist a submitted run so the queue survives a dashboard restart.
+
+        `owner` (see `run_owner`) names the process that will execute it.
+        """
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                INSERT INTO runs (run_id, mission, status, provider, updated_at, request, queued_at, owner)
+                VALUES (?, ?, 'queued', ?, ?, ?, ?, ?)
+                """,
+                (run_id, mission, provider, now, json.dumps(request, ensure_ascii=False), now, owner),
+            )
+
+    def queued_runs(self) -> List[Dict[str, Any]]:
+        """Queued runs in submission (FIFO) order, with `request` decoded."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT * FROM runs WHERE status = 'queued' ORDER BY queued_at, run_id"
+            ).fetchall()
+        out = []
+        for r in rows:
+            row = dict(r)
+            row["request"] = json.loads(row["request"] or "{}")
+            out.append(row)
+        return out
+
+    def claim_queued(self, owner: str) -> List[Dict[str, Any]]:
+        """`queued_runs`, after making `owner` the process that will execute them."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("UPDATE runs SET owner = ? WHERE status = 'queued'", (owner,))
+        return self.queued_runs()
+
+    def fail_orphaned(self, error: str) -> int:
+        """Mark `running` runs whose owner process on this host is gone as errored.
+
+        Only rows with an owner (queued through a dashboard) are considered; CLI runs and
+        runs owned by live processes or other hosts are left alone. Returns the count.
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT run_id, owner FROM runs WHERE status = 'running' AND owner IS NOT NULL"
+            ).fetchall()
+        orphaned = [r["run_id"] for r in rows if _owner_gone(r["owner"])]
+        if not orphaned:
+            return 0
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "UPDATE runs SET status = 'error', error = ?, updated_at = ? "
+                "WHERE run_id = ? AND status = 'running'",
+                [(error, time.time(), run_id) for run_id in orphaned],
+            )
+        return len(orphaned)
+
+    def record_start(
+        self,
+        run_id: str,
+        *,
+        mission: str,
+        provider: Optional[str] = None,
+        started_at: Optional[str] = None,
+    ) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                INSERT INTO runs (run_id, mission, status, provider, started_at, updated_at)
+                VALUES (?, ?, 'running', ?, ?, ?)
+                ON CONFLICT(run_id) DO UPDATE SET
+                    mission=excluded.mission,
+                    status='running',
+                    provider=COALESCE(excluded.provider, runs.provider),
+                    started_at=excluded.started_at,
+                    finished_at=NULL,
+                    updated_at=excluded.updated_at,
+                    error=NULL
+                """,
+                (run_id, mission, provider, started_at, time.time()),
+            )
+
+    def record_finish(
+        self,
+        run_id: str,
+        *,
+        status: str = "done",
+        finished_at: Optional[str] = None,
+        work_orders: int = 0,
+        files_written: int = 0,
+        warnings: int = 0,
+        error: Optional[str] = None,
+    ) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                INSERT INTO runs (
+                    run_id, status, finished_at, updated_at, work_orders, files_written, warnings, error
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(run_id) DO UPDATE SET
+                    status=excluded.status,
+                    finished_at=excluded.finished_at,
+                    updated_at=excluded.updated_at,
+                    work_orders=excluded.work_orders,
+                    files_written=excluded.files_written,
+                    warnings=excluded.warnings,
+                    error=excluded.error
+                """,
+                (run_id, status, finished_at, time.time(), work_orders, files_written, warnings, error),
+            )
+
+    def upsert(self, row: Dict[str, Any]) -> None:
+        cols = [c for c in row if c in _COLUMNS]
+        placeholders = ", ".join("?" for _ in cols)
+        updates = ", ".join(f"{c}=excluded.{c}" for c in cols if c != "run_id")
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                f"INSERT INTO runs ({', '.join(cols)}) VALUES ({placeholders}) "
+                f"ON CONFLICT(run_id) DO UPDATE SET {updates}",
+                [row[c] for c in cols],
+            )
+
+    def delete(self, run_id: str) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+
+    # --- reads ---
+
+    def get(self, run_id: str) -> Optional[Dict[str, Any]]:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return dict(row) if row else None
+
+    def run_ids(self) -> set[str]:
+        with closing(self._connect()) as conn:
+            return {r[0] for r in conn.execute("SELECT run_id FROM runs")}
+
+    def _active_run_ids(self) -> set[str]:
+        marks = ", ".join("?" for _ in ACTIVE_STATUSES)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(f"SELECT run_id FROM runs WHERE status IN ({marks})", ACTIVE_STATUSES)
+            return {r[0] for r in rows}
+
+    def list_runs(
+        self,
+        *,
+        limit: int = 50,
+        offset: int = 0,
+        status: Optional[str] = None,
+        provider: Optional[str] = None,
+        q: Optional[str] = None,
+        sort: str = "run_id",
+        order: str = "desc",
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Return (rows, total) for one page of runs matching the filters."""
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"sort must be one of: {', '.join(SORT_COLUMNS)}")
+        if order not in ("asc", "desc"):
+            raise ValueError("order must be asc or desc")
+
+        where: List[str] = []
+        params: List[Any] = []
+        if status:
+            where.append("status = ?")
+            params.append(status)
+        if provider:
+            where.append("provider = ?")
+            params.append(provider)
+        if q:
+            where.append("(mission LIKE ? OR run_id LIKE ?)")
+            params.extend([f"%{q}%", f"%{q}%"])
+        where_sql = ("WHERE " + " AND ".join(where)) if where else ""
+
+        with closing(self._connect()) as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM runs {where_sql}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT * FROM runs {where_sql} ORDER BY {sort} {order}, run_id {order} "
+                "LIMIT ? OFFSET ?",
+                [*params, limit, offset],
+            ).fetchall()
+        return [dict(r) for r in rows], total
+
+    # --- reconcile ---
+
+    def reconcile(self, *, full: bool = False) -> Dict[str, int]:
+        """Sync the catalog with the run directories on disk.
+
+        By default only runs missing from the catalog are parsed; `full=True` re-reads
+        every run. Catalog rows whose directory is gone are removed.
+        """
+        known = self.run_ids()
+        active = self._active_run_ids()
+        on_disk = set()
+        added = updated = 0
+        for run_dir in _iter_run_dirs(self.run_root):
+            on_disk.add(run_dir.name)
+            if run_dir.name in known and (not full or run_dir.name in active):
+                continue
+            self.upsert(scan_run_dir(run_dir))
+            if run_dir.name in known:
+                updated += 1
+            else:
+                added += 1
+
+        removed = 0
+        for run_id in known - on_disk:
+            self.delete(run_id)
+            removed += 1
+        return {"added": added, "updated": updated, "removed": removed}
+
+
+def _ensure_columns(conn: sqlite3.Connection) -> None:
+    # Catalogs created by older versions lack the queue columns.
+    have = {r[1] for r in conn.execute("PRAGMA table_info(runs)")}
+    for col, decl in (("request", "TEXT"), ("queued_at", "REAL"), ("owner", "TEXT")):
+        if col not in have:
+            conn.execute(f"ALTER TABLE runs ADD COLUMN {col} {decl}")
+
+
+def run_owner() -> str:
+    """Identifies this process in the catalog's `owner` column: `host:pid`."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _owner_gone(owner: str) -> bool:
+    host, _, pid = owner.rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return False  # another machine's run: not ours to judge
+    if int(pid) == os.getpid():
+        return True  # a previous process whose pid this one reuses
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        return False  # exists but belongs to another user
+    return False
+
+
+def _iter_run_dirs(run_root: Path) -> Iterator[Path]:
+    if not run_root.exists():
+        return
+    for item in run_root.iterdir():
+        if item.is_dir() and not item.name.startswith("."):
+            yield item
+
+
+def scan_run_dir(run_dir: Path) -> Dict[str, Any]:
+    """Derive a catalog row from the files of one run directory."""
+    row: Dict[str, Any] = {
+        "run_id": run_dir.name,
+        "mission": None,
+        "status": "incomplete",
+        "provider": None,
+        "started_at": None,
+        "finished_at": None,
+        "updated_at": run_dir.stat().st_mtime,
+        "work_orders": 0,
+        "files_written": 0,
+        "warnings": 0,
+        "error": None,
+    }
+
+    trace_path = run_dir / "trace.jsonl"
+    if trace_path.exists():
+        with open(trace_path, encoding="utf-8", errors="ignore") as f:
+            for raw in f:
+                try:
+                    evt = json.loads(raw)
+                except json.JSONDecodeError:
+                    continue
+                payload = evt.get("payload") or {}
+                if evt.get("type") == "mission.start":
+                    row["mission"] = payload.get("mission")
+                    row["provider"] = payload.get("provider")
+                    row["started_at"] = evt.get("ts")
+                elif evt.get("type") in ("mission.done", "mission.cancelled"):
+                    row["status"] = "done" if evt["type"] == "mission.done" else "cancelled"
+                    row["finished_at"] = evt.get("ts")
+                    row["files_written"] = int(payload.get("files_written") or 0)
+                    row["warnings"] = int(payload.get("warnings") or 0)
+
+    if row["mission"] is None:
+        row["mission"] = _mission_from_report(run_dir / "RUN.md")
+
+    plan_path = run_dir / "plan.json"
+    if plan_path.exists():
+        try:
+            plan = json.loads(plan_path.read_text(encoding="utf-8"))
+            row["work_orders"] = len(plan.get("work_orders") or [])
+        except (json.JSONDecodeError, AttributeError):
+            pass
+
+    error_path = run_dir / "RUN_ERROR.txt"
+    if error_path.exists():
+        row["status"] = "error"
+        row["error"] = error_path.read_text(encoding="utf-8", errors="ignore")[:2000]
+    return row
+
+
+def _mission_from_report(run_md: Path) -> Optional[str]:
+    if not run_md.exists():
+        return None
+    with open(run_md, encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            if line.strip().startswith("Mission:"):
+                return line.split("Mission:", 1)[-1].strip() or None
+    return None
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -48,11 +49,16 @@ class SkillFrontmatter(BaseModel):
 
 @dataclass(frozen=True)
 class SkillRef:
-    """A discovered skill on disk."""
+    """A discovered skill on disk (or compiled into a skill pack)."""
 
     folder: Path
     skill_md: Path
     frontmatter: SkillFrontmatter
+    # SkillPack the skill was loaded from; its body is then read from the pack.
+    pack: Optional[Any] = field(default=None, compare=False, repr=False)
+    # SkillResource entries of a packed skill. Folders are listed on demand
+    # (`skill_resources.list_resources`), so discovery never walks them.
+    resources: Tuple[Any, ...] = field(default=(), compare=False, repr=False)
 
 
 class PlannedFile(BaseModel):
@@ -83,3 +89,68 @@ class SkillExecutionResult(BaseModel):
     files: List[GeneratedFile] = Field(default_factory=list)
     summary: str = ""
     warnings: List[str] = Field(default_factory=list)
+
+
+def strict_json_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """`model`'s JSON Schema in the form OpenAI strict structured outputs accept.
+
+    Every object lists all of its properties as required and forbids extra keys;
+    defaults and titles are dropped. Optional fields stay nullable, and list fields
+    with a default come back as `[]`, so pydantic validation is unchanged.
+    """
+
+    def walk(node: Any) -> Any:
+        if isinstance(node, dict):
+            out = {k: walk(v) for k, v in node.items() if k not in ("default", "title", "properties")}
+            if "properties" in node:  # keys here are field names (`title` is one), not keywords
+                out["properties"] = {name: walk(v) for name, v in node["properties"].items()}
+            if out.get("type") == "object" and "properties" in out:
+                out["required"] = list(out["properties"])
+                out["additionalProperties"] = False
+            return out
+        if isinstance(node, list):
+            return [walk(v) for v in node]
+        return node
+
+    return walk(model.model_json_schema())
+
+
+@lru_cache(maxsize=None)
+def response_format(model: Type[BaseModel]) -> Dict[str, Any]:
+    """`response_format` request field constraining a chat completion to `model`."""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": model.__name__, "strict": True, "schema": strict_json_schema(model)},
+    }
+
+
+@dataclass
+class StructuredOutputStats:
+    """How model outputs held up against the Plan / SkillExecutionResult schemas in one run."""
+
+    calls: int = 0
+    schema_calls: int = 0  # the backend enforced the JSON schema
+    schema_fallbacks: int = 0  # the backend rejected the schema; the call fell back to the prompt hint
+    invalid: int = 0  # results that failed validation (each one triggers a repair retry)
+    repaired: int = 0  # invalid results fixed by the retry: failures avoided
+    dropped: int = 0  # work orders lost: the retry was invalid too, or the call failed
+
+    def record(self, structured: Optional[bool]) -> None:
+        self.calls += 1
+        if structured:
+            self.schema_calls += 1
+        elif structured is False:
+            self.schema_fallbacks += 1
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+    def markdown(self) -> str:
+        """The `## Structured output` section of RUN.md."""
+        return (
+            "## Structured output\n\n"
+            f"- Calls constrained by a JSON schema: {self.schema_calls}/{self.calls}\n"
+            f"- Schema rejected by the backend (prompt-only fallback): {self.schema_fallbacks}\n"
+            f"- Invalid results: {self.invalid}; repaired by a retry (failures avoided): {self.repaired}; "
+            f"work orders dropped: {self.dropped}\n"
+        )
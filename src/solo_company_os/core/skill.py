@@ -2,9 +2,7 @@ from __future__ import annotations
 
 import re
 from pathlib import Path
-from typing import Tuple
-
-import yaml
+from typing import BinaryIO, List, Tuple
 
 from .schema import SkillFrontmatter
 
@@ -39,9 +37,34 @@ def split_frontmatter(markdown: str) -> Tuple[str, str]:
     return fm, body
 
 
+def _read_header(f: BinaryIO) -> str:
+    """Consume lines up to the closing '---' and return the YAML between the boundaries.
+
+    Works on the binary stream and decodes line by line, so nothing past the header
+    is decoded.
+    """
+    first = f.readline().decode("utf-8")
+    if not first or not FRONTMATTER_BOUNDARY.match(first.rstrip("\r\n")):
+        raise SkillParseError("SKILL.md must start with '---' YAML frontmatter boundary")
+    header: List[str] = []
+    for raw in f:
+        line = raw.decode("utf-8").rstrip("\r\n")
+        if FRONTMATTER_BOUNDARY.match(line):
+            return "\n".join(header).strip() + "\n"
+        header.append(line)
+    raise SkillParseError("SKILL.md frontmatter missing closing '---' boundary")
+
+
+def read_frontmatter_yaml(skill_md_path: Path) -> str:
+    """Read only the frontmatter block; the body is never loaded."""
+    with open(skill_md_path, "rb") as f:
+        return _read_header(f)
+
+
 def load_skill_frontmatter(skill_md_path: Path) -> SkillFrontmatter:
-    raw = skill_md_path.read_text(encoding="utf-8")
-    fm_yaml, _body = split_frontmatter(raw)
+    import yaml  # deferred: discovery-cache hits never parse YAML
+
+    fm_yaml = read_frontmatter_yaml(skill_md_path)
     try:
         data = yaml.safe_load(fm_yaml) or {}
     except Exception as e:
@@ -62,6 +85,9 @@ def load_skill_frontmatter(skill_md_path: Path) -> SkillFrontmatter:
 
 
 def load_skill_body(skill_md_path: Path) -> str:
-    raw = skill_md_path.read_text(encoding="utf-8")
-    _fm_yaml, body = split_frontmatter(raw)
-    return body
+    with open(skill_md_path, "rb") as f:
+        _read_header(f)
+        rest = f.read().decode("utf-8")
+    body = rest.replace("\r\n", "\n").replace("\r", "\n").lstrip()
+    # Same result as split_frontmatter(): no trailing line break.
+    return body[:-1] if body.endswith("\n") else body
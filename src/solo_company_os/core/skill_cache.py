@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from .schema import SkillFrontmatter
+from .skill import SkillParseError, load_skill_body, load_skill_frontmatter
+from .skill_search import body_headings
+from .utils import default_cache_dir
+
+
+CACHE_VERSION = 1
+
+CACHE_FILE = "skills-v1.json"
+
+
+class SkillDiscoveryCache:
+    """Parsed SKILL.md frontmatter (and body headings, for search) keyed by (path, mtime_ns, size).
+
+    A hit skips reading the file, YAML parsing and pydantic validation: the stored
+    fields were validated when the entry was written, so they are rebuilt with
+    `model_construct`. Parse errors are cached too, so a broken skill is not
+    re-parsed on every startup until it is edited. The file is replaced atomically
+    and only when something changed; a corrupt or foreign-version file is ignored.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        self.path = Path(path) if path is not None else default_cache_dir() / CACHE_FILE
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._read()
+
+    def load_frontmatter(self, skill_md: Path, st: os.stat_result) -> SkillFrontmatter:
+        """Same contract as `load_skill_frontmatter`, served from the cache when fresh."""
+        key = str(skill_md)
+        with self._lock:
+            entry = self._entries.get(key)
+            hit = _fresh(entry, st) and ("frontmatter" in entry or "error" in entry)
+            # Discovery calls this from a thread pool; `+=` is not atomic.
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if hit:
+            if "error" in entry:
+                raise SkillParseError(entry["error"])
+            return SkillFrontmatter.model_construct(**entry["frontmatter"])
+
+        fresh: Dict[str, Any] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+        if _fresh(entry, st) and "headings" in entry:
+            fresh["headings"] = entry["headings"]
+        try:
+            fm = load_skill_frontmatter(skill_md)
+        except SkillParseError as e:
+            fresh["error"] = str(e)
+            self._put(key, fresh)
+            raise
+        fresh["frontmatter"] = fm.model_dump(exclude_unset=True)
+        self._put(key, fresh)
+        return fm
+
+    def load_headings(self, skill_md: Path, st: os.stat_result) -> str:
+        """`body_headings` of the SKILL.md body; the body is read only when the file changed."""
+        key = str(skill_md)
+        with self._lock:
+            entry = self._entries.get(key)
+            if _fresh(entry, st) and "headings" in entry:
+                self.hits += 1
+                return entry["headings"]
+            self.misses += 1
+        headings = body_headings(load_skill_body(skill_md))
+        fresh: Dict[str, Any] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+        if _fresh(entry, st):
+            fresh.update(entry)
+        fresh["headings"] = headings
+        self._put(key, fresh)
+        return headings
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            # Forget skills that were deleted since they were cached.
+            entries = {k: v for k, v in self._entries.items() if os.path.exists(k)}
+            self._entries = entries
+            self._dirty = False
+        payload = json.dumps({"version": CACHE_VERSION, "entries": entries}, ensure_ascii=False)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=".skills-", suffix=".tmp", dir=self.path.parent)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # read-only home or similar: the cache is an optimisation only
+
+    def _put(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._dirty = True
+
+    def _read(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+            entries = data.get("entries")
+            if isinstance(entries, dict):
+                self._entries = entries
+
+
+def _fresh(entry: Optional[Dict[str, Any]], st: os.stat_result) -> bool:
+    return entry is not None and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size
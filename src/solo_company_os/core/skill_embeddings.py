@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import os
+import re
+import tempfile
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .skill import SkillParseError
+from .skill_index import SkillIndex, read_skill_body, skill_source_stamp
+from .skill_search import body_headings
+from .utils import default_cache_dir
+
+
+DEFAULT_DIM = 1024
+
+NGRAM_SIZES = (2, 3)
+
+EMBEDDINGS_FILE = "skill-embeddings-v1.npz"
+
+_SPACES = re.compile(r"\s+")
+
+
+class EmbeddingsUnavailable(RuntimeError):
+    pass
+
+
+def _np() -> Any:
+    try:
+        import numpy
+    except ImportError as e:
+        raise EmbeddingsUnavailable(
+            "Semantic skill search needs NumPy: pip install 'solo-company-os[embeddings]'"
+        ) from e
+    return numpy
+
+
+def _ngrams(text: str) -> Counter:
+    norm = " " + _SPACES.sub(" ", text.lower()).strip() + " "
+    grams: Counter = Counter()
+    for n in NGRAM_SIZES:
+        for i in range(len(norm) - n + 1):
+            grams[norm[i : i + n]] += 1
+    return grams
+
+
+def embed_texts(texts: Sequence[str], dim: int = DEFAULT_DIM) -> Any:
+    """Hashed character n-gram vectors, L2-normalised, as a float32 matrix (len(texts), dim).
+
+    Character 2/3-grams work for English word variants (scrape/scraper) and for Chinese,
+    where bigrams approximate words. Each gram is hashed to a bucket with a sign bit;
+    counts are damped with log1p so long descriptions do not dominate.
+    """
+    np = _np()
+    out = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for gram, count in _ngrams(text).items():
+            h = zlib.crc32(gram.encode("utf-8"))
+            out[row, h % dim] += (1.0 if h & 0x80000000 else -1.0) * np.log1p(count)
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return out / norms
+
+
+def skill_text(name: str, description: str, headings: str) -> str:
+    return f"{name.replace('-', ' ')}\n{description}\n{headings}"
+
+
+class SkillEmbeddingIndex:
+    """A (skills x dim) matrix of skill embeddings with batched cosine top-k.
+
+    Rows are keyed by `skill_source_stamp` (SKILL.md path, mtime_ns, size): rebuilding from a previous index
+    (for example one loaded from disk) only embeds skills that changed.
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        stamps: List[Tuple[str, int, int]],
+        matrix: Any,
+        dim: int = DEFAULT_DIM,
+    ):
+        self.names = names
+        self.stamps = stamps
+        self.matrix = matrix
+        self.dim = dim
+        # Rows computed (not reused) by the last build().
+        self.embedded = 0
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def build(
+        cls,
+        skill_index: SkillIndex,
+        previous: Optional["SkillEmbeddingIndex"] = None,
+        dim: int = DEFAULT_DIM,
+    ) -> "SkillEmbeddingIndex":
+        np = _np()
+        reuse: Dict[Tuple[str, int, int], int] = {}
+        if previous is not None and previous.dim == dim:
+            reuse = {stamp: i for i, stamp in enumerate(previous.stamps)}
+
+        names: List[str] = []
+        stamps: List[Tuple[str, int, int]] = []
+        rows: List[Any] = []
+        missing: List[Tuple[int, str]] = []
+        for ref in sorted(skill_index.skills, key=lambda s: s.frontmatter.name):
+            try:
+                stamp = skill_source_stamp(ref)
+            except OSError:
+                continue
+            names.append(ref.frontmatter.name)
+            stamps.append(stamp)
+            if stamp in reuse and previous is not None:
+                rows.append(previous.matrix[reuse[stamp]])
+                continue
+            try:
+                headings = body_headings(read_skill_body(ref))
+            except (OSError, SkillParseError, UnicodeDecodeError):
+                headings = ""
+            rows.append(None)
+            missing.append(
+                (len(rows) - 1, skill_text(ref.frontmatter.name, ref.frontmatter.description, headings))
+            )
+
+        matrix = np.zeros((len(rows), dim), dtype=np.float32)
+        for i, row in enumerate(rows):
+            if row is not None:
+                matrix[i] = row
+        if missing:
+            matrix[[i for i, _ in missing]] = embed_texts([t for _, t in missing], dim)
+        index = cls(names, stamps, matrix, dim)
+        index.embedded = len(missing)
+        return index
+
+    def search(self, query: str, k: int) -> List[Tuple[str, float]]:
+        return self.search_many([query], k)[0]
+
+    def search_many(self, queries: Sequence[str], k: int) -> List[List[Tuple[str, float]]]:
+        """Cosine top-k for several queries with one matrix product."""
+        np = _np()
+        if not self.names or k <= 0:
+            return [[] for _ in queries]
+        k = min(k, len(self.names))
+        scores = embed_texts(queries, self.dim) @ self.matrix.T
+        results: List[List[Tuple[str, float]]] = []
+        for row in scores:
+            top = np.argpartition(-row, k - 1)[:k]
+            top = top[np.argsort(-row[top], kind="stable")]
+            results.append([(self.names[i], float(row[i])) for i in top])
+        return results
+
+    def save(self, path: Union[str, Path]) -> None:
+        np = _np()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".embeddings-", suffix=".tmp", dir=path.parent)
+        with os.fdopen(fd, "wb") as f:
+            np.savez(
+                f,
+                names=np.array(self.names, dtype=str),
+                paths=np.array([s[0] for s in self.stamps], dtype=str),
+                mtimes=np.array([s[1] for s in self.stamps], dtype=np.int64),
+                sizes=np.array([s[2] for s in self.stamps], dtype=np.int64),
+                matrix=self.matrix,
+                dim=np.array(self.dim),
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> Optional["SkillEmbeddingIndex"]:
+        np = _np()
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                stamps = [
+                    (str(p), int(m), int(s))
+                    for p, m, s in zip(data["paths"], data["mtimes"], data["sizes"])
+                ]
+                return cls([str(n) for n in data["names"]], stamps, data["matrix"], int(data["dim"]))
+        except (OSError, ValueError, KeyError):
+            return None
+
+
+def load_or_build(
+    skill_index: SkillIndex, path: Optional[Union[str, Path]] = None
+) -> SkillEmbeddingIndex:
+    """Embedding index for `skill_index`, persisted next to the skill discovery cache."""
+    path = Path(path) if path is not None else default_cache_dir() / EMBEDDINGS_FILE
+    previous = SkillEmbeddingIndex.load(path) if path.exists() else None
+    index = SkillEmbeddingIndex.build(skill_index, previous=previous)
+    if index.embedded or previous is None or previous.stamps != index.stamps:
+        try:
+            index.save(path)
+        except OSError:
+            pass  # cache only
+    return index
@@ -1,14 +1,23 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from rich.console import Console
 
 from .schema import SkillFrontmatter, SkillRef
 from .skill import SkillParseError, load_skill_body, load_skill_frontmatter
+from .skill_cache import SkillDiscoveryCache
+from .skill_pack import SkillPack, SkillPackError, is_skill_pack
+from .skill_resources import HEAD_BYTES, MAX_INJECT_BYTES, SkillResource, list_resources
+from .skill_search import BM25Index, body_headings, skill_terms, tokenize
 
 
 DEFAULT_SKILL_DIRS: Tuple[str, ...] = (
@@ -21,16 +30,102 @@ DEFAULT_SKILL_DIRS: Tuple[str, ...] = (
 )
 
 
+# Thread count used by the CLI and dashboard; discovery is I/O bound (stat + small reads).
+DISCOVERY_WORKERS = 8
+
+
+@dataclass
+class RootTiming:
+    """Scan cost of one root: listing plus the parse time of each SKILL.md in it."""
+
+    root: Path
+    folders: int
+    seconds: float
+    skills: int = 0
+
+
 @dataclass
 class DiscoveryReport:
     roots_scanned: List[Path]
     skills: List[SkillRef]
     errors: List[str]
+    timings: List[RootTiming] = field(default_factory=list)
+
+
+def skill_source_stamp(ref: SkillRef) -> Tuple[str, int, int]:
+    """Change key for a skill's content: (SKILL.md path, mtime_ns, size), or the pack hash."""
+    if ref.pack is not None:
+        return (f"{ref.pack.path}#{ref.pack.sha256(ref.frontmatter.name)}", 0, 0)
+    st = ref.skill_md.stat()
+    return (str(ref.skill_md), st.st_mtime_ns, st.st_size)
+
+
+def skill_folder_stamp(ref: SkillRef) -> Tuple[Any, ...]:
+    """Change key for a skill's resource listing: the mtimes of its folder and of the
+    folder's subdirectories (references/, scripts/, ...), or the pack hash."""
+    if ref.pack is not None:
+        return (f"{ref.pack.path}#{ref.pack.sha256(ref.frontmatter.name)}",)
+    mtime_ns = os.stat(ref.folder).st_mtime_ns
+    with os.scandir(ref.folder) as it:
+        subdirs = sorted(
+            (de.name, de.stat().st_mtime_ns) for de in it if de.is_dir() and not de.name.startswith(".")
+        )
+    return (str(ref.folder), mtime_ns, tuple(subdirs))
+
+
+def resource_stamp(ref: SkillRef, res: SkillResource) -> Tuple[str, int, int]:
+    """Change key for a resource file's content: (path, mtime_ns, size), or the packed hash."""
+    if ref.pack is not None:
+        return (f"{ref.pack.path}#{res.sha256}", 0, res.size)
+    path = ref.folder / res.path
+    st = path.stat()
+    return (str(path), st.st_mtime_ns, st.st_size)
+
+
+def read_skill_body(ref: SkillRef) -> str:
+    if ref.pack is not None:
+        return ref.pack.body(ref.frontmatter.name)
+    return load_skill_body(ref.skill_md)
+
+
+def read_skill_resource(ref: SkillRef, res: SkillResource, limit: Optional[int] = None) -> bytes:
+    if ref.pack is not None:
+        data = ref.pack.resource(ref.frontmatter.name, res.path)
+        return data if limit is None else data[:limit]
+    with open(ref.folder / res.path, "rb") as f:
+        return f.read() if limit is None else f.read(limit)
 
 
 class SkillIndex:
-    def __init__(self, skills: Sequence[SkillRef]):
+    """Skills by name, with an LRU cache of bodies keyed on SKILL.md (mtime_ns, size).
+
+    Discovery only reads frontmatter; a body is read the first time a work order needs
+    it and again only after the file changes. Resource files are listed the same way,
+    per skill, on the first `select_references` and again when the folder changes.
+
+    `search()` ranks skills with BM25 over name, description and body headings. The
+    inverted index is built on first use and kept in sync per skill: only skills whose
+    SKILL.md changed (or that appeared/disappeared) are re-tokenized. With a discovery
+    `cache`, headings are persisted next to the frontmatter, so a fresh process does
+    not read every body for its first search.
+    """
+
+    def __init__(
+        self,
+        skills: Sequence[SkillRef],
+        body_cache_size: int = 64,
+        cache: Optional[SkillDiscoveryCache] = None,
+    ):
         self._skills_by_name: Dict[str, SkillRef] = {s.frontmatter.name: s for s in skills}
+        self.body_cache_size = body_cache_size
+        self.cache = cache
+        self._bodies: "OrderedDict[str, Tuple[Tuple[str, int, int], str]]" = OrderedDict()
+        self._bodies_lock = threading.Lock()
+        self._resources: Dict[str, Tuple[Tuple[Any, ...], Tuple[SkillResource, ...]]] = {}
+        self._resource_texts: "OrderedDict[Tuple[Tuple[str, int, int], bool], Optional[str]]" = OrderedDict()
+        self._bm25 = BM25Index()
+        self._bm25_stamps: Dict[str, Tuple[str, int, int]] = {}
+        self._bm25_lock = threading.Lock()
 
     @property
     def skills(self) -> List[SkillRef]:
@@ -47,7 +142,169 @@ class SkillIndex:
 
     def load_body(self, name: str) -> str:
         ref = self.require(name)
-        return load_skill_body(ref.skill_md)
+        stamp = skill_source_stamp(ref)
+        with self._bodies_lock:
+            cached = self._bodies.get(name)
+            if cached is not None and cached[0] == stamp:
+                self._bodies.move_to_end(name)
+                return cached[1]
+        body = read_skill_body(ref)
+        with self._bodies_lock:
+            self._bodies[name] = (stamp, body)
+            self._bodies.move_to_end(name)
+            while len(self._bodies) > self.body_cache_size:
+                self._bodies.popitem(last=False)
+        return body
+
+    def resources(self, name: str) -> Tuple[SkillResource, ...]:
+        """The skill's resource files, re-listed only when `skill_folder_stamp` changed."""
+        ref = self.require(name)
+        try:
+            stamp = skill_folder_stamp(ref)
+        except OSError:
+            return ()
+        with self._bodies_lock:
+            cached = self._resources.get(name)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        listing = list_resources(ref)
+        with self._bodies_lock:
+            self._resources[name] = (stamp, listing)
+        return listing
+
+    def adopt_search_index(self, other: "SkillIndex") -> None:
+        """Start from another index's BM25 state and resource listings (e.g. the one this
+        index replaces); entries are still checked against their stamps before use."""
+        with other._bm25_lock:
+            bm25, stamps = other._bm25.copy(), dict(other._bm25_stamps)
+        with other._bodies_lock:
+            listings = dict(other._resources)
+        with self._bm25_lock:
+            self._bm25, self._bm25_stamps = bm25, stamps
+        with self._bodies_lock:
+            self._resources.update({k: v for k, v in listings.items() if k in self._skills_by_name})
+
+    def search(self, query: str, k: int) -> List[Tuple[str, float]]:
+        """Top-k (name, score) pairs for `query`; skills with no matching term are omitted."""
+        with self._bm25_lock:
+            self._sync_search_index()
+            return self._bm25.search(tokenize(query), k)
+
+    def shortlist(self, query: str, k: int, semantic: Any = None) -> List[Tuple[str, float]]:
+        """Exactly min(k, len(skills)) skills: best matches first, then the rest by name.
+
+        With `semantic` (a `SkillEmbeddingIndex`), BM25 and embedding rankings are merged
+        by reciprocal rank fusion, so skills worded differently from the mission still
+        make the list.
+        """
+        hits = self.search(query, k)
+        if semantic is not None:
+            fused: Dict[str, float] = {}
+            for ranking in (hits, semantic.search(query, k)):
+                for rank, (name, _score) in enumerate(ranking):
+                    if name in self._skills_by_name:
+                        fused[name] = fused.get(name, 0.0) + 1.0 / (60 + rank)
+            hits = sorted(fused.items(), key=lambda item: (-item[1], item[0]))[:k]
+        chosen = {name for name, _ in hits}
+        for name in sorted(self._skills_by_name):
+            if len(hits) >= k:
+                break
+            if name not in chosen:
+                hits.append((name, 0.0))
+        return hits
+
+    def _sync_search_index(self) -> None:
+        for name in set(self._bm25_stamps) - set(self._skills_by_name):
+            self._bm25.remove(name)
+            del self._bm25_stamps[name]
+        for name, ref in self._skills_by_name.items():
+            try:
+                stamp = skill_source_stamp(ref)
+            except OSError:
+                continue
+            if self._bm25_stamps.get(name) == stamp:
+                continue
+            try:
+                if self.cache is not None and ref.pack is None:
+                    headings = self.cache.load_headings(ref.skill_md, ref.skill_md.stat())
+                else:
+                    headings = body_headings(read_skill_body(ref))
+            except (OSError, SkillParseError, UnicodeDecodeError):
+                headings = ""
+            fm = ref.frontmatter
+            self._bm25.add(name, skill_terms(fm.name, fm.description, headings))
+            self._bm25_stamps[name] = stamp
+        if self.cache is not None:
+            self.cache.save()
+
+    def select_references(
+        self, name: str, query: str, budget_tokens: int
+    ) -> List[Tuple[SkillResource, str, float]]:
+        """Pick the skill's resource files most relevant to `query` within a token budget.
+
+        Candidates are scored from their path and first `HEAD_BYTES`; sizes from the
+        folder listing decide what fits, so only the chosen files are read in full.
+        Binary and oversized files are never injected. Texts are cached per `resource_stamp`.
+        """
+        ref = self.require(name)
+        if budget_tokens <= 0:
+            return []
+        resources = self.resources(name)
+        if not resources:
+            return []
+        query_terms = set(tokenize(query))
+        scored: List[Tuple[float, SkillResource]] = []
+        for res in resources:
+            if res.size == 0 or res.size > MAX_INJECT_BYTES or res.approx_tokens > budget_tokens:
+                continue
+            head = self._resource_text(ref, res, head=True)
+            if head is None:
+                continue
+            path_terms = set(tokenize(re.sub(r"[/_.\-]", " ", res.path)))
+            head_terms = set(tokenize(head))
+            score = 2.0 * len(query_terms & path_terms) + len(query_terms & head_terms)
+            if score > 0:
+                scored.append((score, res))
+        scored.sort(key=lambda item: (-item[0], item[1].path))
+
+        chosen: List[Tuple[SkillResource, str, float]] = []
+        used = 0
+        for score, res in scored:
+            if used + res.approx_tokens > budget_tokens:
+                continue
+            text = self._resource_text(ref, res, head=False)
+            if text is None:
+                continue
+            chosen.append((res, text, score))
+            used += res.approx_tokens
+        return chosen
+
+    def _resource_text(self, ref: SkillRef, res: SkillResource, *, head: bool) -> Optional[str]:
+        try:
+            key = (resource_stamp(ref, res), head)
+        except OSError:
+            return None
+        with self._bodies_lock:
+            if key in self._resource_texts:
+                self._resource_texts.move_to_end(key)
+                return self._resource_texts[key]
+        try:
+            data = read_skill_resource(ref, res, HEAD_BYTES if head else None)
+        except (OSError, KeyError):
+            return None
+        text: Optional[str]
+        if b"\0" in data:
+            text = None  # binary
+        else:
+            try:
+                text = data.decode("utf-8", errors="ignore" if head else "strict")
+            except UnicodeDecodeError:
+                text = None
+        with self._bodies_lock:
+            self._resource_texts[key] = text
+            while len(self._resource_texts) > 4 * self.body_cache_size:
+                self._resource_texts.popitem(last=False)
+        return text
 
     def list_compact(self) -> List[Tuple[str, str]]:
         return sorted(
@@ -60,46 +317,142 @@ def _expand_dir(p: str) -> Path:
     return Path(os.path.expandvars(os.path.expanduser(p))).resolve()
 
 
+@dataclass
+class _RootListing:
+    root: Optional[Path]
+    candidates: List[Tuple[Path, Path, os.stat_result]]
+    seconds: float
+    packed: List[SkillRef] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def _list_root(root_str: str) -> _RootListing:
+    t0 = time.perf_counter()
+    root = _expand_dir(root_str)
+    if root.is_file() and is_skill_pack(root):
+        try:
+            refs = SkillPack(root).refs()
+        except SkillPackError as e:
+            return _RootListing(root, [], time.perf_counter() - t0, error=str(e))
+        return _RootListing(root, [], time.perf_counter() - t0, packed=refs)
+    if not root.exists() or not root.is_dir():
+        return _RootListing(None, [], 0.0)
+    candidates: List[Tuple[Path, Path, os.stat_result]] = []
+    for child in sorted(root.iterdir()):
+        if not child.is_dir():
+            continue
+        skill_md = child / "SKILL.md"
+        try:
+            st = skill_md.stat()
+        except OSError:
+            continue
+        candidates.append((child, skill_md, st))
+    return _RootListing(root, candidates, time.perf_counter() - t0)
+
+
+def _load_candidate(
+    skill_md: Path, st: os.stat_result, cache: Optional[SkillDiscoveryCache]
+) -> Tuple[Optional[SkillFrontmatter], Optional[str], float]:
+    t0 = time.perf_counter()
+    try:
+        if cache is not None:
+            fm = cache.load_frontmatter(skill_md, st)
+        else:
+            fm = load_skill_frontmatter(skill_md)
+    except SkillParseError as e:
+        return None, str(e), time.perf_counter() - t0
+    return fm, None, time.perf_counter() - t0
+
+
 def discover_skills(
     roots: Optional[Iterable[str]] = None,
     console: Optional[Console] = None,
+    cache: Optional[SkillDiscoveryCache] = None,
+    workers: int = 1,
 ) -> DiscoveryReport:
+    """Scan skill roots in order; the first skill with a given name wins.
+
+    A root may also be a skill pack file (`solo-company skills pack`): its skills are
+    loaded from the pack index without walking directories or parsing YAML.
+
+    With a `cache`, unchanged SKILL.md files cost one `stat()` each; resource files are
+    not touched (`SkillIndex.resources` lists them when a work order needs them). With
+    `workers > 1` roots are listed and SKILL.md files parsed on a thread pool; results
+    are merged in root/folder order afterwards, so the report is identical to a
+    sequential scan.
+    """
     console = console or Console()
     roots_in = list(roots) if roots is not None else list(DEFAULT_SKILL_DIRS)
 
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="skill-scan") if workers > 1 else None
+    try:
+        if pool is not None:
+            listed = list(pool.map(_list_root, roots_in))
+        else:
+            listed = [_list_root(r) for r in roots_in]
+        flat = [(skill_md, st) for lst in listed for _child, skill_md, st in lst.candidates]
+        if pool is not None:
+            loaded = list(pool.map(lambda c: _load_candidate(c[0], c[1], cache), flat))
+        else:
+            loaded = [_load_candidate(skill_md, st, cache) for skill_md, st in flat]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
     roots_scanned: List[Path] = []
     skills: List[SkillRef] = []
     errors: List[str] = []
+    timings: List[RootTiming] = []
 
     seen_names: set[str] = set()
 
-    for root_str in roots_in:
-        root = _expand_dir(root_str)
-        if not root.exists() or not root.is_dir():
+    results = iter(loaded)
+    for lst in listed:
+        root = lst.root
+        if root is None:
             continue
         roots_scanned.append(root)
+        timing = RootTiming(root=root, folders=len(lst.candidates), seconds=lst.seconds)
+        timings.append(timing)
+        if lst.error:
+            errors.append(lst.error)
 
-        for child in sorted(root.iterdir()):
-            if not child.is_dir():
+        for ref in lst.packed:
+            if ref.frontmatter.name in seen_names:
+                errors.append(
+                    f"Duplicate skill name '{ref.frontmatter.name}' found in pack {root} (already loaded)"
+                )
                 continue
-            skill_md = child / "SKILL.md"
-            if not skill_md.exists():
+            seen_names.add(ref.frontmatter.name)
+            timing.skills += 1
+            skills.append(ref)
+
+        for child, skill_md, _st in lst.candidates:
+            fm, error, seconds = next(results)
+            timing.seconds += seconds
+            if fm is None:
+                errors.append(error or f"Failed to load {skill_md}")
                 continue
-            try:
-                fm = load_skill_frontmatter(skill_md)
-                if fm.name in seen_names:
-                    errors.append(
-                        f"Duplicate skill name '{fm.name}' found at {skill_md} (already loaded)"
-                    )
-                    continue
-                seen_names.add(fm.name)
-                skills.append(SkillRef(folder=child, skill_md=skill_md, frontmatter=fm))
-            except SkillParseError as e:
-                errors.append(str(e))
+            if fm.name in seen_names:
+                errors.append(
+                    f"Duplicate skill name '{fm.name}' found at {skill_md} (already loaded)"
+                )
+                continue
+            seen_names.add(fm.name)
+            timing.skills += 1
+            skills.append(
+                SkillRef(folder=child, skill_md=skill_md, frontmatter=fm)
+            )
 
-    return DiscoveryReport(roots_scanned=roots_scanned, skills=skills, errors=errors)
+    if cache is not None:
+        cache.save()
+    return DiscoveryReport(roots_scanned=roots_scanned, skills=skills, errors=errors, timings=timings)
 
 
-def validate_skills(roots: Optional[Iterable[str]] = None) -> DiscoveryReport:
+def validate_skills(
+    roots: Optional[Iterable[str]] = None,
+    cache: Optional[SkillDiscoveryCache] = None,
+    workers: int = 1,
+) -> DiscoveryReport:
     # discovery already validates; this just returns a report
-    return discover_skills(roots=roots)
+    return discover_skills(roots=roots, cache=cache, workers=workers)
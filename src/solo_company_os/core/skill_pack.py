@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Union
+
+from .schema import SkillFrontmatter, SkillRef
+from .skill import load_skill_body
+from .skill_resources import SkillResource, list_resources
+from .trace import utc_now_iso
+
+
+PACK_MAGIC = b"SCOSPK01"
+
+PACK_SUFFIX = ".scpack"
+
+_HEADER = struct.Struct("<8sQ")  # magic, index length
+
+
+class SkillPackError(RuntimeError):
+    pass
+
+
+def is_skill_pack(path: Path) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(PACK_MAGIC)) == PACK_MAGIC
+    except OSError:
+        return False
+
+
+def write_skill_pack(skills: Sequence[SkillRef], out: Union[str, Path]) -> Dict[str, Any]:
+    """Compile discovered skills into one file: header, JSON index, then UTF-8 bodies.
+
+    Layout: `PACK_MAGIC`, little-endian u64 index length, the index, and the bodies
+    back to back, each followed by its skill's resource files. Index entries carry
+    validated frontmatter, offsets/lengths relative to the end of the index, and the
+    SHA-256 of the source SKILL.md and of every resource.
+    """
+    out = Path(out)
+    entries: List[Dict[str, Any]] = []
+    bodies: List[bytes] = []
+    offset = 0
+    for ref in skills:
+        name = ref.frontmatter.name
+        if ref.pack is not None:  # re-packing skills that came from another pack
+            body = ref.pack.body(name).encode("utf-8")
+            digest = ref.pack.sha256(name)
+        else:
+            body = load_skill_body(ref.skill_md).encode("utf-8")
+            digest = hashlib.sha256(ref.skill_md.read_bytes()).hexdigest()
+        resources: List[Dict[str, Any]] = []
+        blobs: List[bytes] = []
+        res_offset = offset + len(body)
+        for res in list_resources(ref):
+            if ref.pack is not None:
+                data = ref.pack.resource(name, res.path)
+            else:
+                try:
+                    data = (ref.folder / res.path).read_bytes()
+                except OSError:
+                    continue
+            resources.append(
+                {
+                    "path": res.path,
+                    "size": len(data),
+                    "sha256": hashlib.sha256(data).hexdigest(),
+                    "offset": res_offset,
+                    "length": len(data),
+                }
+            )
+            blobs.append(data)
+            res_offset += len(data)
+        entries.append(
+            {
+                "name": name,
+                "folder": str(ref.folder),
+                "skill_md": str(ref.skill_md),
+                "frontmatter": ref.frontmatter.model_dump(exclude_unset=True),
+                "sha256": digest,
+                "offset": offset,
+                "length": len(body),
+                "resources": resources,
+            }
+        )
+        bodies.append(body)
+        bodies.extend(blobs)
+        offset = res_offset
+    index = json.dumps(
+        {"version": 1, "created_at": utc_now_iso(), "skills": entries}, ensure_ascii=False
+    ).encode("utf-8")
+
+    out.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".pack-", suffix=".tmp", dir=out.parent)
+    with os.fdopen(fd, "wb") as f:
+        f.write(_HEADER.pack(PACK_MAGIC, len(index)))
+        f.write(index)
+        for body in bodies:
+            f.write(body)
+    os.replace(tmp, out)
+    return {"path": str(out), "skills": len(entries), "bytes": out.stat().st_size}
+
+
+class SkillPack:
+    """Read side of a skill pack. The file is memory-mapped; bodies are decoded on demand.
+
+    Only the header and index are read when opening, so every process that opens the
+    same pack shares the page cache for the bodies.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < _HEADER.size:
+            raise SkillPackError(f"Not a skill pack (too short): {self.path}")
+        magic, index_len = _HEADER.unpack_from(self._mm, 0)
+        if magic != PACK_MAGIC:
+            raise SkillPackError(f"Not a skill pack (bad magic): {self.path}")
+        start = _HEADER.size
+        try:
+            index = json.loads(self._mm[start : start + index_len].decode("utf-8"))
+        except ValueError as e:
+            raise SkillPackError(f"Corrupt skill pack index in {self.path}: {e}") from e
+        self._data_start = start + index_len
+        self.created_at: str = index.get("created_at", "")
+        self._entries: Dict[str, Dict[str, Any]] = {e["name"]: e for e in index["skills"]}
+        self._order: List[str] = [e["name"] for e in index["skills"]]
+
+    def refs(self) -> List[SkillRef]:
+        """SkillRefs in pack order; frontmatter is rebuilt without re-validation."""
+        out: List[SkillRef] = []
+        for name in self._order:
+            e = self._entries[name]
+            out.append(
+                SkillRef(
+                    folder=Path(e["folder"]),
+                    skill_md=Path(e["skill_md"]),
+                    frontmatter=SkillFrontmatter.model_construct(**e["frontmatter"]),
+                    pack=self,
+                    resources=tuple(
+                        SkillResource(path=r["path"], size=r["size"], sha256=r["sha256"])
+                        for r in e.get("resources", [])
+                    ),
+                )
+            )
+        return out
+
+    def body(self, name: str) -> str:
+        e = self._entries[name]
+        start = self._data_start + e["offset"]
+        return self._mm[start : start + e["length"]].decode("utf-8")
+
+    def resource(self, name: str, path: str) -> bytes:
+        for r in self._entries[name].get("resources", []):
+            if r["path"] == path:
+                start = self._data_start + r["offset"]
+                return self._mm[start : start + r["length"]]
+        raise KeyError(f"{name}/{path}")
+
+    def sha256(self, name: str) -> str:
+        return self._entries[name]["sha256"]
+
+    def stale(self) -> List[str]:
+        """Names whose source SKILL.md still exists but no longer matches the packed hash."""
+        out: List[str] = []
+        for name in self._order:
+            src = Path(self._entries[name]["skill_md"])
+            try:
+                digest = hashlib.sha256(src.read_bytes()).hexdigest()
+            except OSError:
+                continue
+            if digest != self.sha256(name):
+                out.append(name)
+        return out
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from rich.console import Console
+
+from .skill_cache import SkillDiscoveryCache
+from .skill_index import DISCOVERY_WORKERS, DiscoveryReport, SkillIndex, _expand_dir, discover_skills
+from .trace import utc_now_iso
+
+
+logger = logging.getLogger(__name__)
+
+Fingerprint = Tuple[Any, ...]
+
+ReloadListener = Callable[[Dict[str, Any]], None]
+
+
+@dataclass
+class _Entry:
+    roots: Tuple[str, ...]
+    fingerprint: Fingerprint
+    report: DiscoveryReport
+    index: SkillIndex
+    loaded_at: str = field(default_factory=utc_now_iso)
+    # Last failed reload ("Type: message"); the previous index keeps being served.
+    reload_error: Optional[str] = None
+
+
+def roots_fingerprint(roots: Sequence[str]) -> Fingerprint:
+    """Cheap change detector for a set of skill roots: stats only, no file reads.
+
+    Covers skill folders being added or removed (root mtime), files being added to or
+    removed from a skill folder (folder mtime), and SKILL.md files being created, edited
+    or deleted (per-file mtime and size). Resource files are not stat'ed here: a rebuilt
+    index re-lists them only for skills whose folders changed (`SkillIndex.resources`).
+    """
+    parts: List[Any] = []
+    for root_str in roots:
+        root = _expand_dir(root_str)
+        try:
+            st = os.stat(root)
+        except OSError:
+            parts.append((str(root), None))
+            continue
+        skills: List[Tuple[str, int, int, int]] = []
+        try:
+            with os.scandir(root) as it:
+                for de in it:
+                    if not de.is_dir():
+                        continue
+                    try:
+                        md = os.stat(os.path.join(de.path, "SKILL.md"))
+                    except OSError:
+                        continue
+                    skills.append((de.name, de.stat().st_mtime_ns, md.st_mtime_ns, md.st_size))
+        except OSError:
+            pass
+        skills.sort()
+        parts.append((str(root), st.st_mtime_ns, tuple(skills)))
+    return tuple(parts)
+
+
+class SkillRegistry:
+    """Shared `SkillIndex` objects, one per distinct list of skill roots.
+
+    Discovery runs once per root list; afterwards `get()` is a dictionary lookup. A
+    background thread polls the roots every `poll_interval` seconds and rebuilds an
+    index only when its fingerprint changed. Runs already holding the previous index
+    keep it; new callers get the fresh one. Each reload is appended to `events` and
+    passed to listeners registered with `subscribe()`.
+
+    With `poll_interval=None` there is no thread and `get()` re-checks the fingerprint
+    itself, which suits short-lived or single-threaded hosts. A discovery `cache` is
+    shared by every reload and by the indexes' search.
+    """
+
+    def __init__(
+        self,
+        *,
+        poll_interval: Optional[float] = 2.0,
+        max_events: int = 50,
+        cache: Optional[SkillDiscoveryCache] = None,
+    ):
+        self.poll_interval = poll_interval
+        self.cache = cache
+        self._entries: Dict[Tuple[str, ...], _Entry] = {}
+        self._lock = threading.Lock()
+        self._listeners: List[ReloadListener] = []
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=max_events)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self.poll_interval is None or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="skill-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def subscribe(self, listener: ReloadListener) -> None:
+        with self._lock:
+            self._listeners.append(listener)
+
+    def get(self, roots: Sequence[str]) -> SkillIndex:
+        key = tuple(roots)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return self._load(key).index
+        if self._thread is None:
+            self.refresh(key)
+            with self._lock:
+                entry = self._entries[key]
+        return entry.index
+
+    def report(self, roots: Sequence[str]) -> Optional[DiscoveryReport]:
+        with self._lock:
+            entry = self._entries.get(tuple(roots))
+        return entry.report if entry else None
+
+    def refresh(self, roots: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """Reload the given root list (or every known one) if it changed on disk."""
+        with self._lock:
+            keys = [tuple(roots)] if roots is not None else list(self._entries)
+        events: List[Dict[str, Any]] = []
+        for key in keys:
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is None:
+                continue
+            if roots_fingerprint(key) == entry.fingerprint:
+                continue
+            try:
+                fresh = self._load(key)
+            except Exception as exc:
+                error = f"{type(exc).__name__}: {exc}"
+                if error != entry.reload_error:  # the watcher retries every tick; log each error once
+                    logger.exception("Reloading skills from %s failed", list(key))
+                with self._lock:
+                    entry.reload_error = error
+                continue
+            old = {s.frontmatter.name for s in entry.index.skills}
+            new = {s.frontmatter.name for s in fresh.index.skills}
+            evt = {
+                "ts": fresh.loaded_at,
+                "roots": list(key),
+                "skills": len(new),
+                "added": sorted(new - old),
+                "removed": sorted(old - new),
+                "errors": list(fresh.report.errors),
+            }
+            events.append(evt)
+            self._publish(evt)
+        return events
+
+    def status(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            entries = list(self._entries.values())
+        return [
+            {
+                "roots": list(e.roots),
+                "roots_scanned": [str(p) for p in e.report.roots_scanned],
+                "skills": len(e.index.skills),
+                "errors": list(e.report.errors),
+                "loaded_at": e.loaded_at,
+                "reload_error": e.reload_error,
+            }
+            for e in entries
+        ]
+
+    def _load(self, key: Tuple[str, ...]) -> _Entry:
+        # Fingerprint first: an edit landing during discovery triggers another reload.
+        fingerprint = roots_fingerprint(key)
+        report = discover_skills(
+            roots=list(key), console=Console(), cache=self.cache, workers=DISCOVERY_WORKERS
+        )
+        index = SkillIndex(report.skills, cache=self.cache)
+        with self._lock:
+            previous = self._entries.get(key)
+        if previous is not None:
+            # Only skills that changed are re-tokenized for search.
+            index.adopt_search_index(previous.index)
+        entry = _Entry(roots=key, fingerprint=fingerprint, report=report, index=index)
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def _publish(self, evt: Dict[str, Any]) -> None:
+        with self._lock:
+            self.events.append(evt)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(evt)
+            except Exception:
+                # A broken listener must not stop the watcher or the other listeners.
+                logger.exception("Skill reload listener %r failed", listener)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.poll_interval or 0):
+            try:
+                self.refresh()
+            except Exception:
+                # Transient filesystem errors; retry on the next tick.
+                logger.exception("Skill watcher tick failed")
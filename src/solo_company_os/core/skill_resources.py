@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Optional, Tuple
+
+
+# Files beyond this many per skill are not indexed (keeps discovery bounded).
+MAX_RESOURCES_PER_SKILL = 256
+
+# Files larger than this are listed but never injected into prompts.
+MAX_INJECT_BYTES = 256 * 1024
+
+# Bytes read from a candidate file to judge its relevance.
+HEAD_BYTES = 2048
+
+_SKIP_DIRS = {"__pycache__", "node_modules"}
+
+
+@dataclass(frozen=True)
+class SkillResource:
+    """A file shipped next to SKILL.md (references/, scripts/, assets/, ...)."""
+
+    path: str  # POSIX path relative to the skill folder
+    size: int
+    mtime_ns: int = 0
+    sha256: Optional[str] = None  # known for packed skills; files in folders are never hashed
+
+    @property
+    def approx_tokens(self) -> int:
+        # ~4 bytes per token is close enough to budget prompt space before reading.
+        return max(1, self.size // 4)
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def iter_resource_files(folder: Path) -> Iterator[Tuple[str, os.stat_result]]:
+    """(relative POSIX path, stat) of each resource file under a skill folder, in order.
+
+    Hidden files, `__pycache__`/`node_modules` and the top-level SKILL.md are skipped;
+    at most `MAX_RESOURCES_PER_SKILL` files are yielded.
+    """
+    count = 0
+    for root, dirs, files in os.walk(folder):
+        dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d not in _SKIP_DIRS)
+        for name in sorted(files):
+            if name.startswith("."):
+                continue
+            path = Path(root) / name
+            rel = path.relative_to(folder).as_posix()
+            if rel == "SKILL.md":
+                continue
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            yield rel, st
+            count += 1
+            if count >= MAX_RESOURCES_PER_SKILL:
+                return
+
+
+def index_resources(folder: Path) -> Tuple[SkillResource, ...]:
+    """List resource files under a skill folder with sizes and mtimes: stats only, no reads."""
+    return tuple(
+        SkillResource(path=rel, size=st.st_size, mtime_ns=st.st_mtime_ns) for rel, st in iter_resource_files(folder)
+    )
+
+
+def list_resources(ref: Any) -> Tuple[SkillResource, ...]:
+    """A `SkillRef`'s resource files: from the pack index, or listed from its folder now."""
+    if ref.pack is not None:
+        return ref.resources
+    return index_resources(ref.folder)
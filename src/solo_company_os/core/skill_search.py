@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+
+_WORD = re.compile(r"[a-z0-9]+")
+_CJK_RUN = re.compile(r"[㐀-鿿豈-﫿]+")
+
+# Field weights, applied as repeated term frequency.
+NAME_WEIGHT = 3
+DESCRIPTION_WEIGHT = 2
+HEADING_WEIGHT = 1
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase ASCII words plus CJK character bigrams (single characters for 1-char runs).
+
+    Chinese has no spaces, so `生成项目` becomes `生成`, `成项`, `项目`, which lets
+    missions and descriptions match on shared two-character words.
+    """
+    lowered = text.lower()
+    tokens = _WORD.findall(lowered)
+    for run in _CJK_RUN.findall(lowered):
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i : i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def body_headings(body: str) -> str:
+    return "\n".join(line.lstrip("#").strip() for line in body.splitlines() if line.startswith("#"))
+
+
+def skill_terms(name: str, description: str, headings: str) -> Counter:
+    terms: Counter = Counter()
+    for field, weight in (
+        (name.replace("-", " "), NAME_WEIGHT),
+        (description, DESCRIPTION_WEIGHT),
+        (headings, HEADING_WEIGHT),
+    ):
+        for tok in tokenize(field):
+            terms[tok] += weight
+    return terms
+
+
+class BM25Index:
+    """Okapi BM25 over an inverted index that supports adding and removing documents.
+
+    Postings, document lengths and document frequencies are updated in place, so
+    replacing one changed skill costs that skill's terms, not a full rebuild.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_terms: Dict[str, Counter] = {}
+        self._doc_len: Dict[str, int] = {}
+        self._total_len = 0
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_terms
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def doc_ids(self) -> List[str]:
+        return list(self._doc_terms)
+
+    def add(self, doc_id: str, terms: Counter) -> None:
+        if doc_id in self._doc_terms:
+            self.remove(doc_id)
+        self._doc_terms[doc_id] = terms
+        length = sum(terms.values())
+        self._doc_len[doc_id] = length
+        self._total_len += length
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+
+    def remove(self, doc_id: str) -> None:
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        self._total_len -= self._doc_len.pop(doc_id)
+        for term in terms:
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(doc_id, None)
+            if not posting:
+                del self._postings[term]
+
+    def copy(self) -> "BM25Index":
+        other = BM25Index(k1=self.k1, b=self.b)
+        other._postings = {t: dict(p) for t, p in self._postings.items()}
+        other._doc_terms = dict(self._doc_terms)
+        other._doc_len = dict(self._doc_len)
+        other._total_len = self._total_len
+        return other
+
+    def search(self, query: Iterable[str], k: int) -> List[Tuple[str, float]]:
+        n = len(self._doc_terms)
+        if not n or k <= 0:
+            return []
+        avg_len = self._total_len / n or 1.0
+        scores: Dict[str, float] = {}
+        for term in set(query):
+            posting = self._postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for doc_id, tf in posting.items():
+                norm = tf + self.k1 * (1 - self.b + self.b * self._doc_len[doc_id] / avg_len)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:k]
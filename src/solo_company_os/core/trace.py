@@ -24,6 +24,9 @@ class TraceRecorder:
         self.path.parent.mkdir(parents=True, exist_ok=True)
 
     def emit(self, type: str, payload: Optional[Dict[str, Any]] = None) -> None:
-        evt = TraceEvent(ts=utc_now_iso(), type=type, payload=payload or {})
+        self.write(TraceEvent(ts=utc_now_iso(), type=type, payload=payload or {}))
+
+    def write(self, evt: TraceEvent) -> None:
+        """Append an already-timestamped event (e.g. one relayed from a worker process)."""
         with open(self.path, "a", encoding="utf-8") as f:
             f.write(json.dumps(evt.__dict__, ensure_ascii=False) + "\n")
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+from .providers.base import CallUsage
+
+
+class PriceTableError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class ModelPrice:
+    input_per_mtok: float  # USD per 1M prompt tokens
+    output_per_mtok: float  # USD per 1M completion tokens
+    cached_input_per_mtok: Optional[float] = None  # prompt-cache hits; None = billed as input
+
+
+# Built-in list prices (USD / 1M tokens). Extend or override them with a JSON file
+# passed as `--price-table` or `$SCOS_PRICE_TABLE`:
+#   {"gpt-4o-mini": {"input": 0.15, "output": 0.60, "cached_input": 0.075}, "my-model": [1.0, 2.0]}
+DEFAULT_PRICES: Dict[str, ModelPrice] = {
+    "gpt-4o-mini": ModelPrice(0.15, 0.60, 0.075),
+    "gpt-4o": ModelPrice(2.50, 10.00, 1.25),
+    "mock": ModelPrice(0.0, 0.0),
+    "replay": ModelPrice(0.0, 0.0),
+}
+
+
+# OpenAI's Batch API bills both input and output at half the synchronous price.
+BATCH_DISCOUNT = 0.5
+
+
+class PriceTable:
+    """Per-model prices. Dated model ids (`gpt-4o-mini-2024-07-18`) match by longest prefix."""
+
+    def __init__(self, prices: Mapping[str, ModelPrice]):
+        self.prices = dict(prices)
+
+    @classmethod
+    def load(cls, path: Optional[Union[str, Path]] = None) -> "PriceTable":
+        prices = dict(DEFAULT_PRICES)
+        path = path or os.getenv("SCOS_PRICE_TABLE")
+        if path:
+            try:
+                data = json.loads(Path(path).read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                raise PriceTableError(f"Cannot read price table {path}: {e}") from e
+            if not isinstance(data, dict):
+                raise PriceTableError(f"Price table {path} must be a JSON object keyed by model")
+            for model, spec in data.items():
+                prices[model] = _parse_price(model, spec)
+        return cls(prices)
+
+    def lookup(self, model: str) -> Optional[ModelPrice]:
+        if model in self.prices:
+            return self.prices[model]
+        matches = [k for k in self.prices if model.startswith(k)]
+        return self.prices[max(matches, key=len)] if matches else None
+
+    def cost(self, usage: CallUsage) -> Optional[float]:
+        """USD for one call; None when the model is not priced or tokens were not reported."""
+        price = self.lookup(usage.model)
+        if price is None:
+            return None
+        if price.input_per_mtok == 0 and price.output_per_mtok == 0:
+            return 0.0
+        if usage.prompt_tokens is None or usage.completion_tokens is None:
+            return None
+        cached = min(usage.cached_tokens or 0, usage.prompt_tokens)
+        cached_rate = price.input_per_mtok if price.cached_input_per_mtok is None else price.cached_input_per_mtok
+        cost = (
+            (usage.prompt_tokens - cached) * price.input_per_mtok
+            + cached * cached_rate
+            + usage.completion_tokens * price.output_per_mtok
+        ) / 1_000_000
+        return cost * BATCH_DISCOUNT if usage.batch else cost
+
+
+def _parse_price(model: str, spec: Any) -> ModelPrice:
+    try:
+        if isinstance(spec, dict):
+            cached = spec.get("cached_input")
+            return ModelPrice(float(spec["input"]), float(spec["output"]), None if cached is None else float(cached))
+        if isinstance(spec, (list, tuple)) and len(spec) in (2, 3):
+            return ModelPrice(*(float(x) for x in spec))
+    except (KeyError, TypeError, ValueError):
+        pass
+    raise PriceTableError(f"Bad price for {model}: expected {{'input': x, 'output': y}} or [x, y]; 'cached_input' is optional")
+
+
+def usage_payload(usage: CallUsage, cost: Optional[float]) -> Dict[str, Any]:
+    """The `usage` object attached to `plan.response` / `skill.exec.response` trace events."""
+    out = asdict(usage)
+    out["ttfb_s"] = None if usage.ttfb_s is None else round(usage.ttfb_s, 4)
+    out["latency_s"] = round(usage.latency_s, 4)
+    out["cost_usd"] = None if cost is None else round(cost, 6)
+    return out
+
+
+@dataclass
+class UsageRow:
+    step: str  # "plan" or a work order id
+    skill: str
+    usage: CallUsage
+    cost: Optional[float]
+
+
+@dataclass
+class UsageTotals:
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    latency_s: float = 0.0
+    cost_usd: float = 0.0
+    # Calls whose tokens or price were unknown; their cost is not in `cost_usd`.
+    unpriced_calls: int = 0
+    rows: List[UsageRow] = field(default_factory=list)
+
+    def add(self, step: str, skill: str, usage: CallUsage, cost: Optional[float]) -> None:
+        self.rows.append(UsageRow(step, skill, usage, cost))
+        self.calls += 1
+        self.prompt_tokens += usage.prompt_tokens or 0
+        self.completion_tokens += usage.completion_tokens or 0
+        self.cached_tokens += usage.cached_tokens or 0
+        self.latency_s += usage.latency_s
+        if cost is None:
+            self.unpriced_calls += 1
+        else:
+            self.cost_usd += cost
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "latency_s": round(self.latency_s, 4),
+            "cost_usd": round(self.cost_usd, 6),
+            "unpriced_calls": self.unpriced_calls,
+        }
+
+    def markdown(self) -> str:
+        """The `## Usage` section of RUN.md: one row per call plus totals."""
+        lines = [
+            "## Usage\n\n",
+            "| Step | Skill | Model | Prompt tok | Cached tok | Completion tok | TTFB s | Latency s | Cost USD |\n",
+            "|---|---|---|---:|---:|---:|---:|---:|---:|\n",
+        ]
+        for r in self.rows:
+            u = r.usage
+            lines.append(
+                f"| {r.step} | {r.skill or '-'} | {u.model} | {_n(u.prompt_tokens)} | {_n(u.cached_tokens)} "
+                f"| {_n(u.completion_tokens)} | {_s(u.ttfb_s)} | {_s(u.latency_s)} | {_usd(r.cost)} |\n"
+            )
+        lines.append(
+            f"| **Total** | | | {self.prompt_tokens} | {self.cached_tokens} | {self.completion_tokens} | | "
+            f"{_s(self.latency_s)} | {_usd(self.cost_usd)} |\n"
+        )
+        if self.cached_tokens and self.prompt_tokens:
+            lines.append(
+                f"\nPrompt cache: {self.cached_tokens} of {self.prompt_tokens} prompt tokens "
+                f"({self.cached_tokens / self.prompt_tokens:.0%}) were served from the provider's cache.\n"
+            )
+        if self.unpriced_calls:
+            lines.append(
+                f"\n{self.unpriced_calls} call(s) without token counts or a price are not included in the cost "
+                "(see `--price-table`).\n"
+            )
+        return "".join(lines)
+
+
+def _n(value: Optional[int]) -> str:
+    return "-" if value is None else str(value)
+
+
+def _s(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.3f}"
+
+
+def _usd(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.4f}"
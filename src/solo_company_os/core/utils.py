@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from datetime import datetime, timezone
 from pathlib import Path
 from uuid import uuid4
@@ -12,3 +13,13 @@ def new_run_id() -> str:
 
 def default_run_dir() -> Path:
     return Path("runs") / new_run_id()
+
+
+def default_cache_dir() -> Path:
+    """`$SCOS_CACHE_DIR`, else `$XDG_CACHE_HOME/solo-company`, else `~/.cache/solo-company`."""
+    env = os.getenv("SCOS_CACHE_DIR")
+    if env:
+        return Path(env).expanduser()
+    xdg = os.getenv("XDG_CACHE_HOME")
+    base = Path(xdg).expanduser() if xdg else Path.home() / ".cache"
+    return base / "solo-company"
@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import socket
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    Mapping,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+)
+
+from .core.utils import default_cache_dir
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from .core.providers.base import LLMProvider
+
+
+# Imported by the `solo-company` entry point on every invocation: the client half of
+# this module must stay standard-library only. Server-side imports happen in serve().
+
+FORWARDED_COMMANDS = ("run", "skills")
+
+# Settings that change what a command does; a daemon started with different values
+# refuses the request and the CLI runs it locally instead.
+_ENV_PREFIXES = ("OPENAI_", "SCOS_", "SKILLSMP_")
+_ENV_IGNORED = {"SCOS_NO_DAEMON"}
+
+
+def socket_path(cwd: Optional[str] = None) -> Path:
+    """One daemon per project directory: relative paths (skills, runs/, --out) stay valid."""
+    root = os.path.realpath(cwd or os.getcwd())
+    digest = hashlib.sha256(root.encode("utf-8")).hexdigest()[:16]
+    return default_cache_dir() / "daemon" / f"{digest}.sock"
+
+
+def env_fingerprint(environ: Mapping[str, str]) -> str:
+    items = sorted(
+        (k, v) for k, v in environ.items() if k.startswith(_ENV_PREFIXES) and k not in _ENV_IGNORED
+    )
+    return hashlib.sha256(json.dumps(items).encode("utf-8")).hexdigest()
+
+
+def _effective_env() -> Dict[str, str]:
+    """`os.environ` plus `.env` (the environment wins), as the CLI's `_load_env` leaves it."""
+    env = dict(os.environ)
+    try:
+        from dotenv import dotenv_values
+
+        for key, value in dotenv_values(".env").items():
+            if value is not None:
+                env.setdefault(key, value)
+    except Exception:
+        pass
+    return env
+
+
+def should_forward(argv: Sequence[str]) -> bool:
+    return (
+        bool(argv)
+        and argv[0] in FORWARDED_COMMANDS
+        and "--help" not in argv
+        and not os.environ.get("SCOS_NO_DAEMON")
+    )
+
+
+def _send(sock: socket.socket, msg: Dict[str, Any]) -> None:
+    sock.sendall((json.dumps(msg, ensure_ascii=False) + "\n").encode("utf-8"))
+
+
+def _messages(sock: socket.socket) -> Iterator[Dict[str, Any]]:
+    with sock.makefile("rb") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def _connect(path: Path) -> Optional[socket.socket]:
+    if not path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()  # stale socket file: no daemon behind it
+        return None
+    return sock
+
+
+def forward(
+    argv: Sequence[str], *, path: Optional[Path] = None, out: Optional[TextIO] = None
+) -> Optional[int]:
+    """Run `argv` in the daemon serving the current directory, streaming its output.
+
+    Returns the command's exit code, or None when no daemon took the request (none
+    running, or it refused because its environment differs); the caller then runs
+    the command itself.
+    """
+    sock = _connect(path or socket_path())
+    if sock is None:
+        return None
+    out = out or sys.stdout
+    started = False
+    with sock:
+        try:
+            _send(
+                sock,
+                {
+                    "op": "run",
+                    "argv": list(argv),
+                    "cwd": os.getcwd(),
+                    "env": env_fingerprint(_effective_env()),
+                    "tty": out.isatty(),
+                    "width": shutil.get_terminal_size().columns,
+                },
+            )
+            for msg in _messages(sock):
+                kind = msg.get("t")
+                if kind == "refused":
+                    return None
+                if kind == "start":
+                    started = True
+                elif kind == "out":
+                    out.write(msg["data"])
+                    out.flush()
+                elif kind == "exit":
+                    return int(msg["code"])
+        except OSError:
+            pass
+    if not started:
+        return None
+    # The command may have had side effects already; do not silently run it twice.
+    print("solo-company: lost connection to the daemon", file=sys.stderr)
+    return 1
+
+
+def request(msg: Dict[str, Any], path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """Send a control message (`status`, `stop`); None when no daemon is listening."""
+    sock = _connect(path or socket_path())
+    if sock is None:
+        return None
+    with sock:
+        _send(sock, msg)
+        for reply in _messages(sock):
+            return reply
+    return None
+
+
+class WarmState:
+    """What the daemon keeps hot between commands: skill indexes and provider clients."""
+
+    def __init__(self) -> None:
+        from .core.skill_cache import SkillDiscoveryCache
+        from .core.skill_registry import SkillRegistry
+
+        # No watcher thread: every get() re-checks the roots' fingerprint (stats
+        # only), so an edited SKILL.md is picked up by the very next command.
+        self.skills = SkillRegistry(poll_interval=None, cache=SkillDiscoveryCache())
+        self._providers: Dict[Tuple[str, Optional[str]], "LLMProvider"] = {}
+        self._lock = threading.Lock()
+
+    def provider(
+        self,
+        name: str,
+        model: Optional[str],
+        factory: Callable[[str, Optional[str]], "LLMProvider"],
+    ) -> "LLMProvider":
+        key = (name, model)
+        with self._lock:
+            prov = self._providers.get(key)
+            if prov is None:
+                prov = self._providers[key] = factory(name, model)
+            return prov
+
+    def close(self) -> None:
+        with self._lock:
+            providers = list(self._providers.values())
+            self._providers.clear()
+        for prov in providers:
+            close = getattr(prov, "close", None)
+            if callable(close):
+                close()
+
+
+class _Stream:
+    """File-like target for a rich Console: every write becomes an `out` frame.
+
+    Once the client has gone (Ctrl-C, closed terminal) writes raise, which aborts the
+    command the same way interrupting a local process would.
+    """
+
+    def __init__(self, sock: socket.socket):
+        self._sock = sock
+        self._lock = threading.Lock()
+        self.broken = False
+
+    def write(self, data: str) -> int:
+        if data:
+            with self._lock:
+                try:
+                    _send(self._sock, {"t": "out", "data": data})
+                except OSError:
+                    self.broken = True
+                    raise
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def isatty(self) -> bool:
+        return False
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    server: "DaemonServer"
+
+    def handle(self) -> None:
+        try:
+            req = next(_messages(self.request), None)
+        except ValueError:
+            return
+        if not isinstance(req, dict):
+            return
+        op = req.get("op")
+        if op == "status":
+            _send(self.request, {"t": "status", **self.server.status()})
+        elif op == "stop":
+            _send(self.request, {"t": "ok"})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        elif op == "run":
+            self._run(req)
+        else:
+            _send(self.request, {"t": "refused", "reason": f"unknown op: {op}"})
+
+    def _run(self, req: Dict[str, Any]) -> None:
+        from rich.console import Console
+
+        from .cli import _invoke
+
+        if os.path.realpath(str(req.get("cwd"))) != self.server.cwd:
+            _send(self.request, {"t": "refused", "reason": f"daemon serves {self.server.cwd}"})
+            return
+        if req.get("env") != self.server.env:
+            _send(self.request, {"t": "refused", "reason": "environment differs; restart the daemon"})
+            return
+        _send(self.request, {"t": "start"})
+        tty = bool(req.get("tty"))
+        stream = _Stream(self.request)
+        out = Console(
+            file=stream,  # type: ignore[arg-type]
+            width=int(req.get("width") or 80),
+            force_terminal=tty,
+            color_system="auto" if tty else None,
+        )
+        t0 = time.perf_counter()
+        try:
+            code = _invoke([str(a) for a in req.get("argv", [])], out)
+        except Exception:
+            if stream.broken:
+                return
+            out.print_exception()
+            code = 1
+        self.server.record(time.perf_counter() - t0)
+        try:
+            _send(self.request, {"t": "exit", "code": code})
+        except OSError:
+            pass
+
+
+class DaemonServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: Path, warm: WarmState, *, cwd: Optional[str] = None):
+        self.path = path
+        self.warm = warm
+        self.cwd = os.path.realpath(cwd or os.getcwd())
+        self.env = env_fingerprint(os.environ)
+        self.started_at = time.time()
+        self.commands = 0
+        self.busy_seconds = 0.0
+        self._stats_lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(str(path), _Handler)
+
+    def record(self, seconds: float) -> None:
+        with self._stats_lock:
+            self.commands += 1
+            self.busy_seconds += seconds
+
+    def status(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            commands, busy = self.commands, self.busy_seconds
+        return {
+            "pid": os.getpid(),
+            "cwd": self.cwd,
+            "socket": str(self.path),
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "commands": commands,
+            "busy_s": round(busy, 3),
+            "skills": self.warm.skills.status(),
+        }
+
+
+def serve(path: Path, *, console: "Console", on_ready: Optional[Callable[[DaemonServer], None]] = None) -> None:
+    """Serve forwarded commands on `path` until `stop` is requested or the process is interrupted."""
+    from . import cli
+
+    if _connect(path) is not None:
+        raise RuntimeError(f"A daemon is already listening on {path}")
+    path.unlink(missing_ok=True)
+
+    warm = WarmState()
+    server = DaemonServer(path, warm)
+    cli._warm = warm
+    try:
+        os.chmod(path, 0o600)
+        console.print(f"[green]Daemon ready[/green] for {server.cwd} (pid {os.getpid()}) on {path}")
+        if on_ready is not None:
+            on_ready(server)
+        server.serve_forever(poll_interval=0.2)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        cli._warm = None
+        server.server_close()
+        path.unlink(missing_ok=True)
+        warm.close()
+
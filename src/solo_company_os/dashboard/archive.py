@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import os
+import tarfile
+import time
+import zipfile
+import zlib
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+
+CHUNK_SIZE = 256 * 1024
+
+ARCHIVE_FORMATS = ("zip", "tar.gz")
+
+RUN_META_FILES = ("plan.json", "RUN.md", "trace.jsonl", "RUN_ERROR.txt")
+
+
+class _Sink:
+    """Write-only, non-seekable buffer that the generator drains after every write."""
+
+    def __init__(self) -> None:
+        self._parts: List[bytes] = []
+        self._pos = 0
+
+    def write(self, data: bytes) -> int:
+        if data:
+            self._parts.append(bytes(data))
+            self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # zipfile records member offsets via tell(); without seek() it writes data
+        # descriptors instead of rewinding to patch local headers.
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        out = b"".join(self._parts)
+        self._parts.clear()
+        return out
+
+
+def collect_members(run_dir: Path, *, include_meta: bool) -> List[Tuple[Path, str]]:
+    """(file, archive name) pairs: the workspace plus, optionally, run metadata files."""
+    prefix = run_dir.name
+    members: List[Tuple[Path, str]] = []
+    if include_meta:
+        for name in RUN_META_FILES:
+            p = run_dir / name
+            if p.is_file():
+                members.append((p, f"{prefix}/{name}"))
+    workspace = run_dir / "workspace"
+    if workspace.is_dir():
+        for root, dirs, files in os.walk(workspace):
+            dirs.sort()
+            for name in sorted(files):
+                p = Path(root) / name
+                rel = p.relative_to(run_dir).as_posix()
+                members.append((p, f"{prefix}/{rel}"))
+    return members
+
+
+# DOS timestamps in zip headers cover 1980-2107 only; ZipInfo rejects anything earlier.
+_ZIP_MIN_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+_ZIP_MAX_DATE_TIME = (2107, 12, 31, 23, 59, 58)
+
+
+def _zip_date_time(mtime: float) -> Tuple[int, int, int, int, int, int]:
+    date_time = tuple(time.localtime(mtime)[:6])
+    return max(_ZIP_MIN_DATE_TIME, min(date_time, _ZIP_MAX_DATE_TIME))  # type: ignore[return-value]
+
+
+def iter_zip(members: List[Tuple[Path, str]]) -> Iterator[bytes]:
+    """Stream a zip archive: each member is compressed chunk by chunk as it is read."""
+    sink = _Sink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for path, arcname in members:
+            try:
+                st = path.stat()
+                src = open(path, "rb")
+            except OSError:
+                continue  # removed between listing and reading
+            info = zipfile.ZipInfo(arcname, date_time=_zip_date_time(st.st_mtime))
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = (st.st_mode & 0xFFFF) << 16
+            with src, zf.open(info, mode="w", force_zip64=True) as dest:
+                while chunk := src.read(CHUNK_SIZE):
+                    dest.write(chunk)
+                    yield sink.drain()
+            yield sink.drain()
+    yield sink.drain()
+
+
+def iter_tar_gz(members: List[Tuple[Path, str]]) -> Iterator[bytes]:
+    """Stream a gzip-compressed ustar/pax archive without a temporary file."""
+    gz = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: gzip container
+    for path, arcname in members:
+        try:
+            st = path.stat()
+            src = open(path, "rb")
+        except OSError:
+            continue
+        info = tarfile.TarInfo(arcname)
+        info.size = st.st_size
+        info.mtime = int(st.st_mtime)
+        info.mode = st.st_mode & 0o7777
+        with src:
+            yield gz.compress(info.tobuf(format=tarfile.PAX_FORMAT))
+            # The header promised st_size bytes: pad or cut if the file changed meanwhile.
+            remaining = info.size
+            while remaining > 0:
+                chunk = src.read(min(CHUNK_SIZE, remaining)) or b"\0" * min(CHUNK_SIZE, remaining)
+                remaining -= len(chunk)
+                yield gz.compress(chunk)
+        pad = -info.size % tarfile.BLOCKSIZE
+        if pad:
+            yield gz.compress(b"\0" * pad)
+    yield gz.compress(b"\0" * (tarfile.BLOCKSIZE * 2))
+    yield gz.flush()
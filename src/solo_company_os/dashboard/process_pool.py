@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..core.run_catalog import RunCatalog
+from ..core.trace import TraceEvent, TraceRecorder, utc_now_iso
+from .run_queue import QueuedRun
+
+
+class _PipeTraceRecorder(TraceRecorder):
+    """Child-side recorder: events are timestamped here and written by the parent."""
+
+    def __init__(self, path: Path, conn: Any):
+        super().__init__(path)
+        self.conn = conn
+
+    def write(self, evt: TraceEvent) -> None:
+        self.conn.send(("event", evt.__dict__))
+
+
+def _worker_main(conn: Any, cancel: Any) -> None:
+    """Entry point of a worker process: execute jobs until told to stop."""
+    from rich.console import Console
+
+    from ..core.orchestrator import run_mission
+    from ..core.skill_registry import SkillRegistry
+    from .server import _build_provider, _build_skill_index
+
+    # Kept for the life of the process; re-validated by fingerprint on every run.
+    skills = SkillRegistry(poll_interval=None)
+    while True:
+        try:
+            msg = conn.recv()
+        except EOFError:
+            return
+        if msg[0] == "stop":
+            return
+        job: Dict[str, Any] = msg[1]
+        cancel.clear()
+        run_dir = Path(job["run_dir"])
+        try:
+            summary = run_mission(
+                mission=job["mission"],
+                skill_index=_build_skill_index(job["skill_dir"], skills),
+                provider=_build_provider(job["provider"], job["model"]),
+                run_dir=run_dir,
+                workspace=run_dir / "workspace",
+                console=Console(),
+                trace=_PipeTraceRecorder(run_dir / "trace.jsonl", conn),
+                catalog=RunCatalog(Path(job["run_root"])),
+                should_cancel=cancel.is_set,
+            )
+            conn.send(("done", {"cancelled": summary.cancelled}))
+        except Exception as exc:
+            conn.send(("error", str(exc)))
+
+
+class _Worker:
+    def __init__(self, ctx: Any):
+        self.cancel = ctx.Event()
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main, args=(child_conn, self.cancel), name="run-worker", daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.runs = 0
+
+    def stop(self, timeout: float = 5) -> None:
+        try:
+            self.conn.send(("stop",))
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout)
+        self.conn.close()
+
+
+class ProcessRunner:
+    """Executes queued runs in worker processes instead of server threads.
+
+    Each `RunQueue` worker thread owns one child process, so the pool size is the
+    queue's worker count. Mission work (LLM calls, validation, JSON parsing, rendering)
+    happens outside the server's GIL; trace events stream back over a pipe and are
+    written by the parent. A child that crashes only fails its own run, and children
+    are replaced after `max_runs_per_worker` runs to bound memory growth.
+    """
+
+    def __init__(
+        self,
+        run_root: Path,
+        catalog: RunCatalog,
+        *,
+        max_runs_per_worker: int = 20,
+        poll_interval: float = 0.2,
+    ):
+        self.run_root = run_root
+        self.catalog = catalog
+        self.max_runs_per_worker = max_runs_per_worker
+        self.poll_interval = poll_interval
+        self._ctx = mp.get_context("spawn")
+        self._local = threading.local()
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, job: QueuedRun, cancel: threading.Event) -> None:
+        worker = self._acquire()
+        run_dir = self.run_root / job.run_id
+        trace = TraceRecorder(run_dir / "trace.jsonl")
+        error: Optional[str] = None
+        crashed = False
+        try:
+            worker.conn.send(
+                (
+                    "run",
+                    {
+                        "mission": job.mission,
+                        "provider": job.provider,
+                        "model": job.model,
+                        "skill_dir": job.skill_dir,
+                        "run_dir": str(run_dir),
+                        "run_root": str(self.run_root),
+                    },
+                )
+            )
+        except OSError:  # BrokenPipeError: the child died while idle
+            error = f"worker process exited unexpectedly (exit code {worker.process.exitcode})"
+            crashed = True
+        worker.runs += 1
+
+        while not crashed:
+            if cancel.is_set():
+                worker.cancel.set()
+            try:
+                if not worker.conn.poll(self.poll_interval):
+                    if worker.process.is_alive():
+                        continue
+                    raise EOFError
+                kind, data = worker.conn.recv()
+            except (EOFError, OSError):
+                error = f"worker process exited unexpectedly (exit code {worker.process.exitcode})"
+                crashed = True
+                break
+            if kind == "event":
+                trace.write(TraceEvent(**data))
+            elif kind == "error":
+                error = data
+                break
+            else:
+                break
+
+        if error is not None:
+            run_dir.mkdir(parents=True, exist_ok=True)
+            (run_dir / "RUN_ERROR.txt").write_text(error, encoding="utf-8")
+            self.catalog.record_finish(
+                job.run_id, status="error", finished_at=utc_now_iso(), error=error
+            )
+        if crashed or worker.runs >= self.max_runs_per_worker:
+            self._discard(worker)
+
+    def close(self) -> None:
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for w in workers:
+            w.stop()
+
+    def _acquire(self) -> _Worker:
+        worker: Optional[_Worker] = getattr(self._local, "worker", None)
+        if worker is not None and not worker.process.is_alive():
+            self._discard(worker)
+            worker = None
+        if worker is None:
+            worker = _Worker(self._ctx)
+            self._local.worker = worker
+            with self._lock:
+                self._workers.append(worker)
+        return worker
+
+    def _discard(self, worker: _Worker) -> None:
+        self._local.worker = None
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+        worker.stop()
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from ..core.run_catalog import RunCatalog, run_owner
+from ..core.trace import utc_now_iso
+
+
+class QueueFull(RuntimeError):
+    pass
+
+
+@dataclass
+class QueuedRun:
+    run_id: str
+    mission: str
+    provider: str = "mock"
+    model: Optional[str] = None
+    skill_dir: List[str] = field(default_factory=list)
+    # Objects built while validating the submission; reused when the run starts in this
+    # process, rebuilt from the fields above for runs recovered after a restart.
+    prepared: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    def request(self) -> Dict[str, Any]:
+        return {"provider": self.provider, "model": self.model, "skill_dir": self.skill_dir}
+
+
+Runner = Callable[[QueuedRun, threading.Event], None]
+
+
+class RunQueue:
+    """A fixed pool of worker threads draining a bounded FIFO of submitted runs.
+
+    The queue is persisted in the run catalog (rows with status `queued`), so runs
+    submitted before a restart are picked up again in order. `runner` executes one run
+    and must honour the cancel event between work orders.
+    """
+
+    def __init__(
+        self,
+        catalog: RunCatalog,
+        runner: Runner,
+        *,
+        workers: int = 2,
+        max_queued: int = 100,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        self.catalog = catalog
+        self.runner = runner
+        self.workers = workers
+        self.max_queued = max_queued
+        self._pending: Deque[QueuedRun] = deque()
+        self._active: Dict[str, threading.Event] = {}
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._stopping = False
+        self.owner = run_owner()
+
+    def start(self) -> None:
+        """Recover persisted state and start the workers.
+
+        Only runs this dashboard owned are touched: `running` rows whose owner process
+        is gone are failed, and queued rows are claimed. CLI runs are left alone.
+        """
+        self.catalog.fail_orphaned("interrupted: dashboard restarted while the run was active")
+        with self._cond:
+            for row in self.catalog.claim_queued(self.owner):
+                req = row["request"]
+                self._pending.append(
+                    QueuedRun(
+                        run_id=row["run_id"],
+                        mission=row["mission"] or "",
+                        provider=req.get("provider", "mock"),
+                        model=req.get("model"),
+                        skill_dir=list(req.get("skill_dir") or []),
+                    )
+                )
+        for i in range(self.workers):
+            t = threading.Thread(target=self._work, name=f"run-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Stop taking new runs; active runs are asked to cancel. Queued runs stay persisted."""
+        with self._cond:
+            self._stopping = True
+            for evt in self._active.values():
+                evt.set()
+            self._cond.notify_all()
+        for t in self._threads:
+            t.join(timeout)
+
+    def submit(self, job: QueuedRun) -> int:
+        """Enqueue a run and return its 1-based queue position."""
+        with self._cond:
+            if len(self._pending) >= self.max_queued:
+                raise QueueFull(f"run queue is full ({self.max_queued} waiting)")
+            self.catalog.record_queued(
+                job.run_id, mission=job.mission, provider=job.provider, request=job.request(), owner=self.owner
+            )
+            self._pending.append(job)
+            self._cond.notify()
+            return len(self._pending)
+
+    def cancel(self, run_id: str) -> Optional[str]:
+        """Cancel a queued or running run.
+
+        Returns "cancelled" if it never started, "cancelling" if it will stop before its
+        next work order, or None if the run is not in the queue.
+        """
+        with self._cond:
+            for job in self._pending:
+                if job.run_id == run_id:
+                    self._pending.remove(job)
+                    self.catalog.record_finish(
+                        run_id, status="cancelled", finished_at=utc_now_iso()
+                    )
+                    return "cancelled"
+            evt = self._active.get(run_id)
+            if evt is not None:
+                evt.set()
+                return "cancelling"
+        return None
+
+    def position(self, run_id: str) -> Optional[int]:
+        """1-based position among waiting runs, 0 when running, None when unknown."""
+        with self._cond:
+            if run_id in self._active:
+                return 0
+            for i, job in enumerate(self._pending):
+                if job.run_id == run_id:
+                    return i + 1
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "workers": self.workers,
+                "active": len(self._active),
+                "queued": len(self._pending),
+                "max_queued": self.max_queued,
+            }
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                job = self._pending.popleft()
+                cancel = threading.Event()
+                self._active[job.run_id] = cancel
+            try:
+                self.runner(job, cancel)
+            except Exception as exc:
+                # The runner normally records its own failures; this keeps the worker
+                # thread alive (and the run out of `running`) when it cannot.
+                error = f"{type(exc).__name__}: {exc}"
+                self.catalog.record_finish(job.run_id, status="error", finished_at=utc_now_iso(), error=error)
+            finally:
+                with self._cond:
+                    self._active.pop(job.run_id, None)
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import json
+import mmap
+import shutil
+from contextlib import asynccontextmanager
 from pathlib import Path
 import time
-from typing import Any, Dict, List, Optional
-from threading import Thread
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from threading import Event
 
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import FileResponse, HTMLResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 from rich.console import Console
@@ -15,13 +18,73 @@ from rich.console import Console
 from ..core.orchestrator import run_mission
 from ..core.providers.mock import MockProvider
 from ..core.providers.openai_compatible import OpenAICompatibleProvider
-from ..core.skill_index import DEFAULT_SKILL_DIRS, SkillIndex, discover_skills
+from ..core.run_catalog import ACTIVE_STATUSES, SORT_COLUMNS, RunCatalog
+from ..core.skill_index import DEFAULT_SKILL_DIRS, SkillIndex
+from ..core.skill_registry import SkillRegistry
+from ..core.trace import utc_now_iso
 from ..core.utils import new_run_id
-
-
-def create_app(run_root: Optional[Path] = None) -> FastAPI:
-    app = FastAPI(title="Solo Company OS Dashboard")
+from .archive import ARCHIVE_FORMATS, collect_members, iter_tar_gz, iter_zip
+from .process_pool import ProcessRunner
+from .run_queue import QueuedRun, QueueFull, RunQueue
+from .tree_cache import GZIP_MIN_BYTES, WorkspaceTreeCache
+
+
+PREVIEW_WINDOW = 200_000
+
+MAX_PREVIEW_WINDOW = 1_000_000
+
+
+def create_app(
+    run_root: Optional[Path] = None,
+    *,
+    workers: int = 2,
+    max_queued: int = 100,
+    executor: str = "thread",
+    max_runs_per_worker: int = 20,
+    skill_poll_interval: Optional[float] = 2.0,
+) -> FastAPI:
+    """Build the dashboard app.
+
+    `executor="thread"` runs missions in server threads; `executor="process"` runs them
+    in worker processes (recycled every `max_runs_per_worker` runs) so mission work does
+    not compete with request handling. Skill indexes are shared across submissions and
+    reloaded when the skill roots change (polled every `skill_poll_interval` seconds).
+    """
+    if executor not in ("thread", "process"):
+        raise ValueError("executor must be thread or process")
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> Any:
+        yield
+        app.state.skills.stop(timeout=5)
+        app.state.run_queue.shutdown(timeout=10)
+        close = getattr(app.state.runner, "close", None)
+        if close is not None:
+            close()
+
+    app = FastAPI(title="Solo Company OS Dashboard", lifespan=lifespan)
     app.state.run_root = run_root or Path("runs")
+    app.state.catalog = RunCatalog(app.state.run_root)
+    # Pick up runs written by the CLI, older versions or other hosts before serving.
+    app.state.catalog.reconcile()
+    app.state.tree_cache = WorkspaceTreeCache()
+    app.state.skills = SkillRegistry(poll_interval=skill_poll_interval)
+    app.state.skills.start()
+    if executor == "process":
+        app.state.runner = ProcessRunner(
+            app.state.run_root, app.state.catalog, max_runs_per_worker=max_runs_per_worker
+        )
+    else:
+        app.state.runner = lambda job, cancel: _run_queued(
+            job, cancel, app.state.run_root, app.state.catalog, app.state.skills
+        )
+    app.state.run_queue = RunQueue(
+        app.state.catalog,
+        app.state.runner,
+        workers=workers,
+        max_queued=max_queued,
+    )
+    app.state.run_queue.start()
 
     @app.get("/", response_class=HTMLResponse)
     def index() -> HTMLResponse:
@@ -36,43 +99,136 @@ def create_app(run_root: Optional[Path] = None) -> FastAPI:
         return HTMLResponse(_render_index())
 
     @app.get("/api/runs")
-    def list_runs() -> Dict[str, Any]:
-        run_root = _run_root(app)
-        return {"runs": _collect_runs(run_root)}
+    def list_runs(
+        limit: int = Query(50, ge=1, le=500),
+        offset: int = Query(0, ge=0),
+        status: Optional[str] = None,
+        provider: Optional[str] = None,
+        q: Optional[str] = None,
+        sort: str = Query("run_id"),
+        order: str = Query("desc", pattern="^(asc|desc)$"),
+    ) -> Dict[str, Any]:
+        if sort not in SORT_COLUMNS:
+            raise HTTPException(status_code=400, detail=f"sort must be one of: {', '.join(SORT_COLUMNS)}")
+        rows, total = _catalog(app).list_runs(
+            limit=limit,
+            offset=offset,
+            status=status,
+            provider=provider,
+            q=q,
+            sort=sort,
+            order=order,
+        )
+        return {
+            "runs": [_run_entry(_run_root(app), row) for row in rows],
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+        }
 
     @app.get("/api/runs/{run_id}")
     def get_run(run_id: str) -> Dict[str, Any]:
         run_dir = _resolve_run_dir(_run_root(app), run_id)
+        row = _catalog(app).get(run_id) or {}
         return {
             "run_id": run_id,
-            "mission": _extract_mission(run_dir),
+            "mission": row.get("mission") or _extract_mission(run_dir),
+            "status": row.get("status"),
+            "queue_position": _run_queue(app).position(run_id),
             "plan": _read_json(run_dir / "plan.json"),
             "report": _read_text(run_dir / "RUN.md"),
         }
 
     @app.get("/api/runs/{run_id}/trace")
-    def get_trace(run_id: str) -> Dict[str, Any]:
+    def get_trace(
+        run_id: str,
+        limit: int = Query(500, ge=1, le=5000),
+        cursor: Optional[str] = None,
+        types: Optional[List[str]] = Query(None, alias="type"),
+        tail: Optional[int] = Query(None, ge=1, le=5000),
+        fmt: str = Query("json", alias="format", pattern="^(json|ndjson)$"),
+    ) -> Any:
+        """Page through trace events without loading the whole file.
+
+        `cursor` is the opaque `next_cursor` of a previous page (a byte offset), `type`
+        filters by event type (repeatable), `tail=N` starts at the last N matching events.
+        `format=ndjson` streams every matching event from the start point to the end of
+        the file instead of returning one page.
+        """
         run_dir = _resolve_run_dir(_run_root(app), run_id)
-        return {"events": _read_trace(run_dir / "trace.jsonl")}
+        trace_path = run_dir / "trace.jsonl"
+        wanted = set(types) if types else None
+        if tail is not None:
+            start = _tail_offset(trace_path, tail, wanted)
+            limit = min(limit, tail)
+        else:
+            start = _parse_cursor(trace_path, cursor)
+
+        if fmt == "ndjson":
+            return StreamingResponse(
+                _iter_trace_ndjson(trace_path, start, wanted),
+                media_type="application/x-ndjson",
+            )
+
+        events: List[Dict[str, Any]] = []
+        next_offset = start
+        has_more = False
+        for end, evt in _iter_trace_events(trace_path, start):
+            if wanted is not None and evt.get("type") not in wanted:
+                next_offset = end
+                continue
+            if len(events) >= limit:
+                has_more = True
+                break
+            events.append(evt)
+            next_offset = end
+        return {"events": events, "next_cursor": str(next_offset), "has_more": has_more}
 
     @app.post("/api/runs/execute")
     def execute_run(req: RunRequest) -> Dict[str, Any]:
-        run_root = _run_root(app)
-        run_id = new_run_id()
-        run_dir = run_root / run_id
-        workspace = run_dir / "workspace"
-        run_dir.mkdir(parents=True, exist_ok=True)
-        workspace.mkdir(parents=True, exist_ok=True)
+        run_queue = _run_queue(app)
+        if run_queue.stats()["queued"] >= run_queue.max_queued:
+            raise HTTPException(status_code=429, detail="run queue is full, retry later")
 
-        skill_index = _build_skill_index(req.skill_dir)
+        # Validate before queueing so bad submissions fail fast with a 400.
+        skill_index = _build_skill_index(req.skill_dir, app.state.skills)
         provider = _build_provider(req.provider, req.model)
 
-        Thread(
-            target=_run_background,
-            args=(req.mission, skill_index, provider, run_dir, workspace),
-            daemon=True,
-        ).start()
-        return {"run_id": run_id}
+        run_id = new_run_id()
+        job = QueuedRun(
+            run_id=run_id,
+            mission=req.mission,
+            provider=req.provider,
+            model=req.model,
+            skill_dir=list(req.skill_dir),
+            prepared={"skill_index": skill_index, "provider": provider},
+        )
+        # The run dir exists before a worker can pick the job up (or a client polls it).
+        run_dir = _run_root(app) / run_id
+        (run_dir / "workspace").mkdir(parents=True, exist_ok=True)
+        try:
+            position = run_queue.submit(job)
+        except QueueFull as exc:
+            shutil.rmtree(run_dir, ignore_errors=True)
+            raise HTTPException(status_code=429, detail=str(exc))
+        return {"run_id": run_id, "status": "queued", "position": position}
+
+    @app.post("/api/runs/{run_id}/cancel")
+    def cancel_run(run_id: str) -> Dict[str, Any]:
+        _resolve_run_dir(_run_root(app), run_id)
+        status = _run_queue(app).cancel(run_id)
+        if status is None:
+            raise HTTPException(status_code=409, detail="run is not queued or running")
+        return {"run_id": run_id, "status": status}
+
+    @app.get("/api/skills")
+    def skills_status() -> Dict[str, Any]:
+        registry: SkillRegistry = app.state.skills
+        return {"indexes": registry.status(), "events": list(registry.events)}
+
+    @app.get("/api/queue")
+    def queue_stats() -> Dict[str, Any]:
+        return _run_queue(app).stats()
 
     @app.get("/api/runs/{run_id}/stream")
     def stream_trace(run_id: str, since: int = Query(0, ge=0)) -> StreamingResponse:
@@ -84,25 +240,83 @@ def create_app(run_root: Optional[Path] = None) -> FastAPI:
         )
 
     @app.get("/api/runs/{run_id}/files")
-    def get_files(run_id: str) -> Dict[str, Any]:
+    def get_files(run_id: str, request: Request) -> Response:
         run_dir = _resolve_run_dir(_run_root(app), run_id)
         workspace = run_dir / "workspace"
         if not workspace.exists():
             raise HTTPException(status_code=404, detail="workspace not found")
-        return {"root": workspace.name, "tree": _build_tree(workspace, workspace)}
+        row = _catalog(app).get(run_id)
+        finished = row is not None and row["status"] not in ACTIVE_STATUSES
+        snap = app.state.tree_cache.get(run_id, run_dir, finished=finished)
+
+        headers = {"ETag": snap.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if snap.etag in _parse_if_none_match(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=headers)
+        if len(snap.body) >= GZIP_MIN_BYTES and "gzip" in request.headers.get("accept-encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            return Response(snap.gzipped(), media_type="application/json", headers=headers)
+        return Response(snap.body, media_type="application/json", headers=headers)
 
     @app.get("/api/runs/{run_id}/file")
-    def get_file(run_id: str, path: str = Query(..., min_length=1)) -> Dict[str, Any]:
+    def get_file(
+        run_id: str,
+        path: str = Query(..., min_length=1),
+        offset: int = Query(0, ge=0),
+        length: int = Query(PREVIEW_WINDOW, ge=1, le=MAX_PREVIEW_WINDOW),
+        start_line: Optional[int] = Query(None, ge=0),
+        lines: int = Query(200, ge=1, le=10_000),
+    ) -> Dict[str, Any]:
+        """Preview a window of a workspace file.
+
+        Byte mode reads `length` bytes from `offset`; line mode (`start_line`) reads
+        `lines` lines. Only the window is paged in (mmap), so file size does not matter;
+        follow `next_offset` / `next_line` to continue.
+        """
+        file_path = _resolve_workspace_file(_run_root(app), run_id, path)
+        window = _read_window(file_path, offset, length, start_line, lines)
+        return {"path": path, **window}
+
+    @app.get("/api/runs/{run_id}/archive")
+    def get_archive(
+        run_id: str,
+        fmt: str = Query("zip", alias="format"),
+        meta: bool = Query(True, description="Include plan.json, RUN.md and trace.jsonl."),
+    ) -> StreamingResponse:
+        """Stream the run workspace as a zip or tar.gz, compressed on the fly."""
+        if fmt not in ARCHIVE_FORMATS:
+            raise HTTPException(status_code=400, detail="format must be zip or tar.gz")
         run_dir = _resolve_run_dir(_run_root(app), run_id)
-        workspace = run_dir / "workspace"
-        file_path = (workspace / path).resolve()
-        if workspace.resolve() not in file_path.parents and file_path != workspace.resolve():
-            raise HTTPException(status_code=400, detail="invalid path")
-        if not file_path.exists() or not file_path.is_file():
-            raise HTTPException(status_code=404, detail="file not found")
-        if file_path.stat().st_size > 200_000:
-            raise HTTPException(status_code=413, detail="file too large to preview")
-        return {"path": path, "content": file_path.read_text(encoding="utf-8", errors="ignore")}
+        members = collect_members(run_dir, include_meta=meta)
+        if fmt == "zip":
+            body, media_type = iter_zip(members), "application/zip"
+        else:
+            body, media_type = iter_tar_gz(members), "application/gzip"
+        return StreamingResponse(
+            (chunk for chunk in body if chunk),
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="{run_id}.{fmt}"'},
+        )
+
+    @app.get("/api/runs/{run_id}/raw")
+    def get_raw(run_id: str, request: Request, path: str = Query(..., min_length=1)) -> Response:
+        """Serve a workspace file as-is, honouring a single `Range: bytes=` request."""
+        file_path = _resolve_workspace_file(_run_root(app), run_id, path)
+        size = file_path.stat().st_size
+        byte_range = _parse_range(request.headers.get("range"), size)
+        if byte_range is None:
+            # Whole file: let the server use sendfile/pathsend where available.
+            return FileResponse(file_path, headers={"Accept-Ranges": "bytes"})
+        start, end = byte_range
+        return StreamingResponse(
+            _iter_file_range(file_path, start, end),
+            status_code=206,
+            media_type="application/octet-stream",
+            headers={
+                "Accept-Ranges": "bytes",
+                "Content-Range": f"bytes {start}-{end}/{size}",
+                "Content-Length": str(end - start + 1),
+            },
+        )
 
     return app
 
@@ -118,6 +332,14 @@ def _run_root(app: FastAPI) -> Path:
     return app.state.run_root
 
 
+def _catalog(app: FastAPI) -> RunCatalog:
+    return app.state.catalog
+
+
+def _run_queue(app: FastAPI) -> RunQueue:
+    return app.state.run_queue
+
+
 def _resolve_run_dir(run_root: Path, run_id: str) -> Path:
     run_dir = run_root / run_id
     if not run_dir.exists() or not run_dir.is_dir():
@@ -125,23 +347,115 @@ def _resolve_run_dir(run_root: Path, run_id: str) -> Path:
     return run_dir
 
 
-def _collect_runs(run_root: Path) -> List[Dict[str, Any]]:
-    if not run_root.exists():
-        return []
-    runs = []
-    for item in sorted(run_root.iterdir(), reverse=True):
-        if not item.is_dir():
-            continue
-        runs.append(
-            {
-                "run_id": item.name,
-                "mission": _extract_mission(item),
-                "updated_at": item.stat().st_mtime,
-                "has_plan": (item / "plan.json").exists(),
-                "has_trace": (item / "trace.jsonl").exists(),
-            }
+def _resolve_workspace_file(run_root: Path, run_id: str, path: str) -> Path:
+    run_dir = _resolve_run_dir(run_root, run_id)
+    workspace = run_dir / "workspace"
+    file_path = (workspace / path).resolve()
+    if workspace.resolve() not in file_path.parents and file_path != workspace.resolve():
+        raise HTTPException(status_code=400, detail="invalid path")
+    if not file_path.exists() or not file_path.is_file():
+        raise HTTPException(status_code=404, detail="file not found")
+    return file_path
+
+
+def _read_window(
+    path: Path,
+    offset: int,
+    length: int,
+    start_line: Optional[int],
+    lines: int,
+) -> Dict[str, Any]:
+    size = path.stat().st_size
+    window: Dict[str, Any] = {"size": size}
+    if size == 0:
+        # mmap cannot map empty files.
+        start = end = 0
+        data = b""
+    else:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if start_line is None:
+                start = min(offset, size)
+                end = min(size, start + length)
+            else:
+                start = _skip_lines(mm, 0, start_line, size)
+                end = _skip_lines(mm, start, lines, size)
+                served = lines
+                if end - start > MAX_PREVIEW_WINDOW:
+                    # Byte cap: serve whole lines only, so `next_line` resumes exactly there.
+                    cap = start + MAX_PREVIEW_WINDOW
+                    last_nl = mm.rfind(b"\n", start, cap)
+                    end = last_nl + 1 if last_nl != -1 else cap  # one line longer than the cap
+                    served = max(1, mm[start:end].count(b"\n"))
+                window["start_line"] = start_line
+                window["next_line"] = start_line + served if end < size else None
+            data = mm[start:end]
+    window.update(
+        {
+            "content": data.decode("utf-8", errors="ignore"),
+            "offset": start,
+            "length": len(data),
+            "next_offset": end if end < size else None,
+            "truncated": start > 0 or end < size,
+        }
+    )
+    return window
+
+
+def _skip_lines(mm: mmap.mmap, pos: int, n: int, size: int) -> int:
+    for _ in range(n):
+        nl = mm.find(b"\n", pos)
+        if nl == -1:
+            return size
+        pos = nl + 1
+    return pos
+
+
+def _parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single `bytes=` range into inclusive (start, end); None means whole file."""
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[len("bytes="):].strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # Suffix range: the last N bytes.
+            start = max(size - int(last), 0)
+            end = size - 1
+    except ValueError:
+        return None
+    end = min(end, size - 1)
+    if start > end or start >= size:
+        raise HTTPException(
+            status_code=416,
+            detail="range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
         )
-    return runs
+    return start, end
+
+
+def _iter_file_range(path: Path, start: int, end: int, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _run_entry(run_root: Path, row: Dict[str, Any]) -> Dict[str, Any]:
+    # Only the rows of the requested page touch the filesystem.
+    run_dir = run_root / row["run_id"]
+    row = {k: v for k, v in row.items() if k != "request"}
+    return {
+        **row,
+        "has_plan": (run_dir / "plan.json").exists(),
+        "has_trace": (run_dir / "trace.jsonl").exists(),
+    }
 
 
 def _extract_mission(run_dir: Path) -> Optional[str]:
@@ -188,26 +502,105 @@ def _read_text(path: Path) -> Optional[str]:
     return path.read_text(encoding="utf-8", errors="ignore")
 
 
-def _read_trace(path: Path) -> List[Dict[str, Any]]:
+def _iter_trace_events(path: Path, offset: int) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (end_offset, event) for each complete trace line starting at `offset`.
+
+    A trailing line without its newline is still being written and is left for the
+    next read, so `end_offset` is always a safe cursor.
+    """
     if not path.exists():
-        return []
-    events = []
-    for line in path.read_text(encoding="utf-8", errors="ignore").splitlines():
+        return
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            try:
+                evt = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            yield offset, evt
+
+
+def _iter_trace_lines_reversed(path: Path, block_size: int = 64 * 1024) -> Iterator[Tuple[int, bytes]]:
+    """Yield (start_offset, line) for complete trace lines from the end of the file backwards."""
+    with open(path, "rb") as f:
+        pos = _complete_size(f, block_size)
+        carry = b""
+        while pos > 0:
+            read = min(block_size, pos)
+            pos -= read
+            f.seek(pos)
+            # `data` spans [pos, pos + len(data)) and is followed by a newline.
+            data = f.read(read) + carry
+            parts = data.split(b"\n")
+            carry = parts[0]
+            line_end = pos + len(data)
+            for part in reversed(parts[1:]):
+                start = line_end - len(part)
+                if part:
+                    yield start, part
+                line_end = start - 1
+        if carry:
+            yield 0, carry
+
+
+def _complete_size(f: Any, block_size: int) -> int:
+    """Offset just past the last newline; anything after it is a partial write."""
+    pos = f.seek(0, 2)
+    while pos > 0:
+        read = min(block_size, pos)
+        pos -= read
+        f.seek(pos)
+        idx = f.read(read).rfind(b"\n")
+        if idx != -1:
+            return pos + idx + 1
+    return 0
+
+
+def _tail_offset(path: Path, n: int, wanted: Optional[set[str]]) -> int:
+    if not path.exists():
+        return 0
+    found = 0
+    for start, line in _iter_trace_lines_reversed(path):
         try:
-            events.append(json.loads(line))
+            evt = json.loads(line)
         except json.JSONDecodeError:
             continue
-    return events
+        if wanted is not None and evt.get("type") not in wanted:
+            continue
+        found += 1
+        if found == n:
+            return start
+    return 0
+
+
+def _parse_cursor(path: Path, cursor: Optional[str]) -> int:
+    if not cursor:
+        return 0
+    try:
+        offset = int(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+    size = path.stat().st_size if path.exists() else 0
+    if offset < 0 or offset > size:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+    return offset
+
+
+def _iter_trace_ndjson(path: Path, offset: int, wanted: Optional[set[str]]) -> Iterator[str]:
+    for _end, evt in _iter_trace_events(path, offset):
+        if wanted is None or evt.get("type") in wanted:
+            yield json.dumps(evt, ensure_ascii=False) + "\n"
 
 
 def _load_env() -> None:
     load_dotenv(dotenv_path=Path(".env"), override=False)
 
 
-def _build_skill_index(extra_dirs: List[str]) -> SkillIndex:
-    roots = list(DEFAULT_SKILL_DIRS) + extra_dirs
-    report = discover_skills(roots=roots, console=Console())
-    idx = SkillIndex(report.skills)
+def _build_skill_index(extra_dirs: List[str], registry: SkillRegistry) -> SkillIndex:
+    idx = registry.get(list(DEFAULT_SKILL_DIRS) + extra_dirs)
     if not idx.skills:
         raise HTTPException(status_code=400, detail="no skills found")
     return idx
@@ -222,67 +615,55 @@ def _build_provider(provider: str, model: Optional[str]) -> Any:
     raise HTTPException(status_code=400, detail="provider must be mock or openai")
 
 
-def _run_background(
-    mission: str,
-    skill_index: SkillIndex,
-    provider: Any,
-    run_dir: Path,
-    workspace: Path,
+def _run_queued(
+    job: QueuedRun,
+    cancel: Event,
+    run_root: Path,
+    catalog: RunCatalog,
+    skills: SkillRegistry,
 ) -> None:
+    run_dir = run_root / job.run_id
     try:
+        skill_index = job.prepared.get("skill_index") or _build_skill_index(job.skill_dir, skills)
+        provider = job.prepared.get("provider") or _build_provider(job.provider, job.model)
         run_mission(
-            mission=mission,
+            mission=job.mission,
             skill_index=skill_index,
             provider=provider,
             run_dir=run_dir,
-            workspace=workspace,
+            workspace=run_dir / "workspace",
             console=Console(),
+            catalog=catalog,
+            should_cancel=cancel.is_set,
         )
     except Exception as exc:
+        run_dir.mkdir(parents=True, exist_ok=True)
         (run_dir / "RUN_ERROR.txt").write_text(str(exc), encoding="utf-8")
+        catalog.record_finish(job.run_id, status="error", finished_at=utc_now_iso(), error=str(exc))
 
 
 def _iter_trace_stream(path: Path, since: int) -> Any:
     last_index = max(since, 0)
     yield "retry: 1000\n\n"
+    # Follow the file by byte offset: each tick reads only the lines appended since.
+    offset = 0
+    idx = 0
     while True:
-        if path.exists():
-            lines = path.read_text(encoding="utf-8", errors="ignore").splitlines()
-            for idx in range(last_index, len(lines)):
-                try:
-                    evt = json.loads(lines[idx])
-                except json.JSONDecodeError:
-                    continue
+        for end_offset, evt in _iter_trace_events(path, offset):
+            offset = end_offset  # resume after the last complete line on the next tick
+            if idx >= last_index:
                 payload = {"index": idx, "event": evt}
                 data = json.dumps(payload, ensure_ascii=False)
                 yield f"id: {idx}\ndata: {data}\n\n"
-            last_index = max(last_index, len(lines))
+            idx += 1
+        last_index = max(last_index, idx)
         time.sleep(0.6)
 
 
-def _build_tree(root: Path, base: Path) -> List[Dict[str, Any]]:
-    nodes: List[Dict[str, Any]] = []
-    for item in sorted(root.iterdir()):
-        rel = str(item.relative_to(base))
-        if item.is_dir():
-            nodes.append(
-                {
-                    "type": "dir",
-                    "name": item.name,
-                    "path": rel,
-                    "children": _build_tree(item, base),
-                }
-            )
-        else:
-            nodes.append(
-                {
-                    "type": "file",
-                    "name": item.name,
-                    "path": rel,
-                    "size": item.stat().st_size,
-                }
-            )
-    return nodes
+def _parse_if_none_match(value: Optional[str]) -> List[str]:
+    if not value:
+        return []
+    return [tag.strip().removeprefix("W/") for tag in value.split(",")]
 
 
 def _render_index() -> str:
@@ -326,6 +707,7 @@ def _render_index() -> str:
   <header>
     <span>Solo Company OS Dashboard</span>
     <nav>
+      <span class="muted" id="queueStats"></span>
       <a class="active" href="/submit">任务提交</a>
       <a href="/history">历史任务</a>
     </nav>
@@ -340,6 +722,7 @@ def _render_index() -> str:
         <h2 id="runTitle">请选择一个 Run</h2>
         <p class="muted" id="runMeta"></p>
         <span class="tag" id="runMission">Mission</span>
+        <button id="cancelRun" style="display:none; margin-left:8px;">取消</button>
       </section>
       <div class="grid" style="margin-top:16px;">
         <section>
@@ -374,12 +757,14 @@ def _render_index() -> str:
           </div>
         </section>
         <section>
-          <h3>Files</h3>
+          <h3>Files <a class="muted" id="archiveZip" href="#">zip</a> <a class="muted" id="archiveTar" href="#">tar.gz</a></h3>
           <div class="tree" id="fileTree">-</div>
         </section>
         <section>
           <h3>File Preview</h3>
           <pre id="filePreview">选择文件查看内容</pre>
+          <p class="muted" id="previewMeta"></p>
+          <button id="previewMore" style="display:none;">加载更多</button>
         </section>
       </div>
     </main>
@@ -393,8 +778,12 @@ const planEl = document.getElementById('plan');
 const traceBodyEl = document.getElementById('traceBody');
 const fileTreeEl = document.getElementById('fileTree');
 const filePreviewEl = document.getElementById('filePreview');
+const previewMetaEl = document.getElementById('previewMeta');
+const previewMoreEl = document.getElementById('previewMore');
 const agentBodyEl = document.getElementById('agentBody');
 const flowBodyEl = document.getElementById('flowBody');
+const queueStatsEl = document.getElementById('queueStats');
+const cancelRunEl = document.getElementById('cancelRun');
 let currentRunId = null;
 let eventSource = null;
 let traceEvents = [];
@@ -402,6 +791,7 @@ let agentState = {};
 let workOrders = {};
 let refreshTimer = null;
 let fileRefreshTimer = null;
+let filesEtag = null;
 const REFRESH_INTERVAL = 2000;
 const FILE_REFRESH_INTERVAL = 3000;
 
@@ -543,7 +933,7 @@ function renderRuns(runs) {
   runs.forEach((run) => {
     const div = document.createElement('div');
     div.className = 'run' + (run.run_id === currentRunId ? ' active' : '');
-    div.innerHTML = `<div>${run.run_id}</div><div class="muted">${run.mission || '无 Mission'}</div>`;
+    div.innerHTML = `<div>${run.run_id} <span class="muted">${run.status || ''}</span></div><div class="muted">${run.mission || '无 Mission'}</div>`;
     div.onclick = () => selectRun(run.run_id);
     runListEl.appendChild(div);
   });
@@ -552,7 +942,10 @@ function renderRuns(runs) {
 function applyRunSummary(run) {
   if (!run) return;
   runTitleEl.textContent = run.run_id || '-';
-  runMetaEl.textContent = run.mission ? 'Mission 已解析' : 'Mission 未解析';
+  let meta = run.status ? `状态：${run.status}` : (run.mission ? 'Mission 已解析' : 'Mission 未解析');
+  if (run.status === 'queued' && run.queue_position) meta += `（队列第 ${run.queue_position} 位）`;
+  runMetaEl.textContent = meta;
+  cancelRunEl.style.display = run.status === 'queued' || run.status === 'running' ? 'inline-block' : 'none';
   runMissionEl.textContent = run.mission || '无 Mission';
   planEl.textContent = run.plan ? JSON.stringify(run.plan, null, 2) : '-';
 }
@@ -569,6 +962,23 @@ async function refreshRuns() {
   }
 }
 
+async function refreshQueue() {
+  try {
+    const q = await fetchJSON('/api/queue');
+    queueStatsEl.textContent = `队列 ${q.queued}/${q.max_queued} · 运行中 ${q.active}/${q.workers}`;
+  } catch (err) {
+    console.warn('refresh queue failed', err);
+  }
+}
+
+cancelRunEl.onclick = async () => {
+  if (!currentRunId) return;
+  const res = await fetch(`/api/runs/${currentRunId}/cancel`, { method: 'POST' });
+  if (!res.ok) console.warn('cancel failed', await res.text());
+  refreshCurrentRun();
+  refreshQueue();
+};
+
 async function refreshCurrentRun() {
   if (!currentRunId) return;
   try {
@@ -582,14 +992,15 @@ async function refreshCurrentRun() {
 async function refreshFiles() {
   if (!currentRunId) return;
   try {
-    const files = await fetchJSON(`/api/runs/${currentRunId}/files`);
+    // The browser revalidates with If-None-Match; an unchanged ETag means nothing to redraw.
+    const res = await fetch(`/api/runs/${currentRunId}/files`);
+    if (!res.ok) throw new Error(await res.text());
+    const etag = res.headers.get('ETag');
+    if (etag && etag === filesEtag) return;
+    filesEtag = etag;
+    const files = await res.json();
     fileTreeEl.innerHTML = buildTree(files.tree || []);
-    fileTreeEl.querySelectorAll('button[data-path]').forEach((btn) => {
-      btn.onclick = async () => {
-        const file = await fetchJSON(`/api/runs/${currentRunId}/file?path=${encodeURIComponent(btn.dataset.path)}`);
-        filePreviewEl.textContent = file.content || '';
-      };
-    });
+    bindFileButtons(currentRunId);
   } catch (err) {
     console.warn('refresh files failed', err);
   }
@@ -611,6 +1022,25 @@ function renderTrace(events) {
   });
 }
 
+async function previewFile(runId, path, offset) {
+  const file = await fetchJSON(`/api/runs/${runId}/file?path=${encodeURIComponent(path)}&offset=${offset}`);
+  if (offset === 0) {
+    filePreviewEl.textContent = file.content || '';
+  } else {
+    filePreviewEl.textContent += file.content || '';
+  }
+  const shown = file.offset + file.length;
+  previewMetaEl.textContent = file.truncated ? `已显示 ${shown} / ${file.size} 字节` : '';
+  previewMoreEl.style.display = file.next_offset === null ? 'none' : 'inline-block';
+  previewMoreEl.onclick = () => previewFile(runId, path, file.next_offset);
+}
+
+function bindFileButtons(runId) {
+  fileTreeEl.querySelectorAll('button[data-path]').forEach((btn) => {
+    btn.onclick = () => previewFile(runId, btn.dataset.path, 0);
+  });
+}
+
 function buildTree(nodes) {
   if (!nodes || !nodes.length) return '<div class="muted">无文件</div>';
   const items = nodes.map((node) => {
@@ -649,42 +1079,49 @@ function getQueryRunId() {
 
 async function selectRun(runId) {
   currentRunId = runId;
+  filesEtag = null;
   resetLiveState();
   renderRuns(await fetchJSON('/api/runs').then((r) => r.runs));
   const run = await fetchJSON(`/api/runs/${runId}`);
   applyRunSummary(run);
 
-  const trace = await fetchJSON(`/api/runs/${runId}/trace`);
-  (trace.events || []).forEach((evt) => updateFromEvent(evt));
+  let cursor = '';
+  let hasMore = true;
+  while (hasMore) {
+    const page = await fetchJSON(`/api/runs/${runId}/trace?limit=1000&cursor=${cursor}`);
+    (page.events || []).forEach((evt) => updateFromEvent(evt));
+    cursor = page.next_cursor;
+    hasMore = page.has_more;
+  }
   renderAgents();
   renderFlow();
   renderTrace(traceEvents || []);
 
+  document.getElementById('archiveZip').href = `/api/runs/${runId}/archive?format=zip`;
+  document.getElementById('archiveTar').href = `/api/runs/${runId}/archive?format=tar.gz`;
+
   const files = await fetchJSON(`/api/runs/${runId}/files`);
   fileTreeEl.innerHTML = buildTree(files.tree || []);
-  fileTreeEl.querySelectorAll('button[data-path]').forEach((btn) => {
-    btn.onclick = async () => {
-      const file = await fetchJSON(`/api/runs/${runId}/file?path=${encodeURIComponent(btn.dataset.path)}`);
-      filePreviewEl.textContent = file.content || '';
-    };
-  });
+  bindFileButtons(runId);
 
   startStream(runId, traceEvents.length);
 }
 
 async function init() {
+  refreshQueue();
   const data = await fetchJSON('/api/runs');
   renderRuns(data.runs || []);
   const queryRun = getQueryRunId();
+  let selected = false;
   if (queryRun) {
     try {
       await selectRun(queryRun);
-      return;
+      selected = true;
     } catch (err) {
       console.warn('failed to load query run', err);
     }
   }
-  if (data.runs && data.runs.length) {
+  if (!selected && data.runs && data.runs.length) {
     selectRun(data.runs[0].run_id);
   }
 
@@ -692,6 +1129,7 @@ async function init() {
   refreshTimer = setInterval(() => {
     refreshRuns();
     refreshCurrentRun();
+    refreshQueue();
   }, REFRESH_INTERVAL);
 
   if (fileRefreshTimer) clearInterval(fileRefreshTimer);
@@ -740,7 +1178,7 @@ def _render_submit() -> str:
   <main>
     <section>
       <h2>提交新的 Mission</h2>
-      <p class="muted">输入任务后系统会立即执行，并自动跳转到历史任务页面查看执行过程。</p>
+      <p class="muted">输入任务后会进入执行队列，并自动跳转到历史任务页面查看执行过程。</p>
       <form id="runForm" class="form-grid">
         <input id="missionInput" type="text" placeholder="输入你要执行的任务" required />
         <select id="providerSelect">
@@ -787,12 +1225,15 @@ runFormEl.addEventListener('submit', async (event) => {
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(payload),
     });
+    if (res.status === 429) {
+      throw new Error('队列已满，请稍后再试');
+    }
     if (!res.ok) {
       throw new Error(await res.text());
     }
     const data = await res.json();
     missionInputEl.value = '';
-    runFormHintEl.textContent = '已开始执行，正在跳转历史任务...';
+    runFormHintEl.textContent = `已加入队列（第 ${data.position} 位），正在跳转历史任务...`;
     window.location.href = `/history?run=${encodeURIComponent(data.run_id)}`;
   } catch (err) {
     runFormHintEl.textContent = '执行失败：' + err.message;
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+GZIP_MIN_BYTES = 1024
+
+
+@dataclass
+class _DirListing:
+    mtime_ns: int
+    files: List[Dict[str, Any]]
+    subdirs: List[str]
+
+
+@dataclass
+class TreeSnapshot:
+    body: bytes
+    etag: str
+    final: bool
+    _gzipped: Optional[bytes] = field(default=None, repr=False)
+
+    def gzipped(self) -> bytes:
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=6)
+        return self._gzipped
+
+
+@dataclass
+class _Entry:
+    dirs: Dict[str, _DirListing] = field(default_factory=dict)
+    stamp: Optional[Tuple[int, int]] = None
+    snapshot: Optional[TreeSnapshot] = None
+
+
+class WorkspaceTreeCache:
+    """Per-run cache of `/api/runs/{id}/files` responses.
+
+    While a run is active each poll costs one `stat()` per directory: a directory is
+    re-listed only when its mtime changed, or when the run's trace grew. The orchestrator
+    appends to `trace.jsonl` after every batch of file writes, so the trace stamp doubles
+    as a writer notification for in-place rewrites that do not touch directory mtimes.
+    Once a run is finished its snapshot is frozen and served without touching the disk.
+    """
+
+    def __init__(self, max_runs: int = 256):
+        self.max_runs = max_runs
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, run_id: str, run_dir: Path, *, finished: bool) -> TreeSnapshot:
+        with self._lock:
+            entry = self._entries.get(run_id)
+            if entry is None:
+                entry = self._entries[run_id] = _Entry()
+            self._entries.move_to_end(run_id)
+            while len(self._entries) > self.max_runs:
+                self._entries.popitem(last=False)
+
+            if entry.snapshot is not None and entry.snapshot.final:
+                return entry.snapshot
+
+            stamp = _stamp(run_dir / "trace.jsonl")
+            if stamp != entry.stamp:
+                entry.dirs.clear()
+                entry.stamp = stamp
+
+            workspace = run_dir / "workspace"
+            changed = False
+            seen: set[str] = set()
+
+            def listing(rel: str) -> _DirListing:
+                nonlocal changed
+                path = workspace / rel if rel else workspace
+                mtime_ns = os.stat(path).st_mtime_ns
+                cached = entry.dirs.get(rel)
+                if cached is None or cached.mtime_ns != mtime_ns:
+                    cached = entry.dirs[rel] = _scan_dir(path, rel, mtime_ns)
+                    changed = True
+                seen.add(rel)
+                return cached
+
+            def build(rel: str) -> List[Dict[str, Any]]:
+                lst = listing(rel)
+                nodes: List[Dict[str, Any]] = []
+                for name in lst.subdirs:
+                    child = f"{rel}/{name}" if rel else name
+                    nodes.append(
+                        {"type": "dir", "name": name, "path": child, "children": build(child)}
+                    )
+                nodes.extend(lst.files)
+                nodes.sort(key=lambda n: n["name"])
+                return nodes
+
+            tree = build("")
+            for rel in set(entry.dirs) - seen:
+                del entry.dirs[rel]
+                changed = True
+
+            if changed or entry.snapshot is None:
+                body = json.dumps(
+                    {"root": workspace.name, "tree": tree}, ensure_ascii=False
+                ).encode("utf-8")
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                entry.snapshot = TreeSnapshot(body=body, etag=etag, final=finished)
+            elif finished:
+                entry.snapshot.final = True
+            return entry.snapshot
+
+    def invalidate(self, run_id: str) -> None:
+        with self._lock:
+            self._entries.pop(run_id, None)
+
+
+def _stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+def _scan_dir(path: Path, rel: str, mtime_ns: int) -> _DirListing:
+    files: List[Dict[str, Any]] = []
+    subdirs: List[str] = []
+    with os.scandir(path) as it:
+        for de in it:
+            if de.is_dir():
+                subdirs.append(de.name)
+            else:
+                files.append(
+                    {
+                        "type": "file",
+                        "name": de.name,
+                        "path": f"{rel}/{de.name}" if rel else de.name,
+                        "size": de.stat().st_size,
+                    }
+                )
+    subdirs.sort()
+    return _DirListing(mtime_ns=mtime_ns, files=files, subdirs=subdirs)
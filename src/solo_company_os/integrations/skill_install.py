@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from ..core.skill import SkillParseError, load_skill_frontmatter
+from ..core.skill_resources import file_sha256
+from .skillsmp import SkillsMPClient, extract_items
+
+
+_GITHUB_TREE = re.compile(
+    r"^https?://github\.com/(?P<owner>[^/]+)/(?P<repo>[^/]+)(?:/tree/(?P<ref>[^/]+)(?:/(?P<path>.+?))?)?/?$"
+)
+
+CODELOAD_URL = "https://codeload.github.com"
+
+
+class InstallError(RuntimeError):
+    pass
+
+
+@dataclass
+class SkillSource:
+    name: str
+    archive_url: str
+    path: str  # folder inside the archive (below its top-level directory)
+    sha256: Optional[str] = None  # expected archive hash, when the marketplace provides one
+
+
+@dataclass
+class InstallResult:
+    name: str
+    status: str  # installed | exists | failed
+    detail: str = ""
+    sha256: Optional[str] = None
+
+
+def source_from_github_url(name: str, url: str, *, codeload_url: str = CODELOAD_URL) -> SkillSource:
+    m = _GITHUB_TREE.match(url.strip())
+    if not m:
+        raise InstallError(f"Unsupported source URL for {name}: {url}")
+    ref = m.group("ref") or "HEAD"
+    archive = f"{codeload_url.rstrip('/')}/{m.group('owner')}/{m.group('repo')}/zip/{ref}"
+    return SkillSource(name=name, archive_url=archive, path=m.group("path") or "")
+
+
+class SkillMirror:
+    """Content-addressed store of downloaded skill archives.
+
+    Archives live at `objects/<sha[:2]>/<sha>.zip`; `index.json` maps archive URLs and
+    skill names to hashes. Copy or share the directory and install with
+    `--offline --mirror DIR` to avoid the network entirely. Every read re-checks the
+    archive's hash against its file name.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / "index.json"
+
+    def object_path(self, sha256: str) -> Path:
+        return self.root / "objects" / sha256[:2] / f"{sha256}.zip"
+
+    def load_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        data.setdefault("archives", {})
+        data.setdefault("skills", {})
+        return data
+
+    def record(self, source: SkillSource, sha256: str) -> None:
+        with self._lock:
+            index = self.load_index()
+            index["archives"][source.archive_url] = sha256
+            index["skills"][source.name] = {
+                "archive_url": source.archive_url,
+                "path": source.path,
+                "sha256": sha256,
+            }
+            self.root.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=".index-", suffix=".tmp", dir=self.root)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(index, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.index_path)
+
+    def lookup(self, archive_url: str) -> Optional[Path]:
+        sha = self.load_index()["archives"].get(archive_url)
+        if not sha:
+            return None
+        path = self.object_path(sha)
+        if not path.exists():
+            return None
+        if file_sha256(path) != sha:
+            raise InstallError(f"Mirror object {path} is corrupt (hash mismatch)")
+        return path
+
+    def put(self, tmp_file: Path, sha256: str) -> Path:
+        dest = self.object_path(sha256)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp_file, dest)
+        return dest
+
+
+class SkillInstaller:
+    """Resolve, download (once per archive), verify, validate and place skills.
+
+    Downloads run on a bounded thread pool over one pooled HTTP client; skills that
+    live in the same repository archive share a single download.
+    """
+
+    def __init__(
+        self,
+        *,
+        dest_dir: Path,
+        mirror: SkillMirror,
+        skillsmp: Optional[SkillsMPClient] = None,
+        http: Optional[httpx.Client] = None,
+        max_concurrency: int = 4,
+        offline: bool = False,
+        force: bool = False,
+        codeload_url: str = CODELOAD_URL,
+    ):
+        self.dest_dir = Path(dest_dir)
+        self.mirror = mirror
+        self.skillsmp = skillsmp
+        self._owns_http = http is None
+        self.http = http or httpx.Client(timeout=120, follow_redirects=True)
+        self.max_concurrency = max(max_concurrency, 1)
+        self.offline = offline
+        self.force = force
+        self.codeload_url = codeload_url
+        self._archive_locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def close(self) -> None:
+        """Close the HTTP client if this installer created it."""
+        if self._owns_http:
+            self.http.close()
+
+    def __enter__(self) -> "SkillInstaller":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def install(self, names: List[str]) -> List[InstallResult]:
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            return list(pool.map(self._install_one, names))
+
+    def resolve(self, name: str) -> SkillSource:
+        if self.offline:
+            entry = self.mirror.load_index()["skills"].get(name)
+            if not entry:
+                raise InstallError(f"{name} is not in the mirror at {self.mirror.root}")
+            return SkillSource(
+                name=name, archive_url=entry["archive_url"], path=entry["path"], sha256=entry["sha256"]
+            )
+        if self.skillsmp is None:
+            raise InstallError("SkillsMP client required to resolve skills online")
+        data = self.skillsmp.keyword_search(name, limit=20)
+        for item in extract_items(data):
+            if item.get("name") != name:
+                continue
+            url = item.get("githubUrl") or item.get("github_url") or item.get("repoUrl")
+            if not url:
+                break
+            source = source_from_github_url(name, str(url), codeload_url=self.codeload_url)
+            source.sha256 = item.get("sha256") or None
+            return source
+        raise InstallError(f"{name} not found on SkillsMP")
+
+    def _install_one(self, name: str) -> InstallResult:
+        target = self.dest_dir / name
+        if target.exists() and not self.force:
+            return InstallResult(name, "exists", f"{target} already exists (use --force)")
+        try:
+            source = self.resolve(name)
+            archive, sha = self._fetch(source)
+            self._place(name, archive, source.path)
+        except (InstallError, SkillParseError, httpx.HTTPError, OSError, ValueError, zipfile.BadZipFile) as e:
+            # ValueError covers a SkillsMP reply that is not JSON; one bad name must not abort the rest.
+            return InstallResult(name, "failed", str(e))
+        return InstallResult(name, "installed", str(target), sha)
+
+    def _fetch(self, source: SkillSource) -> Tuple[Path, str]:
+        with self._locks_guard:
+            lock = self._archive_locks.setdefault(source.archive_url, threading.Lock())
+        with lock:  # one download per archive, shared by all skills inside it
+            cached = self.mirror.lookup(source.archive_url)
+            if cached is not None:
+                sha = cached.stem
+            elif self.offline:
+                raise InstallError(f"{source.archive_url} is not in the mirror")
+            else:
+                cached, sha = self._download(source.archive_url)
+            if source.sha256 and source.sha256 != sha:
+                raise InstallError(
+                    f"Hash mismatch for {source.name}: expected {source.sha256}, got {sha}"
+                )
+            self.mirror.record(source, sha)
+            return cached, sha
+
+    def _download(self, url: str) -> Tuple[Path, str]:
+        self.mirror.root.mkdir(parents=True, exist_ok=True)
+        h = hashlib.sha256()
+        fd, tmp = tempfile.mkstemp(prefix=".download-", suffix=".tmp", dir=self.mirror.root)
+        try:
+            with os.fdopen(fd, "wb") as f, self.http.stream("GET", url) as r:
+                r.raise_for_status()
+                for chunk in r.iter_bytes():
+                    h.update(chunk)
+                    f.write(chunk)
+            sha = h.hexdigest()
+            return self.mirror.put(Path(tmp), sha), sha
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def _place(self, name: str, archive: Path, subdir: str) -> None:
+        self.dest_dir.mkdir(parents=True, exist_ok=True)
+        staging_root = Path(tempfile.mkdtemp(prefix=f".{name}-", dir=self.dest_dir))
+        try:
+            staged = staging_root / name
+            _extract_subdir(archive, subdir, staged)
+            # Same checks as discovery: frontmatter schema and name == folder name.
+            load_skill_frontmatter(staged / "SKILL.md")
+            target = self.dest_dir / name
+            if target.exists():
+                shutil.rmtree(target)
+            os.replace(staged, target)
+        finally:
+            shutil.rmtree(staging_root, ignore_errors=True)
+
+
+def _extract_subdir(archive: Path, subdir: str, dest: Path) -> None:
+    """Extract `<top>/<subdir>/...` from a repository zip into `dest`.
+
+    Members that would land outside `dest` (absolute paths, `..`) and symlinks are
+    rejected rather than skipped, since they indicate a tampered archive.
+    """
+    prefix = PurePosixPath(subdir) if subdir else None
+    found = False
+    with zipfile.ZipFile(archive) as zf:
+        for info in zf.infolist():
+            parts = PurePosixPath(info.filename).parts
+            if len(parts) < 2:
+                continue
+            inner = PurePosixPath(*parts[1:])  # drop "<repo>-<ref>/"
+            if prefix is not None:
+                try:
+                    rel = inner.relative_to(prefix)
+                except ValueError:
+                    continue
+            else:
+                rel = inner
+            if not rel.parts or info.is_dir():
+                continue
+            if rel.is_absolute() or ".." in rel.parts or info.filename.startswith("/"):
+                raise InstallError(f"Unsafe path in archive: {info.filename}")
+            if (info.external_attr >> 16) & 0o170000 == 0o120000:
+                raise InstallError(f"Symlink in archive: {info.filename}")
+            out = dest.joinpath(*rel.parts)
+            out.parent.mkdir(parents=True, exist_ok=True)
+            with zf.open(info) as src, open(out, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            found = True
+    if not found:
+        raise InstallError(f"{subdir or '/'} not found in {archive.name}")
@@ -1,44 +1,206 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 import httpx
 
+from ..core.utils import default_cache_dir
+
 
 @dataclass
 class SkillsMPConfig:
     api_key: str
     base_url: str = "https://skillsmp.com"
+    # Responses are cached on disk for `cache_ttl` seconds; after that they are
+    # revalidated with If-None-Match when the server sent an ETag.
+    cache_dir: Optional[Path] = None
+    cache_ttl: float = 600.0
+    max_concurrency: int = 4
+    timeout: float = 30.0
+
+
+def extract_items(data: Any) -> List[Dict[str, Any]]:
+    """Best-effort list of skill records from a search response (schema is not fixed)."""
+    if isinstance(data, list):
+        return [x for x in data if isinstance(x, dict)]
+    if not isinstance(data, dict):
+        return []
+    for key in ("skills", "results", "items", "data"):
+        value = data.get(key)
+        if isinstance(value, list):
+            return [x for x in value if isinstance(x, dict)]
+        if isinstance(value, dict):
+            nested = extract_items(value)
+            if nested:
+                return nested
+    return []
+
+
+def _total_pages(data: Any, limit: int) -> Optional[int]:
+    if not isinstance(data, dict):
+        return None
+    for container in (data, data.get("pagination"), data.get("meta"), data.get("data")):
+        if not isinstance(container, dict):
+            continue
+        for key in ("totalPages", "total_pages", "pages"):
+            if isinstance(container.get(key), int):
+                return container[key]
+        for key in ("total", "totalCount", "total_count"):
+            if isinstance(container.get(key), int) and limit > 0:
+                return max(1, -(-container[key] // limit))
+    return None
 
 
 class SkillsMPClient:
-    def __init__(self, config: SkillsMPConfig):
+    """SkillsMP REST client with one pooled connection and an on-disk response cache.
+
+    `transport` is passed to httpx; tests use `httpx.MockTransport`, and `base_url`
+    (or `SKILLSMP_BASE_URL`) can point the client at a local fixture server.
+    """
+
+    def __init__(self, config: SkillsMPConfig, *, transport: Optional[httpx.BaseTransport] = None):
         self.config = config
+        self.cache_dir = config.cache_dir if config.cache_dir is not None else default_cache_dir() / "skillsmp"
+        self._transport = transport
+        self._client: Optional[httpx.Client] = None
+        self._lock = threading.Lock()
 
     @classmethod
-    def from_env(cls) -> "SkillsMPClient":
+    def from_env(cls, **overrides: Any) -> "SkillsMPClient":
         api_key = os.environ.get("SKILLSMP_API_KEY")
         if not api_key:
             raise RuntimeError("Missing SKILLSMP_API_KEY. Get one from https://skillsmp.com/docs/api")
         base_url = os.environ.get("SKILLSMP_BASE_URL", "https://skillsmp.com")
-        return cls(SkillsMPConfig(api_key=api_key, base_url=base_url))
+        fields = {"api_key": api_key, "base_url": base_url}
+        fields.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(SkillsMPConfig(**fields))
+
+    @property
+    def client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    base_url=self.config.base_url.rstrip("/"),
+                    headers={"Authorization": f"Bearer {self.config.api_key}"},
+                    timeout=self.config.timeout,
+                    limits=httpx.Limits(max_connections=max(self.config.max_concurrency, 1)),
+                    transport=self._transport,
+                )
+            return self._client
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    def __enter__(self) -> "SkillsMPClient":
+        return self
 
-    def keyword_search(self, q: str, *, page: int = 1, limit: int = 10, sort_by: str = "stars") -> Dict[str, Any]:
-        url = self.config.base_url.rstrip("/") + "/api/v1/skills/search"
-        headers = {"Authorization": f"Bearer {self.config.api_key}"}
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def keyword_search(
+        self,
+        q: str,
+        *,
+        page: int = 1,
+        limit: int = 10,
+        sort_by: str = "stars",
+        use_cache: bool = True,
+    ) -> Dict[str, Any]:
         params = {"q": q, "page": page, "limit": limit, "sortBy": sort_by}
-        with httpx.Client(timeout=30) as client:
-            r = client.get(url, headers=headers, params=params)
-            r.raise_for_status()
-            return r.json()
-
-    def ai_search(self, q: str) -> Dict[str, Any]:
-        url = self.config.base_url.rstrip("/") + "/api/v1/skills/ai-search"
-        headers = {"Authorization": f"Bearer {self.config.api_key}"}
-        params = {"q": q}
-        with httpx.Client(timeout=60) as client:
-            r = client.get(url, headers=headers, params=params)
-            r.raise_for_status()
-            return r.json()
+        return self._get_json("/api/v1/skills/search", params, use_cache=use_cache)
+
+    def keyword_search_pages(
+        self,
+        q: str,
+        *,
+        pages: int,
+        limit: int = 10,
+        sort_by: str = "stars",
+        use_cache: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Fetch up to `pages` result pages, in order.
+
+        Page 1 tells how many pages exist (when the response says so); the remaining
+        pages are fetched concurrently, at most `max_concurrency` at a time.
+        """
+        first = self.keyword_search(q, page=1, limit=limit, sort_by=sort_by, use_cache=use_cache)
+        total = _total_pages(first, limit)
+        last = min(pages, total) if total is not None else pages
+        if last <= 1:
+            return [first]
+        if total is None and len(extract_items(first)) < limit:
+            return [first]
+
+        def fetch(page: int) -> Dict[str, Any]:
+            return self.keyword_search(q, page=page, limit=limit, sort_by=sort_by, use_cache=use_cache)
+
+        with ThreadPoolExecutor(max_workers=max(self.config.max_concurrency, 1)) as pool:
+            rest = list(pool.map(fetch, range(2, last + 1)))
+        return [first] + rest
+
+    def ai_search(self, q: str, *, use_cache: bool = True) -> Dict[str, Any]:
+        return self._get_json(
+            "/api/v1/skills/ai-search", {"q": q}, use_cache=use_cache, timeout=max(self.config.timeout, 60)
+        )
+
+    def _cache_path(self, path: str, params: Dict[str, Any]) -> Path:
+        key = json.dumps([self.config.base_url.rstrip("/"), path, sorted(params.items())], default=str)
+        return self.cache_dir / (hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+    def _get_json(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        *,
+        use_cache: bool = True,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        cache_path = self._cache_path(path, params)
+        cached: Optional[Dict[str, Any]] = None
+        if use_cache:
+            try:
+                cached = json.loads(cache_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                cached = None
+            if cached is not None and time.time() - cached.get("fetched_at", 0) < self.config.cache_ttl:
+                return cached["body"]
+
+        headers: Dict[str, str] = {}
+        if cached is not None and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        r = self.client.get(
+            path, params=params, headers=headers, timeout=timeout or self.config.timeout
+        )
+        if r.status_code == 304 and cached is not None:
+            cached["fetched_at"] = time.time()
+            self._store(cache_path, cached)
+            return cached["body"]
+        r.raise_for_status()
+        body = r.json()
+        if use_cache:
+            self._store(
+                cache_path, {"fetched_at": time.time(), "etag": r.headers.get("etag"), "body": body}
+            )
+        return body
+
+    def _store(self, cache_path: Path, entry: Dict[str, Any]) -> None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=".resp-", suffix=".tmp", dir=cache_path.parent)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, cache_path)
+        except OSError:
+            pass  # the cache is an optimisation only
@@ -0,0 +1,131 @@
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from solo_company_os.core.batch import (
+    BatchRunner,
+    LocalBatchBackend,
+    OpenAIBatchBackend,
+)
+from solo_company_os.core.providers.mock import MockProvider
+from solo_company_os.core.skill_index import SkillIndex, discover_skills
+
+MISSIONS = ["Write a PRD for a note app", "Build a landing page with FastAPI", "Write a PRD for a note app"]
+
+
+def _index() -> SkillIndex:
+    return SkillIndex(discover_skills(roots=[".agents/skills"]).skills)
+
+
+class _CountingBackend(LocalBatchBackend):
+    def __init__(self, root: Path):
+        super().__init__(root)
+        self.submitted = []
+
+    def submit(self, requests):
+        self.submitted.append(len(requests))
+        return super().submit(requests)
+
+
+def test_local_batch_runs_backlog_in_two_batches_and_resumes(tmp_path: Path):
+    backend = _CountingBackend(tmp_path / "local")
+    runner = BatchRunner(
+        work_dir=tmp_path / "state", backend=backend, model="mock", skill_index=_index(), run_root=tmp_path / "runs"
+    )
+    report = runner.run(MISSIONS)
+
+    # All plans in one batch, then every work order of every plan; the repeated mission is deduplicated.
+    assert len(backend.submitted) == 2 and backend.submitted[0] == 2
+    assert [r["status"] for r in report["runs"]] == ["done"] * 3
+    for row in report["runs"]:
+        run_dir = Path(row["run_dir"])
+        assert (run_dir / "RUN.md").is_file() and row["files"] > 0
+        events = [json.loads(line) for line in (run_dir / "trace.jsonl").open(encoding="utf-8")]
+        assert events[0]["type"] == "batch.results"
+        assert all(e["payload"]["usage"]["batch"] for e in events if e["type"] == "skill.exec.response")
+
+    resumed = BatchRunner(
+        work_dir=tmp_path / "state", backend=backend, model="mock", skill_index=_index(), run_root=tmp_path / "runs"
+    ).run([])
+    assert len(backend.submitted) == 2  # nothing resubmitted
+    assert [r["run_dir"] for r in resumed["runs"]] == [r["run_dir"] for r in report["runs"]]
+
+
+class _FailingPrdProvider(MockProvider):
+    def complete_json_with_usage(self, **kwargs):
+        if "SKILL: pm-prd\n" in kwargs["user"]:
+            raise RuntimeError("upstream 500")
+        return super().complete_json_with_usage(**kwargs)
+
+
+def test_failed_batch_line_drops_only_its_work_order(tmp_path: Path):
+    backend = _CountingBackend(tmp_path / "local")
+    backend.provider = _FailingPrdProvider()
+    report = BatchRunner(
+        work_dir=tmp_path / "state", backend=backend, model="mock", skill_index=_index(), run_root=tmp_path / "runs"
+    ).run(MISSIONS[:1])
+
+    assert len(backend.submitted) == 2  # a failed line is not retried with a repair prompt
+    row = report["runs"][0]
+    assert row["status"] == "done" and row["files"] > 0 and row["warnings"] >= 1
+    run_dir = Path(row["run_dir"])
+    events = [json.loads(line) for line in (run_dir / "trace.jsonl").open(encoding="utf-8")]
+    errors = [e["payload"] for e in events if e["type"] == "skill.exec.error"]
+    assert len(errors) == 1 and "upstream 500" in errors[0]["error"]
+    report_md = (run_dir / "RUN.md").read_text(encoding="utf-8")
+    assert "Failed to parse execution result for pm-prd" in report_md
+    assert "work orders dropped: 1" in report_md
+
+
+def test_openai_batch_backend_submit_poll_and_batch_pricing(tmp_path: Path):
+    answers = LocalBatchBackend(tmp_path / "answers")
+    batches = {}
+    polls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/v1/files" and request.method == "POST":
+            body = request.read().decode("utf-8")
+            lines = [json.loads(x) for x in body.splitlines() if x.startswith('{"custom_id"')]
+            batches["file"] = lines
+            return httpx.Response(200, json={"id": "file-in"})
+        if path == "/v1/batches":
+            assert json.loads(request.content)["endpoint"] == "/v1/chat/completions"
+            batch_id = f"batch_{len(batches)}"
+            batches[batch_id] = batches.pop("file")
+            return httpx.Response(200, json={"id": batch_id, "status": "validating"})
+        if path.startswith("/v1/batches/"):
+            polls.append(path)
+            done = len(polls) % 2 == 0  # every batch is "in_progress" on its first poll
+            out = {"id": path.rsplit("/", 1)[1], "status": "completed" if done else "in_progress"}
+            if done:
+                out["output_file_id"] = "out-" + out["id"]
+            return httpx.Response(200, json=out)
+        if path.startswith("/v1/files/out-"):
+            lines = []
+            for line in batches[path.split("out-", 1)[1].split("/")[0]]:
+                answered = answers._answer(line)
+                answered["response"]["body"]["usage"] = {"prompt_tokens": 1_000_000, "completion_tokens": 0}
+                lines.append(json.dumps(answered))
+            return httpx.Response(200, text="\n".join(lines))
+        return httpx.Response(404)
+
+    backend = OpenAIBatchBackend(api_key="k", base_url="http://llm.test/v1", transport=httpx.MockTransport(handler))
+    runner = BatchRunner(
+        work_dir=tmp_path / "state",
+        backend=backend,
+        model="gpt-4o-mini",
+        skill_index=_index(),
+        run_root=tmp_path / "runs",
+        sleep=lambda s: None,
+    )
+    first = runner.run(MISSIONS[:1], wait=False)
+    assert first["status"] == "pending" and first["requests"] == 1
+
+    report = runner.run(MISSIONS[:1])
+    assert report["status"] == "done" and len(report["batches"]) == 2
+    usage = report["runs"][0]["usage"]
+    # 1M prompt tokens per call at gpt-4o-mini's $0.15 / 1M, halved for batch.
+    assert usage["cost_usd"] == pytest.approx(usage["calls"] * 0.075)
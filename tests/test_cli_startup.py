@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+# Heavy dependencies that only specific commands need (dashboard, skillsmp, openai, --semantic).
+HEAVY = ("fastapi", "starlette", "uvicorn", "httpx", "yaml", "numpy", "solo_company_os.dashboard")
+
+
+def _imported(args: List[str], env: Dict[str, str], cwd: Path) -> Dict[str, int]:
+    """Run `python -X importtime ...` and return {module: cumulative_us}."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=cwd,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    out: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            out[name.strip()] = int(cumulative)
+    return out
+
+
+def _heavy(modules: Dict[str, int]) -> List[str]:
+    return sorted(m for m in modules if m.split(".")[0] in HEAVY or m.startswith(HEAVY))
+
+
+def test_cli_import_skips_heavy_dependencies(tmp_path: Path):
+    modules = _imported(["-c", "import solo_company_os.cli"], dict(os.environ), tmp_path)
+    assert "solo_company_os.cli" in modules
+    assert _heavy(modules) == [], f"CLI startup imports {_heavy(modules)}"
+
+
+def test_skills_list_with_warm_cache_needs_no_yaml(tmp_path: Path):
+    skill = tmp_path / ".agents" / "skills" / "alpha"
+    skill.mkdir(parents=True)
+    (skill / "SKILL.md").write_text("---\nname: alpha\ndescription: Alpha.\n---\n\n# alpha\n", encoding="utf-8")
+    env = dict(os.environ, SCOS_CACHE_DIR=str(tmp_path / "cache"), COLUMNS="200")
+    args = ["-m", "solo_company_os.cli", "skills", "list"]
+
+    cold = _imported(args, env, tmp_path)
+    assert "yaml" in cold  # first run parses SKILL.md and fills the discovery cache
+    warm = _imported(args, env, tmp_path)
+    assert _heavy(warm) == [], f"`skills list` imports {_heavy(warm)}"
+
+
+def test_entry_point_forwards_before_importing_the_cli(tmp_path: Path):
+    # Forwarding to a warm daemon must cost no more than interpreter start + a socket call.
+    modules = _imported(["-c", "import solo_company_os.__main__"], dict(os.environ), tmp_path)
+    loaded = sorted(
+        m for m in modules if m.split(".")[0] in ("typer", "rich", "pydantic") or m == "solo_company_os.cli"
+    )
+    assert loaded == [], loaded
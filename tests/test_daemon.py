@@ -0,0 +1,83 @@
+import io
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+from rich.console import Console
+
+from solo_company_os import daemon
+
+
+def _write_skill(root: Path, name: str, description: str) -> None:
+    folder = root / name
+    folder.mkdir(parents=True, exist_ok=True)
+    (folder / "SKILL.md").write_text(
+        f"---\nname: {name}\ndescription: {description}\n---\n\n# {name}\n", encoding="utf-8"
+    )
+
+
+@pytest.fixture()
+def running_daemon(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    # Unix socket paths are limited to ~100 bytes; pytest's tmp_path can be longer.
+    cache = Path(tempfile.mkdtemp(prefix="scos-"))
+    monkeypatch.setenv("SCOS_CACHE_DIR", str(cache))
+    monkeypatch.chdir(tmp_path)
+    _write_skill(tmp_path / ".agents" / "skills", "alpha", "Alpha skill.")
+
+    path = daemon.socket_path()
+    ready = threading.Event()
+    thread = threading.Thread(
+        target=daemon.serve,
+        args=(path,),
+        kwargs={"console": Console(file=io.StringIO()), "on_ready": lambda _: ready.set()},
+        daemon=True,
+    )
+    thread.start()
+    assert ready.wait(10)
+    yield path
+    daemon.request({"op": "stop"}, path)
+    thread.join(10)
+    shutil.rmtree(cache, ignore_errors=True)
+
+
+def test_forwarded_commands_reuse_the_warm_index(running_daemon: Path, tmp_path: Path):
+    out = io.StringIO()
+    assert daemon.forward(["skills", "list"], path=running_daemon, out=out) == 0
+    assert "alpha" in out.getvalue()
+
+    # Edits are picked up on the next command without restarting the daemon.
+    _write_skill(tmp_path / ".agents" / "skills", "beta", "Beta skill.")
+    out = io.StringIO()
+    assert daemon.forward(["skills", "show", "beta"], path=running_daemon, out=out) == 0
+    assert "Beta skill." in out.getvalue()
+
+    out = io.StringIO()
+    code = daemon.forward(["run", "Write a PRD", "--out", "runs/r1"], path=running_daemon, out=out)
+    assert code == 0
+    assert "Done." in out.getvalue()
+    assert (tmp_path / "runs" / "r1" / "trace.jsonl").exists()
+
+    # Usage errors come back as exit codes, not tracebacks.
+    out = io.StringIO()
+    assert daemon.forward(["run", "x", "--provider", "nope"], path=running_daemon, out=out) == 2
+
+    status = daemon.request({"op": "status"}, running_daemon)
+    assert status["commands"] == 4
+    assert status["skills"][0]["skills"] == 2
+
+
+def test_forward_declines_when_environment_differs(
+    running_daemon: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setenv("OPENAI_MODEL", "something-else")
+    assert daemon.forward(["skills", "list"], path=running_daemon, out=io.StringIO()) is None
+
+
+def test_forward_without_daemon_runs_locally(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("SCOS_CACHE_DIR", str(tmp_path))
+    assert daemon.forward(["skills", "list"], out=io.StringIO()) is None
+    assert daemon.should_forward(["run", "x"])
+    assert not daemon.should_forward(["run", "--help"])
+    assert not daemon.should_forward(["dashboard"])
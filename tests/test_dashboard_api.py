@@ -0,0 +1,192 @@
+import io
+import json
+import os
+import tarfile
+import zipfile
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from solo_company_os.dashboard import create_app
+
+
+def _write_trace(run_dir: Path, n: int) -> None:
+    run_dir.mkdir(parents=True)
+    with open(run_dir / "trace.jsonl", "w", encoding="utf-8") as f:
+        for i in range(n):
+            evt_type = "work_order.start" if i % 3 == 0 else "skill.exec.request"
+            f.write(json.dumps({"ts": str(i), "type": evt_type, "payload": {"i": i}}) + "\n")
+        f.write('{"ts": "partial"')
+
+
+def test_trace_cursor_pagination(tmp_path: Path):
+    _write_trace(tmp_path / "run-1", 25)
+    client = TestClient(create_app(run_root=tmp_path))
+
+    seen = []
+    cursor = ""
+    while True:
+        page = client.get("/api/runs/run-1/trace", params={"limit": 10, "cursor": cursor}).json()
+        seen.extend(e["payload"]["i"] for e in page["events"])
+        cursor = page["next_cursor"]
+        if not page["has_more"]:
+            break
+    assert seen == list(range(25))
+
+    # Nothing new after the last cursor; the partial line is not returned.
+    page = client.get("/api/runs/run-1/trace", params={"cursor": cursor}).json()
+    assert page["events"] == []
+
+    assert client.get("/api/runs/run-1/trace", params={"cursor": "nope"}).status_code == 400
+
+
+def test_trace_type_filter_tail_and_ndjson(tmp_path: Path):
+    _write_trace(tmp_path / "run-1", 25)
+    client = TestClient(create_app(run_root=tmp_path))
+
+    page = client.get("/api/runs/run-1/trace", params={"type": "work_order.start"}).json()
+    assert [e["payload"]["i"] for e in page["events"]] == list(range(0, 25, 3))
+
+    page = client.get("/api/runs/run-1/trace", params={"tail": 3}).json()
+    assert [e["payload"]["i"] for e in page["events"]] == [22, 23, 24]
+
+    page = client.get("/api/runs/run-1/trace", params={"tail": 2, "type": "work_order.start"}).json()
+    assert [e["payload"]["i"] for e in page["events"]] == [21, 24]
+
+    resp = client.get("/api/runs/run-1/trace", params={"format": "ndjson", "tail": 4})
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert [e["payload"]["i"] for e in lines] == [21, 22, 23, 24]
+
+
+def test_files_tree_etag_and_incremental_refresh(tmp_path: Path):
+    workspace = tmp_path / "run-1" / "workspace"
+    (workspace / "docs").mkdir(parents=True)
+    (workspace / "docs" / "PRD.md").write_text("# PRD\n", encoding="utf-8")
+    app = create_app(run_root=tmp_path)
+    app.state.catalog.record_start("run-1", mission="m")
+    client = TestClient(app)
+
+    first = client.get("/api/runs/run-1/files")
+    tree = first.json()["tree"]
+    assert tree[0]["name"] == "docs"
+    assert tree[0]["children"][0] == {"type": "file", "name": "PRD.md", "path": "docs/PRD.md", "size": 6}
+
+    etag = first.headers["etag"]
+    assert client.get("/api/runs/run-1/files", headers={"If-None-Match": etag}).status_code == 304
+
+    # A file added while the run is active shows up on the next poll.
+    (workspace / "app.py").write_text("print(1)\n", encoding="utf-8")
+    second = client.get("/api/runs/run-1/files", headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert [n["name"] for n in second.json()["tree"]] == ["app.py", "docs"]
+
+    # Finished runs are frozen: later disk changes are not re-scanned.
+    app.state.catalog.record_finish("run-1", status="done")
+    final = client.get("/api/runs/run-1/files")
+    (workspace / "late.txt").write_text("x", encoding="utf-8")
+    assert client.get("/api/runs/run-1/files").headers["etag"] == final.headers["etag"]
+
+
+def test_files_tree_gzip_for_large_trees(tmp_path: Path):
+    workspace = tmp_path / "run-1" / "workspace"
+    workspace.mkdir(parents=True)
+    for i in range(100):
+        (workspace / f"file-{i:03d}.txt").write_text("x", encoding="utf-8")
+    client = TestClient(create_app(run_root=tmp_path))
+
+    resp = client.get("/api/runs/run-1/files", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert len(resp.json()["tree"]) == 100
+
+
+def test_file_preview_windows_and_raw_ranges(tmp_path: Path, monkeypatch):
+    workspace = tmp_path / "run-1" / "workspace"
+    workspace.mkdir(parents=True)
+    big = "".join(f"line {i}\n" for i in range(50_000))
+    (workspace / "big.log").write_text(big, encoding="utf-8")
+    (workspace / "empty.txt").write_text("", encoding="utf-8")
+    client = TestClient(create_app(run_root=tmp_path))
+
+    first = client.get("/api/runs/run-1/file", params={"path": "big.log"}).json()
+    assert first["size"] == len(big)
+    assert first["truncated"] and first["length"] == 200_000
+    rest = client.get(
+        "/api/runs/run-1/file",
+        params={"path": "big.log", "offset": first["next_offset"], "length": 1_000_000},
+    ).json()
+    assert first["content"] + rest["content"] == big
+    assert rest["next_offset"] is None
+
+    window = client.get(
+        "/api/runs/run-1/file", params={"path": "big.log", "start_line": 10, "lines": 2}
+    ).json()
+    assert window["content"] == "line 10\nline 11\n"
+    assert window["next_line"] == 12
+
+    # A line window over the byte cap ends on a line boundary and resumes right after it.
+    monkeypatch.setattr("solo_company_os.dashboard.server.MAX_PREVIEW_WINDOW", 100)
+    capped = client.get(
+        "/api/runs/run-1/file", params={"path": "big.log", "start_line": 10, "lines": 50}
+    ).json()
+    assert capped["content"].endswith("\n") and len(capped["content"]) <= 100
+    served = capped["content"].count("\n")
+    assert capped["next_line"] == 10 + served < 60
+    following = client.get(
+        "/api/runs/run-1/file", params={"path": "big.log", "start_line": capped["next_line"], "lines": 1}
+    ).json()
+    assert following["content"] == f"line {10 + served}\n"
+    monkeypatch.undo()
+
+    empty = client.get("/api/runs/run-1/file", params={"path": "empty.txt"}).json()
+    assert empty["content"] == "" and not empty["truncated"]
+
+    whole = client.get("/api/runs/run-1/raw", params={"path": "big.log"})
+    assert whole.status_code == 200 and whole.text == big
+
+    part = client.get("/api/runs/run-1/raw", params={"path": "big.log"}, headers={"Range": "bytes=7-13"})
+    assert part.status_code == 206
+    assert part.text == big[7:14]
+    assert part.headers["content-range"] == f"bytes 7-13/{len(big)}"
+
+    suffix = client.get("/api/runs/run-1/raw", params={"path": "big.log"}, headers={"Range": "bytes=-6"})
+    assert suffix.text == big[-6:]
+
+    bad = client.get("/api/runs/run-1/raw", params={"path": "big.log"}, headers={"Range": "bytes=999999999-"})
+    assert bad.status_code == 416
+
+    assert client.get("/api/runs/run-1/raw", params={"path": "../../x"}).status_code == 400
+
+
+def test_archive_streams_zip_and_tar_gz(tmp_path: Path):
+    run_dir = tmp_path / "run-1"
+    (run_dir / "workspace" / "docs").mkdir(parents=True)
+    (run_dir / "workspace" / "docs" / "PRD.md").write_text("# PRD\n", encoding="utf-8")
+    blob = bytes(range(256)) * 4000
+    (run_dir / "workspace" / "data.bin").write_bytes(blob)
+    (run_dir / "RUN.md").write_text("# Run Report\n", encoding="utf-8")
+    client = TestClient(create_app(run_root=tmp_path))
+
+    resp = client.get("/api/runs/run-1/archive", params={"format": "zip"})
+    assert resp.headers["content-disposition"] == 'attachment; filename="run-1.zip"'
+    with zipfile.ZipFile(io.BytesIO(resp.content)) as zf:
+        assert sorted(zf.namelist()) == [
+            "run-1/RUN.md",
+            "run-1/workspace/data.bin",
+            "run-1/workspace/docs/PRD.md",
+        ]
+        assert zf.read("run-1/workspace/data.bin") == blob
+
+    # Files older than 1980 (e.g. mtime 0 from some build tools) get the earliest zip date.
+    os.utime(run_dir / "workspace" / "docs" / "PRD.md", (0, 0))
+    resp = client.get("/api/runs/run-1/archive", params={"format": "zip"})
+    with zipfile.ZipFile(io.BytesIO(resp.content)) as zf:
+        assert zf.getinfo("run-1/workspace/docs/PRD.md").date_time == (1980, 1, 1, 0, 0, 0)
+        assert zf.read("run-1/workspace/docs/PRD.md") == b"# PRD\n"
+
+    resp = client.get("/api/runs/run-1/archive", params={"format": "tar.gz", "meta": False})
+    with tarfile.open(fileobj=io.BytesIO(resp.content), mode="r:gz") as tf:
+        assert sorted(tf.getnames()) == ["run-1/workspace/data.bin", "run-1/workspace/docs/PRD.md"]
+        assert tf.extractfile("run-1/workspace/docs/PRD.md").read() == b"# PRD\n"
+
+    assert client.get("/api/runs/run-1/archive", params={"format": "rar"}).status_code == 400
@@ -0,0 +1,71 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from solo_company_os.core.evals import (
+    RESULTS_FILE,
+    EvalError,
+    discover_scenarios,
+    load_scenario,
+    run_evals,
+    validate_json_schema,
+)
+
+
+def test_json_schema_subset():
+    schema = {
+        "type": "object",
+        "required": ["mode", "work_orders"],
+        "properties": {
+            "mode": {"enum": ["build", "docs"]},
+            "work_orders": {"type": "array", "minItems": 1, "items": {"type": "object", "required": ["id"]}},
+        },
+    }
+    assert validate_json_schema({"mode": "build", "work_orders": [{"id": "WO-1"}]}, schema) == []
+    errors = validate_json_schema({"mode": "ship", "work_orders": [{}]}, schema)
+    assert errors == ["$.mode: 'ship' not in ['build', 'docs']", "$.work_orders[0]: missing 'id'"]
+    assert validate_json_schema(True, {"type": "integer"}) == ["$: expected integer, got bool"]
+
+
+def test_scenario_validation_errors(tmp_path: Path):
+    bad = tmp_path / "bad.yaml"
+    bad.write_text("mission: x\nexpect:\n  checks:\n    - file: a.md\n      regexp: y\n", encoding="utf-8")
+    with pytest.raises(EvalError, match="unknown keys"):
+        load_scenario(bad)
+    bad.write_text("mission: x\nexpect:\n  checks:\n    - file: a.json\n      json_schema: {oneOf: []}\n", encoding="utf-8")
+    with pytest.raises(EvalError, match="unsupported json_schema"):
+        load_scenario(bad)
+
+
+def test_run_evals_in_process_pool(tmp_path: Path):
+    scenarios = discover_scenarios([Path("scenarios/missions")])
+    failing = tmp_path / "missing_section.yaml"
+    failing.write_text(
+        "mission: Write a PRD for a todo app\n"
+        "expect:\n"
+        "  files: [docs/PRD.md, app/main.py]\n"
+        "  checks:\n"
+        "    - file: docs/PRD.md\n"
+        "      sections: [Goals, Pricing]\n"
+        "    - file: docs/PRD.md\n"
+        "      not_regex: '(?i)lorem ipsum'\n",
+        encoding="utf-8",
+    )
+    scenarios += discover_scenarios([failing])
+
+    seen = []
+    report = run_evals(scenarios, out_dir=tmp_path / "eval", workers=2, on_result=seen.append)
+
+    assert len(seen) == len(scenarios) == 3
+    by_name = {r["scenario"]: r for r in report["results"]}
+    assert by_name["docs_only"]["status"] == "passed"
+    assert by_name["landing_fastapi"]["status"] == "passed"
+    failed = {c["name"]: c for c in by_name["missing_section"]["checks"] if not c["ok"]}
+    assert set(failed) == {"exists app/main.py", "sections docs/PRD.md"}
+    assert "Pricing" in failed["sections docs/PRD.md"]["detail"]
+
+    saved = json.loads((tmp_path / "eval" / RESULTS_FILE).read_text(encoding="utf-8"))
+    assert saved["summary"] == report["summary"]
+    assert saved["summary"]["passed"] == 2 and saved["summary"]["failed"] == 1
+    assert all(r["timings"]["run_s"] > 0 for r in saved["results"])
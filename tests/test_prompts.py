@@ -0,0 +1,79 @@
+import httpx
+import pytest
+
+from solo_company_os.core.prompts import (
+    EXEC_SCHEMA_HINT,
+    EXEC_SYSTEM,
+    exec_prompt,
+    plan_prompt,
+    skill_preamble,
+    system_message,
+)
+from solo_company_os.core.providers.openai_compatible import (
+    OpenAICompatibleConfig,
+    OpenAICompatibleProvider,
+)
+from solo_company_os.core.usage import PriceTable
+
+BODY = "# PRD skill\n\nWrite a PRD with goals, non-goals and acceptance criteria.\n"
+
+
+def _exec(mission: str, wo: str, outputs):
+    return exec_prompt(
+        skill="pm-prd",
+        description="Write PRDs",
+        body=BODY,
+        references=[],
+        mission=mission,
+        work_order=wo,
+        outputs=outputs,
+    )
+
+
+def test_prompts_put_static_content_first():
+    a = _exec("Build a note app", "WO-1 - Write the PRD", [("docs/PRD.md", "requirements")])
+    b = _exec("Build a CRM", "WO-4 - Refresh the PRD", [("docs/CRM_PRD.md", "")])
+    prefix = skill_preamble("pm-prd", "Write PRDs", BODY)
+    assert a.startswith(prefix) and b.startswith(prefix)
+    assert "Write a PRD with goals" in prefix and "MISSION" not in prefix
+    assert a.index("SKILL_INSTRUCTIONS:") < a.index("MISSION: Build a note app") < a.index("WORK_ORDER_OUTPUTS:")
+
+    plan_a = plan_prompt("Build a note app", [("pm-prd", "Write PRDs")])
+    plan_b = plan_prompt("Build a CRM", [("pm-prd", "Write PRDs")])
+    assert plan_a.rsplit("MISSION:", 1)[0] == plan_b.rsplit("MISSION:", 1)[0]
+
+    # The system message is built once per call kind and reused byte for byte.
+    assert system_message(EXEC_SYSTEM, EXEC_SCHEMA_HINT) is system_message(EXEC_SYSTEM, EXEC_SCHEMA_HINT)
+
+
+def test_cached_prompt_tokens_are_reported_and_priced():
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request.read())
+        return httpx.Response(
+            200,
+            json={
+                "model": "gpt-4o-mini",
+                "choices": [{"message": {"content": "{}"}}],
+                "usage": {
+                    "prompt_tokens": 2000,
+                    "completion_tokens": 100,
+                    "prompt_tokens_details": {"cached_tokens": 1536},
+                },
+            },
+        )
+
+    provider = OpenAICompatibleProvider(
+        OpenAICompatibleConfig(api_key="k", base_url="http://llm.test/v1"), transport=httpx.MockTransport(handler)
+    )
+    for mission in ("Build a note app", "Build a CRM"):
+        _, usage = provider.complete_json_with_usage(
+            system=EXEC_SYSTEM, user=_exec(mission, "WO-1 - PRD", []), schema_hint=EXEC_SCHEMA_HINT
+        )
+    assert usage.cached_tokens == 1536
+    # Both request bodies agree up to the mission.
+    common = sent[0][: sent[0].index(b"Build a note app")]
+    assert sent[1].startswith(common) and b"SKILL_INSTRUCTIONS" in common
+    expected = ((2000 - 1536) * 0.15 + 1536 * 0.075 + 100 * 0.60) / 1e6
+    assert PriceTable.load().cost(usage) == pytest.approx(expected)
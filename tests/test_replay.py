@@ -0,0 +1,55 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from solo_company_os.core.orchestrator import run_mission
+from solo_company_os.core.providers.mock import MockProvider
+from solo_company_os.core.providers.replay import ReplayMiss, ReplayProvider
+from solo_company_os.core.skill_index import SkillIndex, discover_skills
+
+MISSION = "Build a runnable demo landing page with FastAPI"
+
+
+def _run(idx: SkillIndex, provider, run_dir: Path, mission: str = MISSION):
+    return run_mission(
+        mission=mission, skill_index=idx, provider=provider, run_dir=run_dir, workspace=run_dir / "workspace"
+    )
+
+
+def _files(workspace: Path):
+    return {p.relative_to(workspace).as_posix(): p.read_text(encoding="utf-8") for p in workspace.rglob("*") if p.is_file()}
+
+
+def test_replay_reproduces_a_recorded_run(tmp_path: Path):
+    idx = SkillIndex(discover_skills(roots=[".agents/skills"]).skills)
+    recorded = _run(idx, MockProvider(), tmp_path / "recorded")
+
+    events = [json.loads(line) for line in (tmp_path / "recorded" / "trace.jsonl").open(encoding="utf-8")]
+    requests = [e for e in events if e["type"] in ("plan.request", "skill.exec.request")]
+    assert requests and all(len(e["payload"]["prompt_fp"]) == 32 for e in requests)
+
+    replay = ReplayProvider.from_run_dir(tmp_path / "recorded", strict=True)
+    replayed = _run(idx, replay, tmp_path / "replayed")
+    assert replay.hits == len(requests) and replay.fallbacks == 0
+    assert _files(replayed.workspace) == _files(recorded.workspace)
+
+    with pytest.raises(ReplayMiss, match="plan"):
+        _run(idx, ReplayProvider.from_run_dir(tmp_path / "recorded", strict=True), tmp_path / "x", "Other mission")
+
+
+def test_replay_falls_back_by_kind_for_traces_without_fingerprints(tmp_path: Path):
+    idx = SkillIndex(discover_skills(roots=[".agents/skills"]).skills)
+    recorded = _run(idx, MockProvider(), tmp_path / "recorded")
+    trace = tmp_path / "recorded" / "trace.jsonl"
+    lines = []
+    for line in trace.read_text(encoding="utf-8").splitlines():
+        evt = json.loads(line)
+        evt["payload"].pop("prompt_fp", None)
+        lines.append(json.dumps(evt))
+    trace.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    replay = ReplayProvider(trace)
+    replayed = _run(idx, replay, tmp_path / "replayed", "A different wording of the mission")
+    assert replay.hits == 0 and replay.fallbacks == len(recorded.plan.work_orders) + 1
+    assert _files(replayed.workspace) == _files(recorded.workspace)
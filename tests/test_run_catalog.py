@@ -0,0 +1,78 @@
+import json
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from solo_company_os.core.orchestrator import run_mission
+from solo_company_os.core.providers.mock import MockProvider
+from solo_company_os.core.run_catalog import RunCatalog
+from solo_company_os.core.skill_index import SkillIndex, discover_skills
+from solo_company_os.dashboard import create_app
+
+
+def _mock_run(run_root: Path, run_id: str, mission: str, catalog=None) -> None:
+    report = discover_skills(roots=[".agents/skills"])
+    run_dir = run_root / run_id
+    run_mission(
+        mission=mission,
+        skill_index=SkillIndex(report.skills),
+        provider=MockProvider(),
+        run_dir=run_dir,
+        workspace=run_dir / "workspace",
+        catalog=catalog,
+    )
+
+
+def test_run_mission_updates_catalog(tmp_path: Path):
+    catalog = RunCatalog(tmp_path)
+    _mock_run(tmp_path, "run-a", "Build a FastAPI demo", catalog=catalog)
+
+    row = catalog.get("run-a")
+    assert row["status"] == "done"
+    assert row["mission"] == "Build a FastAPI demo"
+    assert row["provider"] == "mock"
+    assert row["files_written"] > 0
+    assert row["work_orders"] == 6
+
+
+def test_reconcile_indexes_out_of_band_runs(tmp_path: Path):
+    _mock_run(tmp_path, "run-a", "Write docs only")
+    (tmp_path / "run-b").mkdir()
+    (tmp_path / "run-b" / "RUN_ERROR.txt").write_text("boom", encoding="utf-8")
+
+    catalog = RunCatalog(tmp_path)
+    assert catalog.reconcile() == {"added": 2, "updated": 0, "removed": 0}
+    assert catalog.get("run-a")["mission"] == "Write docs only"
+    assert catalog.get("run-a")["status"] == "done"
+    assert catalog.get("run-b")["status"] == "error"
+
+    (tmp_path / "run-b" / "RUN_ERROR.txt").unlink()
+    (tmp_path / "run-b").rmdir()
+    assert catalog.reconcile() == {"added": 0, "updated": 0, "removed": 1}
+
+
+def test_api_runs_paginates_and_filters(tmp_path: Path):
+    for i in range(3):
+        _mock_run(tmp_path, f"run-{i}", f"Mission number {i}")
+    (tmp_path / "run-x").mkdir()
+    (tmp_path / "run-x" / "trace.jsonl").write_text(
+        json.dumps({"ts": "t", "type": "mission.start", "payload": {"mission": "half done"}}) + "\n",
+        encoding="utf-8",
+    )
+
+    client = TestClient(create_app(run_root=tmp_path))
+
+    page = client.get("/api/runs", params={"limit": 2}).json()
+    assert page["total"] == 4
+    assert [r["run_id"] for r in page["runs"]] == ["run-x", "run-2"]
+
+    page = client.get("/api/runs", params={"limit": 2, "offset": 2, "order": "asc"}).json()
+    assert [r["run_id"] for r in page["runs"]] == ["run-2", "run-x"]
+
+    done = client.get("/api/runs", params={"status": "done"}).json()
+    assert done["total"] == 3
+
+    found = client.get("/api/runs", params={"q": "number 1"}).json()
+    assert [r["run_id"] for r in found["runs"]] == ["run-1"]
+
+    assert client.get("/api/runs", params={"sort": "mission; drop"}).status_code == 400
@@ -0,0 +1,185 @@
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from solo_company_os.core.orchestrator import run_mission
+from solo_company_os.core.providers.mock import MockProvider
+from solo_company_os.core.run_catalog import RunCatalog
+from solo_company_os.core.skill_index import SkillIndex, discover_skills
+from solo_company_os.dashboard import create_app
+from solo_company_os.dashboard.process_pool import ProcessRunner
+from solo_company_os.dashboard.run_queue import QueuedRun, QueueFull, RunQueue
+
+
+def _wait_until(cond, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not cond():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_queue_is_fifo_bounded_and_cancellable(tmp_path: Path):
+    catalog = RunCatalog(tmp_path)
+    release = threading.Event()
+    started = []
+
+    def runner(job, cancel):
+        started.append(job.run_id)
+        release.wait(5)
+
+    q = RunQueue(catalog, runner, workers=1, max_queued=2)
+    q.start()
+    try:
+        assert q.submit(QueuedRun(run_id="r1", mission="one")) == 1
+        _wait_until(lambda: q.stats()["active"] == 1)
+        assert q.submit(QueuedRun(run_id="r2", mission="two")) == 1
+        assert q.submit(QueuedRun(run_id="r3", mission="three")) == 2
+        with pytest.raises(QueueFull):
+            q.submit(QueuedRun(run_id="r4", mission="four"))
+
+        assert q.position("r1") == 0
+        assert q.position("r3") == 2
+        assert q.cancel("r2") == "cancelled"
+        assert catalog.get("r2")["status"] == "cancelled"
+        assert q.cancel("r1") == "cancelling"
+        assert q.cancel("missing") is None
+    finally:
+        release.set()
+        _wait_until(lambda: not (q.stats()["queued"] or q.stats()["active"]))
+        q.shutdown(timeout=5)
+    assert started == ["r1", "r3"]
+
+
+def test_worker_survives_a_runner_that_raises(tmp_path: Path):
+    catalog = RunCatalog(tmp_path)
+    ran = threading.Event()
+
+    def runner(job, cancel):
+        if job.run_id == "boom":
+            raise BrokenPipeError("worker pipe closed")
+        ran.set()
+
+    q = RunQueue(catalog, runner, workers=1)
+    q.start()
+    try:
+        q.submit(QueuedRun(run_id="boom", mission="one"))
+        q.submit(QueuedRun(run_id="next", mission="two"))
+        assert ran.wait(5)
+    finally:
+        q.shutdown(timeout=5)
+    row = catalog.get("boom")
+    assert row["status"] == "error" and "BrokenPipeError" in row["error"]
+
+
+def test_queued_runs_survive_restart(tmp_path: Path):
+    catalog = RunCatalog(tmp_path)
+    catalog.record_queued("r1", mission="one", provider="mock", request={"provider": "mock"})
+    catalog.record_queued("r2", mission="two", provider="mock", request={"provider": "mock"})
+    # A run the previous dashboard process was executing, a CLI run and a live process's run.
+    gone = subprocess.Popen([sys.executable, "-c", ""])
+    gone.wait()
+    host = socket.gethostname()
+    catalog.record_queued("r0", mission="zero", provider="mock", request={}, owner=f"{host}:{gone.pid}")
+    catalog.record_start("r0", mission="zero")
+    catalog.record_start("cli", mission="from the CLI")
+    catalog.record_queued("live", mission="elsewhere", provider="mock", request={}, owner=f"{host}:{os.getppid()}")
+    catalog.record_start("live", mission="elsewhere")
+
+    done = []
+    finished = threading.Event()
+
+    def runner(job, cancel):
+        done.append(job.run_id)
+        if len(done) == 2:
+            finished.set()
+
+    q = RunQueue(catalog, runner, workers=1)
+    q.start()
+    assert finished.wait(5)
+    q.shutdown(timeout=5)
+    assert done == ["r1", "r2"]
+    assert catalog.get("r0")["status"] == "error"
+    assert catalog.get("cli")["status"] == "running"
+    assert catalog.get("live")["status"] == "running"
+    assert catalog.get("r1")["owner"] == q.owner
+
+
+def test_run_mission_stops_between_work_orders(tmp_path: Path):
+    report = discover_skills(roots=[".agents/skills"])
+    catalog = RunCatalog(tmp_path)
+    checks = []
+
+    def should_cancel():
+        checks.append(1)
+        return len(checks) > 2
+
+    summary = run_mission(
+        mission="Build a FastAPI demo",
+        skill_index=SkillIndex(report.skills),
+        provider=MockProvider(),
+        run_dir=tmp_path / "run",
+        workspace=tmp_path / "run" / "workspace",
+        catalog=catalog,
+        should_cancel=should_cancel,
+    )
+    assert summary.cancelled
+    assert (summary.workspace / "docs/BACKLOG.md").exists()
+    assert not (summary.workspace / "docs/ARCHITECTURE.md").exists()
+    assert catalog.get("run")["status"] == "cancelled"
+
+
+def test_execute_endpoint_queues_and_rejects_when_full(tmp_path: Path):
+    app = create_app(run_root=tmp_path, workers=1, max_queued=1)
+    # Hold the worker so submissions stay queued.
+    app.state.run_queue.shutdown()
+    client = TestClient(app)
+
+    body = {"mission": "Build a FastAPI demo", "skill_dir": [".agents/skills"]}
+    first = client.post("/api/runs/execute", json=body)
+    assert first.status_code == 200
+    assert first.json()["status"] == "queued"
+    assert first.json()["position"] == 1
+    assert client.post("/api/runs/execute", json=body).status_code == 429
+    assert client.get("/api/queue").json()["queued"] == 1
+
+    run_id = first.json()["run_id"]
+    assert (tmp_path / run_id / "workspace").is_dir()
+    assert sorted(p.name for p in tmp_path.iterdir() if p.is_dir()) == [run_id]  # no dir for the rejected one
+    assert client.post(f"/api/runs/{run_id}/cancel").json()["status"] == "cancelled"
+    assert client.post(f"/api/runs/{run_id}/cancel").status_code == 409
+    assert client.get(f"/api/runs/{run_id}").json()["status"] == "cancelled"
+
+
+def test_process_executor_streams_trace_and_recycles_workers(tmp_path: Path):
+    catalog = RunCatalog(tmp_path)
+    runner = ProcessRunner(tmp_path, catalog, max_runs_per_worker=1)
+    pids = []
+    original_acquire = runner._acquire
+
+    def acquire():
+        worker = original_acquire()
+        pids.append(worker.process.pid)
+        return worker
+
+    runner._acquire = acquire
+    q = RunQueue(catalog, runner, workers=1)
+    q.start()
+    try:
+        for run_id in ("p1", "p2"):
+            q.submit(QueuedRun(run_id=run_id, mission="Write docs", skill_dir=[".agents/skills"]))
+        _wait_until(lambda: all(catalog.get(r)["status"] == "done" for r in ("p1", "p2")), 60)
+    finally:
+        q.shutdown(timeout=10)
+        runner.close()
+
+    assert len(set(pids)) == 2
+    trace = (tmp_path / "p1" / "trace.jsonl").read_text(encoding="utf-8")
+    assert '"mission.start"' in trace and '"mission.done"' in trace
+    assert (tmp_path / "p1" / "workspace" / "docs" / "PRD.md").exists()
@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from solo_company_os.core.skill_embeddings import SkillEmbeddingIndex, load_or_build
+from solo_company_os.core.skill_index import SkillIndex, discover_skills
+
+
+def _index(root: Path) -> SkillIndex:
+    for name, description in (
+        ("web-scraper", "Scraper that crawls websites and extracts tables."),
+        ("pdf-report", "Render a PDF report from markdown."),
+        ("data-clean", "清洗数据表格，去除重复记录。"),
+    ):
+        (root / name).mkdir(parents=True, exist_ok=True)
+        (root / name / "SKILL.md").write_text(
+            f"---\nname: {name}\ndescription: {description}\n---\n\n# {name}\n", encoding="utf-8"
+        )
+    return SkillIndex(discover_skills(roots=[str(root)]).skills)
+
+
+def test_embedding_search_matches_different_wording(tmp_path: Path):
+    idx = _index(tmp_path / "skills")
+    emb = SkillEmbeddingIndex.build(idx)
+
+    assert emb.search("scraping web sites", 1)[0][0] == "web-scraper"
+    assert emb.search("帮我清洗一下数据", 1)[0][0] == "data-clean"
+    batch = emb.search_many(["pdf reports", "crawl a website"], 2)
+    assert [hits[0][0] for hits in batch] == ["pdf-report", "web-scraper"]
+
+    # The planner shortlist fuses BM25 with the embedding ranking.
+    assert idx.shortlist("scraping web sites", 1, semantic=emb)[0][0] == "web-scraper"
+
+
+def test_embedding_index_is_persisted_and_reused(tmp_path: Path):
+    idx = _index(tmp_path / "skills")
+    path = tmp_path / "cache" / "emb.npz"
+
+    first = load_or_build(idx, path)
+    assert first.embedded == 3 and path.exists()
+    second = load_or_build(idx, path)
+    assert second.embedded == 0
+    assert second.names == first.names
+
+    (tmp_path / "skills" / "pdf-report" / "SKILL.md").write_text(
+        "---\nname: pdf-report\ndescription: Export slides to PDF.\n---\n", encoding="utf-8"
+    )
+    third = load_or_build(SkillIndex(discover_skills(roots=[str(tmp_path / "skills")]).skills), path)
+    assert third.embedded == 1
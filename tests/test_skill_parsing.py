@@ -9,3 +9,115 @@ def test_discover_local_skills():
     idx = SkillIndex(report.skills)
     assert idx.get("pm-prd") is not None
     assert idx.get("eng-fastapi-starter") is not None
+
+
+def test_discovery_cache_skips_unchanged_skills(tmp_path: Path, monkeypatch):
+    from solo_company_os.core import skill_cache
+    from solo_company_os.core.skill_cache import SkillDiscoveryCache
+
+    root = tmp_path / "skills"
+    (root / "demo").mkdir(parents=True)
+    skill_md = root / "demo" / "SKILL.md"
+    skill_md.write_text("---\nname: demo\ndescription: Demo skill.\nallowed-tools: Bash\n---\n\nBody\n", encoding="utf-8")
+    (root / "broken").mkdir()
+    (root / "broken" / "SKILL.md").write_text("---\nname: other\ndescription: x\n---\n", encoding="utf-8")
+    cache_path = tmp_path / "cache" / "skills.json"
+
+    cold = discover_skills(roots=[str(root)], cache=SkillDiscoveryCache(cache_path))
+    assert cache_path.exists()
+
+    def fail(path):
+        raise AssertionError(f"re-parsed {path}")
+
+    monkeypatch.setattr(skill_cache, "load_skill_frontmatter", fail)
+    warm_cache = SkillDiscoveryCache(cache_path)
+    warm = discover_skills(roots=[str(root)], cache=warm_cache)
+    assert warm_cache.hits == 2 and warm_cache.misses == 0
+    assert warm.errors == cold.errors and len(warm.errors) == 1
+    assert warm.skills[0].frontmatter == cold.skills[0].frontmatter
+    assert warm.skills[0].frontmatter.allowed_tools == "Bash"
+
+    # An edited skill is revalidated.
+    monkeypatch.undo()
+    skill_md.write_text("---\nname: demo\ndescription: Edited demo skill.\n---\n\nBody\n", encoding="utf-8")
+    edited_cache = SkillDiscoveryCache(cache_path)
+    edited = discover_skills(roots=[str(root)], cache=edited_cache)
+    assert edited_cache.misses == 1
+    assert edited.skills[0].frontmatter.description == "Edited demo skill."
+
+
+def test_parallel_discovery_matches_sequential(tmp_path: Path):
+    for root_name, names in (("a", ["one", "two", "zz"]), ("b", ["two", "three"])):
+        for name in names:
+            folder = tmp_path / root_name / name
+            folder.mkdir(parents=True)
+            (folder / "SKILL.md").write_text(
+                f"---\nname: {name}\ndescription: From {root_name}.\n---\n", encoding="utf-8"
+            )
+    (tmp_path / "a" / "zz" / "SKILL.md").write_text("no frontmatter", encoding="utf-8")
+    roots = [str(tmp_path / "a"), str(tmp_path / "missing"), str(tmp_path / "b")]
+
+    sequential = discover_skills(roots=roots)
+    parallel = discover_skills(roots=roots, workers=4)
+    assert [s.skill_md for s in parallel.skills] == [s.skill_md for s in sequential.skills]
+    assert parallel.errors == sequential.errors
+    assert [(s.frontmatter.name, s.frontmatter.description) for s in parallel.skills] == [
+        ("one", "From a."),
+        ("two", "From a."),
+        ("three", "From b."),
+    ]
+    assert [(t.folders, t.skills) for t in parallel.timings] == [(3, 2), (2, 1)]
+
+
+def test_frontmatter_reads_header_only_and_bodies_are_cached(tmp_path: Path, monkeypatch):
+    from solo_company_os.core import skill_index
+    from solo_company_os.core.skill import load_skill_frontmatter
+
+    folder = tmp_path / "big"
+    folder.mkdir()
+    skill_md = folder / "SKILL.md"
+    # Invalid UTF-8 after the header proves the body is never decoded during discovery.
+    skill_md.write_bytes(b"---\nname: big\ndescription: Big skill.\n---\n\n# Body\n" + b"\xff" * 1000)
+    assert load_skill_frontmatter(skill_md).name == "big"
+
+    skill_md.write_text("---\nname: big\ndescription: Big skill.\n---\n\n# Body v1\n", encoding="utf-8")
+    idx = SkillIndex(discover_skills(roots=[str(tmp_path)]).skills)
+    reads = []
+    real = skill_index.load_skill_body
+    monkeypatch.setattr(skill_index, "load_skill_body", lambda p: reads.append(p) or real(p))
+
+    assert idx.load_body("big") == "# Body v1"
+    assert idx.load_body("big") == "# Body v1"
+    assert len(reads) == 1
+
+    skill_md.write_text("---\nname: big\ndescription: Big skill.\n---\n\n# Body v2 (edited)\n", encoding="utf-8")
+    assert idx.load_body("big") == "# Body v2 (edited)"
+    assert len(reads) == 2
+
+
+def test_skill_pack_roundtrip_without_parsing(tmp_path: Path, monkeypatch):
+    import shutil
+
+    from solo_company_os.core import skill_index
+    from solo_company_os.core.skill_pack import SkillPack, write_skill_pack
+
+    src = tmp_path / "src"
+    shutil.copytree(".agents/skills", src)
+    report = discover_skills(roots=[str(src)])
+    expected = {s.frontmatter.name: SkillIndex(report.skills).load_body(s.frontmatter.name) for s in report.skills}
+    pack_path = tmp_path / "skills.scpack"
+    write_skill_pack(report.skills, pack_path)
+    assert SkillPack(pack_path).stale() == []
+    shutil.rmtree(src)
+
+    def fail(path):
+        raise AssertionError(f"parsed {path}")
+
+    monkeypatch.setattr(skill_index, "load_skill_frontmatter", fail)
+    packed = discover_skills(roots=[str(pack_path)])
+    assert [s.frontmatter for s in packed.skills] == [s.frontmatter for s in report.skills]
+    assert packed.errors == []
+
+    idx = SkillIndex(packed.skills)
+    assert {name: idx.load_body(name) for name in expected} == expected
+    assert idx.search("retrospective", 1)[0][0] == "coach-retro"
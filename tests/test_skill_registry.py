@@ -0,0 +1,95 @@
+import logging
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from solo_company_os.core import skill_registry
+from solo_company_os.core.skill_registry import SkillRegistry, roots_fingerprint
+from solo_company_os.dashboard import create_app
+
+
+def _write_skill(root: Path, name: str, description: str = "Test skill.") -> None:
+    folder = root / name
+    folder.mkdir(parents=True, exist_ok=True)
+    (folder / "SKILL.md").write_text(
+        f"---\nname: {name}\ndescription: {description}\n---\n\n# {name}\n",
+        encoding="utf-8",
+    )
+
+
+def test_registry_shares_index_until_roots_change(tmp_path: Path):
+    _write_skill(tmp_path, "alpha")
+    registry = SkillRegistry(poll_interval=None)
+    events = []
+    registry.subscribe(events.append)
+
+    first = registry.get([str(tmp_path)])
+    assert registry.get([str(tmp_path)]) is first
+    assert registry.refresh() == []
+
+    _write_skill(tmp_path, "beta")
+    second = registry.get([str(tmp_path)])
+    assert second is not first
+    assert [s.frontmatter.name for s in second.skills] == ["alpha", "beta"]
+    assert events[-1]["added"] == ["beta"] and events[-1]["removed"] == []
+
+    _write_skill(tmp_path, "alpha", description="Edited description, longer than before.")
+    events.clear()
+    registry.refresh()
+    assert events and events[0]["skills"] == 2
+    assert registry.get([str(tmp_path)]).require("alpha").frontmatter.description.startswith("Edited")
+
+
+def test_fingerprint_stats_skill_folders_not_their_files(tmp_path: Path, monkeypatch):
+    _write_skill(tmp_path, "alpha")
+    (tmp_path / "alpha" / "references").mkdir()
+    (tmp_path / "alpha" / "references" / "notes.md").write_text("v1", encoding="utf-8")
+
+    def no_walk(folder):
+        raise AssertionError(f"fingerprint walked {folder}")
+
+    monkeypatch.setattr("solo_company_os.core.skill_resources.iter_resource_files", no_walk)
+    fp = roots_fingerprint([str(tmp_path)])
+    (tmp_path / "alpha" / "references" / "notes.md").write_text("v2, edited", encoding="utf-8")
+    assert roots_fingerprint([str(tmp_path)]) == fp  # read fresh by select_references instead
+    (tmp_path / "alpha" / "template.md").write_text("new", encoding="utf-8")
+    assert roots_fingerprint([str(tmp_path)]) != fp
+
+
+def test_failed_reload_is_logged_and_reported(tmp_path: Path, monkeypatch, caplog):
+    _write_skill(tmp_path, "alpha")
+    registry = SkillRegistry(poll_interval=None)
+    first = registry.get([str(tmp_path)])
+
+    def broken(listener_evt):
+        raise RuntimeError("listener bug")
+
+    registry.subscribe(broken)
+    caplog.set_level(logging.ERROR, logger=skill_registry.__name__)
+
+    def fail(**kwargs):
+        raise OSError("disk went away")
+
+    monkeypatch.setattr(skill_registry, "discover_skills", fail)
+    _write_skill(tmp_path, "beta")
+    assert registry.get([str(tmp_path)]) is first  # the last good index keeps serving
+    assert registry.status()[0]["reload_error"] == "OSError: disk went away"
+    assert "Reloading skills" in caplog.text
+
+    monkeypatch.undo()
+    assert [s.frontmatter.name for s in registry.get([str(tmp_path)]).skills] == ["alpha", "beta"]
+    assert registry.status()[0]["reload_error"] is None
+    assert "listener bug" in caplog.text
+
+
+def test_dashboard_reuses_skill_index_across_submissions(tmp_path: Path):
+    app = create_app(run_root=tmp_path / "runs", skill_poll_interval=None)
+    app.state.run_queue.shutdown()
+    client = TestClient(app)
+    body = {"mission": "Build a FastAPI demo", "skill_dir": [".agents/skills"]}
+
+    assert client.post("/api/runs/execute", json=body).status_code == 200
+    assert client.post("/api/runs/execute", json=body).status_code == 200
+    indexes = client.get("/api/skills").json()["indexes"]
+    assert len(indexes) == 1
+    assert indexes[0]["skills"] >= 6
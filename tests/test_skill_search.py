@@ -0,0 +1,148 @@
+import json
+from pathlib import Path
+
+from solo_company_os.core.orchestrator import run_mission
+from solo_company_os.core.providers.mock import MockProvider
+from solo_company_os.core.skill_cache import SkillDiscoveryCache
+from solo_company_os.core.skill_index import SkillIndex, discover_skills
+from solo_company_os.core.skill_pack import write_skill_pack
+from solo_company_os.core.skill_search import tokenize
+
+
+def test_tokenize_words_and_cjk_bigrams():
+    assert tokenize("FastAPI starter-kit") == ["fastapi", "starter", "kit"]
+    assert tokenize("生成项目 v2") == ["v2", "生成", "成项", "项目"]
+
+
+def test_search_ranks_and_follows_edits(tmp_path: Path):
+    def write(name, description, body=""):
+        (tmp_path / name).mkdir(exist_ok=True)
+        (tmp_path / name / "SKILL.md").write_text(
+            f"---\nname: {name}\ndescription: {description}\n---\n\n{body}", encoding="utf-8"
+        )
+
+    write("web-scraper", "Scrape web pages into CSV.", "## Pagination\n")
+    write("pdf-report", "Render a PDF report from markdown.")
+    write("data-clean", "清洗数据表格并去重。")
+    idx = SkillIndex(discover_skills(roots=[str(tmp_path)]).skills)
+
+    assert idx.search("scrape pages with pagination", 2)[0][0] == "web-scraper"
+    assert idx.search("帮我清洗数据", 1)[0][0] == "data-clean"
+    assert [name for name, _ in idx.shortlist("pdf", 2)] == ["pdf-report", "data-clean"]
+
+    # Body edits are picked up by the same index.
+    write("data-clean", "清洗数据表格并去重。", "## Scrape cleanup\n")
+    assert {name for name, _ in idx.search("scrape", 3)} == {"web-scraper", "data-clean"}
+
+    # A rediscovered index reuses the old postings and re-tokenizes only what changed.
+    write("pdf-report", "Render a PDF report; also scrape pages behind a login.")
+    fresh = SkillIndex(discover_skills(roots=[str(tmp_path)]).skills)
+    fresh.adopt_search_index(idx)
+    assert {name for name, _ in fresh.search("scrape", 3)} == {"web-scraper", "data-clean", "pdf-report"}
+
+
+def test_search_headings_persist_in_discovery_cache(tmp_path: Path, monkeypatch):
+    root = tmp_path / "skills"
+    (root / "web-scraper").mkdir(parents=True)
+    (root / "web-scraper" / "SKILL.md").write_text(
+        "---\nname: web-scraper\ndescription: Fetch pages.\n---\n\n## Pagination\n", encoding="utf-8"
+    )
+    cache_path = tmp_path / "cache.json"
+    cache = SkillDiscoveryCache(cache_path)
+    SkillIndex(discover_skills(roots=[str(root)], cache=cache).skills, cache=cache).search("pagination", 1)
+
+    def no_body_reads(path):
+        raise AssertionError(f"read body of {path}")
+
+    monkeypatch.setattr("solo_company_os.core.skill_cache.load_skill_body", no_body_reads)
+    cache = SkillDiscoveryCache(cache_path)  # a fresh process
+    idx = SkillIndex(discover_skills(roots=[str(root)], cache=cache).skills, cache=cache)
+    assert idx.search("pagination", 1)[0][0] == "web-scraper"
+    assert cache.misses == 0
+
+
+def test_plan_prompt_uses_shortlist(tmp_path: Path):
+    idx = SkillIndex(discover_skills(roots=[".agents/skills"]).skills)
+
+    class RecordingProvider(MockProvider):
+        def __init__(self):
+            super().__init__()
+            self.prompts = []
+
+        def complete_json(self, *, system, user, schema_hint, **kwargs):
+            self.prompts.append(user)
+            return super().complete_json(system=system, user=user, schema_hint=schema_hint, **kwargs)
+
+    provider = RecordingProvider()
+    run_mission(
+        mission="Write a PRD for a retrospective tool",
+        skill_index=idx,
+        provider=provider,
+        run_dir=tmp_path / "run",
+        workspace=tmp_path / "run" / "workspace",
+        skill_top_k=2,
+    )
+    listed = provider.prompts[0].split("AVAILABLE_SKILLS:\n", 1)[1].split("\n\n", 1)[0].splitlines()
+    assert len(listed) == 2
+
+    events = [json.loads(line) for line in (tmp_path / "run" / "trace.jsonl").read_text(encoding="utf-8").splitlines()]
+    shortlist = next(e for e in events if e["type"] == "plan.shortlist")["payload"]
+    assert shortlist["k"] == 2 and shortlist["total"] == len(idx.skills)
+    assert {s["name"] for s in shortlist["skills"]} <= {n for n, _ in idx.list_compact()}
+
+
+def test_references_selected_by_relevance_within_budget(tmp_path: Path):
+    root = tmp_path / "skills"
+    folder = root / "api-design"
+    (folder / "references").mkdir(parents=True)
+    (folder / "SKILL.md").write_text(
+        "---\nname: api-design\ndescription: Design HTTP APIs.\n---\n\n# api-design\n", encoding="utf-8"
+    )
+    (folder / "references" / "pagination.md").write_text("# Pagination\nUse cursor pagination.\n" * 5, encoding="utf-8")
+    (folder / "references" / "auth.md").write_text("# Auth\nUse OAuth tokens.\n" * 5, encoding="utf-8")
+    (folder / "references" / "huge-pagination.md").write_text("pagination " * 5000, encoding="utf-8")
+    (folder / "logo.png").write_bytes(b"\x89PNG\0\0pagination")
+
+    idx = SkillIndex(discover_skills(roots=[str(root)]).skills)
+    assert [r.path for r in idx.resources("api-design")] == [
+        "logo.png",
+        "references/auth.md",
+        "references/huge-pagination.md",
+        "references/pagination.md",
+    ]
+
+    chosen = idx.select_references("api-design", "Add cursor pagination to the list endpoint", 500)
+    assert [res.path for res, _text, _score in chosen] == ["references/pagination.md"]
+    assert chosen[0][1].startswith("# Pagination")
+    assert idx.select_references("api-design", "pagination", 0) == []
+
+    # Packed skills carry their resources.
+    write_skill_pack(idx.skills, tmp_path / "skills.scpack")
+    packed = SkillIndex(discover_skills(roots=[str(tmp_path / "skills.scpack")]).skills)
+    again = packed.select_references("api-design", "Add cursor pagination to the list endpoint", 500)
+    assert [(res.path, text) for res, text, _ in again] == [(res.path, text) for res, text, _ in chosen]
+
+
+def test_resources_are_listed_on_first_use_not_at_discovery(tmp_path: Path, monkeypatch):
+    root = tmp_path / "skills"
+    folder = root / "api-design"
+    (folder / "references").mkdir(parents=True)
+    (folder / "SKILL.md").write_text("---\nname: api-design\ndescription: Design APIs.\n---\n", encoding="utf-8")
+    notes = folder / "references" / "pagination.md"
+    notes.write_text("# Pagination\nUse cursor pagination.\n", encoding="utf-8")
+
+    def no_walk(folder):
+        raise AssertionError(f"discovery listed {folder}")
+
+    monkeypatch.setattr("solo_company_os.core.skill_resources.iter_resource_files", no_walk)
+    idx = SkillIndex(discover_skills(roots=[str(root)]).skills)
+    monkeypatch.undo()
+    (res,) = idx.resources("api-design")
+    assert res.sha256 is None and res.mtime_ns == notes.stat().st_mtime_ns
+
+    # The same index follows edits and new files.
+    notes.write_text("# Pagination\nUse keyset pagination with cursors.\n", encoding="utf-8")
+    [(_res, text, _score)] = idx.select_references("api-design", "keyset pagination", 500)
+    assert "keyset" in text
+    (folder / "references" / "keyset.md").write_text("# Keyset\nKeyset pagination details.\n", encoding="utf-8")
+    assert [r.path for r in idx.resources("api-design")] == ["references/keyset.md", "references/pagination.md"]
@@ -0,0 +1,120 @@
+import threading
+import time
+from pathlib import Path
+
+import httpx
+
+from solo_company_os.integrations.skillsmp import SkillsMPClient, SkillsMPConfig, extract_items
+
+
+def _fixture_transport(calls):
+    lock = threading.Lock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params.get("page", "1"))
+        with lock:
+            calls.append((page, request.headers.get("if-none-match")))
+        if request.headers.get("if-none-match") == f'"p{page}"':
+            return httpx.Response(304)
+        time.sleep(0.05)
+        body = {
+            "data": {"skills": [{"name": f"skill-{page}-{i}"} for i in range(2)]},
+            "pagination": {"total": 7, "page": page},
+        }
+        return httpx.Response(200, json=body, headers={"ETag": f'"p{page}"'})
+
+    return httpx.MockTransport(handler)
+
+
+def test_pages_fetched_concurrently_and_cached(tmp_path: Path):
+    calls = []
+    config = SkillsMPConfig(api_key="k", base_url="http://fixture", cache_dir=tmp_path, max_concurrency=4)
+    with SkillsMPClient(config, transport=_fixture_transport(calls)) as client:
+        t0 = time.perf_counter()
+        pages = client.keyword_search_pages("pdf", pages=10, limit=2)
+        elapsed = time.perf_counter() - t0
+    names = [item["name"] for page in pages for item in extract_items(page)]
+    assert names[:3] == ["skill-1-0", "skill-1-1", "skill-2-0"]
+    assert len(pages) == 4  # total=7, limit=2
+    assert elapsed < 0.05 * 4  # pages 2-4 overlapped
+
+    # Repeated search: served from disk, no requests.
+    calls.clear()
+    with SkillsMPClient(config, transport=_fixture_transport(calls)) as client:
+        assert client.keyword_search_pages("pdf", pages=10, limit=2) == pages
+    assert calls == []
+
+    # Expired entries are revalidated with the stored ETag.
+    config.cache_ttl = 0
+    with SkillsMPClient(config, transport=_fixture_transport(calls)) as client:
+        assert client.keyword_search("pdf", page=1, limit=2) == pages[0]
+    assert calls == [(1, '"p1"')]
+
+
+def _repo_zip(files):
+    import io
+    import zipfile
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        for name, content in files.items():
+            zf.writestr(f"repo-main/{name}", content)
+    return buf.getvalue()
+
+
+def test_install_downloads_once_verifies_and_mirrors(tmp_path: Path):
+    from solo_company_os.integrations.skill_install import SkillInstaller, SkillMirror
+
+    archive = _repo_zip(
+        {
+            "skills/alpha/SKILL.md": "---\nname: alpha\ndescription: Alpha skill.\n---\n\n# alpha\n",
+            "skills/alpha/references/notes.md": "notes\n",
+            "skills/beta/SKILL.md": "---\nname: beta\ndescription: Beta skill.\n---\n",
+            "skills/bad/SKILL.md": "---\nname: not-bad\ndescription: Wrong name.\n---\n",
+            "skills/evil/SKILL.md": "---\nname: evil\ndescription: Evil.\n---\n",
+            "skills/evil/../../../escape.txt": "x",
+        }
+    )
+    downloads = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "api.fixture":
+            q = request.url.params["q"]
+            if q == "garbled":
+                return httpx.Response(200, text="<html>gateway error</html>")
+            return httpx.Response(
+                200,
+                json={"skills": [{"name": q, "githubUrl": f"https://github.com/o/repo/tree/main/skills/{q}"}]},
+            )
+        downloads.append(str(request.url))
+        return httpx.Response(200, content=archive)
+
+    transport = httpx.MockTransport(handler)
+    client = SkillsMPClient(
+        SkillsMPConfig(api_key="k", base_url="http://api.fixture", cache_dir=tmp_path / "cache"),
+        transport=transport,
+    )
+    mirror = SkillMirror(tmp_path / "mirror")
+    installer = SkillInstaller(
+        dest_dir=tmp_path / "skills",
+        mirror=mirror,
+        skillsmp=client,
+        http=httpx.Client(transport=transport),
+    )
+    results = {r.name: r for r in installer.install(["alpha", "beta", "bad", "evil", "garbled"])}
+
+    assert results["alpha"].status == "installed"
+    assert results["beta"].status == "installed"
+    assert results["bad"].status == "failed" and "must match directory name" in results["bad"].detail
+    assert results["evil"].status == "failed" and "Unsafe path" in results["evil"].detail
+    assert results["garbled"].status == "failed"  # a non-JSON API reply fails only its own name
+    assert (tmp_path / "skills" / "alpha" / "references" / "notes.md").read_text() == "notes\n"
+    assert not (tmp_path / "bad").exists() and not (tmp_path / "escape.txt").exists()
+    assert downloads == ["https://codeload.github.com/o/repo/zip/main"]
+    assert mirror.object_path(results["alpha"].sha256).exists()
+
+    # Another machine installs from the mirror alone.
+    with SkillInstaller(dest_dir=tmp_path / "other", mirror=mirror, offline=True) as offline:
+        assert [r.status for r in offline.install(["alpha", "beta"])] == ["installed", "installed"]
+        assert [r.status for r in offline.install(["alpha"])] == ["exists"]
+    assert offline.http.is_closed
@@ -0,0 +1,166 @@
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from solo_company_os.core.orchestrator import run_mission
+from solo_company_os.core.providers.base import CallUsage, ResponseParseError
+from solo_company_os.core.providers.mock import MockProvider
+from solo_company_os.core.providers.openai_compatible import (
+    OpenAICompatibleConfig,
+    OpenAICompatibleProvider,
+)
+from solo_company_os.core.providers.replay import ReplayProvider
+from solo_company_os.core.schema import (
+    Plan,
+    SkillExecutionResult,
+    response_format,
+    strict_json_schema,
+)
+from solo_company_os.core.skill_index import SkillIndex, discover_skills
+
+
+def _objects(node):
+    if isinstance(node, dict):
+        if node.get("type") == "object":
+            yield node
+        for v in node.values():
+            yield from _objects(v)
+    elif isinstance(node, list):
+        for v in node:
+            yield from _objects(v)
+
+
+def test_strict_schemas_require_every_field():
+    for model in (Plan, SkillExecutionResult):
+        schema = strict_json_schema(model)
+        objects = list(_objects(schema))
+        assert objects and all(o["additionalProperties"] is False for o in objects)
+        assert all(o["required"] == list(o["properties"]) for o in objects)
+        assert "default" not in json.dumps(schema)
+    assert "title" in strict_json_schema(Plan)["$defs"]["WorkOrder"]["properties"]
+    # What a strict backend returns (every key present, nulls for optional fields) still validates.
+    Plan.model_validate({
+        "mode": "build",
+        "work_orders": [{"id": "WO-1", "title": "t", "skill": "s", "outputs": [], "notes": None}],
+        "assumptions": [],
+    })
+
+
+def test_openai_provider_falls_back_when_schema_is_rejected():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        seen.append("response_format" in body)
+        if "response_format" in body:
+            return httpx.Response(400, json={"error": {"message": "response_format json_schema not supported"}})
+        return httpx.Response(200, json={"choices": [{"message": {"content": '{"summary": "ok"}'}}]})
+
+    provider = OpenAICompatibleProvider(
+        OpenAICompatibleConfig(api_key="k", base_url="http://llm.test/v1"), transport=httpx.MockTransport(handler)
+    )
+    extra = {"response_format": response_format(SkillExecutionResult)}
+    for _ in range(2):
+        data, usage = provider.complete_json_with_usage(system="s", user="u", schema_hint="h", extra=extra)
+        assert data == {"summary": "ok"} and usage.structured is False
+    assert seen == [True, False, False]  # rejected once, then never sent again
+
+    accepted = OpenAICompatibleProvider(
+        OpenAICompatibleConfig(api_key="k", base_url="http://llm.test/v1"),
+        transport=httpx.MockTransport(
+            lambda r: httpx.Response(200, json={"choices": [{"message": {"content": "{}"}}]})
+        ),
+    )
+    assert accepted.complete_json_with_usage(system="s", user="u", schema_hint="h", extra=extra)[1].structured
+
+
+def test_openai_provider_raises_other_client_errors_without_retrying():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append("response_format" in json.loads(request.content))
+        return httpx.Response(400, json={"error": {"message": "maximum context length is 128000 tokens"}})
+
+    provider = OpenAICompatibleProvider(
+        OpenAICompatibleConfig(api_key="k", base_url="http://llm.test/v1"), transport=httpx.MockTransport(handler)
+    )
+    extra = {"response_format": response_format(SkillExecutionResult)}
+    with pytest.raises(httpx.HTTPStatusError):
+        provider.complete_json_with_usage(system="s", user="u", schema_hint="h", extra=extra)
+    with pytest.raises(httpx.HTTPStatusError):
+        provider.complete_json_with_usage(system="s", user="u", schema_hint="h", extra=extra)
+    assert seen == [True, True]  # sent once per call, and the schema stays on
+
+
+class _FlakyProvider(MockProvider):
+    """Returns an invalid execution result for `skill` until the prompt carries a repair request."""
+
+    def __init__(self, skill: str, repairable: bool):
+        self.skill = skill
+        self.repairable = repairable
+
+    def complete_json(self, **kwargs):
+        data = super().complete_json(**kwargs)
+        user = kwargs["user"]
+        if f"SKILL: {self.skill}\n" in user and not (self.repairable and "PREVIOUS_OUTPUT_INVALID" in user):
+            return {"files": "docs/PRD.md", "summary": data.get("summary", "")}
+        return data
+
+
+def _run(tmp_path: Path, provider):
+    idx = SkillIndex(discover_skills(roots=[".agents/skills"]).skills)
+    return run_mission(
+        mission="Write a PRD for a note app",
+        skill_index=idx,
+        provider=provider,
+        run_dir=tmp_path,
+        workspace=tmp_path / "workspace",
+    )
+
+
+def test_invalid_result_is_repaired_instead_of_dropped(tmp_path: Path):
+    summary = _run(tmp_path / "repaired", _FlakyProvider("pm-prd", repairable=True))
+    stats = summary.structured
+    assert (stats.invalid, stats.repaired, stats.dropped) == (1, 1, 0)
+    assert (summary.workspace / "docs" / "PRD.md").is_file()
+    events = [json.loads(line) for line in (tmp_path / "repaired" / "trace.jsonl").open(encoding="utf-8")]
+    errors = [e["payload"] for e in events if e["type"] == "skill.exec.parse_error"]
+    assert [(e["work_order"], e["attempt"]) for e in errors] == [("WO-1", 0)]
+    assert any(e["payload"].get("repair") == 1 for e in events if e["type"] == "skill.exec.request")
+    report = (tmp_path / "repaired" / "RUN.md").read_text(encoding="utf-8")
+    assert "## Structured output" in report and "repaired by a retry (failures avoided): 1" in report
+
+    summary = _run(tmp_path / "dropped", _FlakyProvider("pm-prd", repairable=False))
+    assert (summary.structured.invalid, summary.structured.repaired, summary.structured.dropped) == (2, 0, 1)
+    assert any("pm-prd" in w for w in summary.warnings)
+    assert not (summary.workspace / "docs" / "PRD.md").exists()
+
+
+class _ProseOnceProvider(MockProvider):
+    """Answers the first pm-prd execution with prose, the way a chatty model does."""
+
+    def __init__(self):
+        self.prose_sent = False
+
+    def complete_json_with_usage(self, **kwargs):
+        if "SKILL: pm-prd\n" in kwargs["user"] and not self.prose_sent:
+            self.prose_sent = True
+            usage = CallUsage(model="gpt-4o", prompt_tokens=1000, completion_tokens=50)
+            raise ResponseParseError("Model did not return JSON", raw_text="Sure! Here is the PRD.", usage=usage)
+        return super().complete_json_with_usage(**kwargs)
+
+
+def test_non_json_reply_is_billed_traced_and_replayable(tmp_path: Path):
+    summary = _run(tmp_path / "live", _ProseOnceProvider())
+    assert (summary.structured.invalid, summary.structured.repaired) == (1, 1)
+    assert any(r.usage.prompt_tokens == 1000 for r in summary.usage.rows)
+    events = [json.loads(line) for line in (tmp_path / "live" / "trace.jsonl").open(encoding="utf-8")]
+    prose = [e["payload"] for e in events if e["payload"].get("raw_text")]
+    assert prose and prose[0]["usage"]["prompt_tokens"] == 1000
+
+    replay = ReplayProvider.from_run_dir(tmp_path / "live", strict=True)
+    replayed = _run(tmp_path / "replayed", replay)
+    assert (replayed.structured.invalid, replayed.structured.repaired) == (1, 1)
+    assert replay.fallbacks == 0
@@ -0,0 +1,84 @@
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from solo_company_os.core.orchestrator import run_mission
+from solo_company_os.core.providers.base import CallUsage
+from solo_company_os.core.providers.mock import MockProvider
+from solo_company_os.core.providers.openai_compatible import (
+    OpenAICompatibleConfig,
+    OpenAICompatibleProvider,
+)
+from solo_company_os.core.skill_index import SkillIndex, discover_skills
+from solo_company_os.core.usage import PriceTable, PriceTableError
+
+
+def test_openai_provider_reports_usage_and_timing():
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert json.loads(request.content)["model"] == "gpt-4o-mini"
+        return httpx.Response(
+            200,
+            json={
+                "model": "gpt-4o-mini-2024-07-18",
+                "choices": [{"message": {"content": '{"ok": true}'}}],
+                "usage": {"prompt_tokens": 1000, "completion_tokens": 500, "total_tokens": 1500},
+            },
+        )
+
+    provider = OpenAICompatibleProvider(
+        OpenAICompatibleConfig(api_key="k", base_url="http://llm.test/v1", model="gpt-4o-mini"),
+        transport=httpx.MockTransport(handler),
+    )
+    data, usage = provider.complete_json_with_usage(system="s", user="u", schema_hint="h")
+    assert data == {"ok": True}
+    assert (usage.model, usage.prompt_tokens, usage.completion_tokens) == ("gpt-4o-mini-2024-07-18", 1000, 500)
+    assert usage.ttfb_s is not None and 0 <= usage.ttfb_s <= usage.latency_s
+    # Dated model ids fall back to the longest priced prefix.
+    assert PriceTable.load().cost(usage) == pytest.approx((1000 * 0.15 + 500 * 0.60) / 1e6)
+
+
+def test_price_table_file_overrides(tmp_path: Path):
+    path = tmp_path / "prices.json"
+    path.write_text(json.dumps({"gpt-4o": {"input": 1, "output": 2}, "local-llm": [0, 0]}), encoding="utf-8")
+    table = PriceTable.load(path)
+    assert table.cost(CallUsage(model="gpt-4o-2024-08-06", prompt_tokens=1_000_000, completion_tokens=0)) == 1.0
+    assert table.cost(CallUsage(model="local-llm")) == 0.0
+    assert table.cost(CallUsage(model="unknown-model", prompt_tokens=1, completion_tokens=1)) is None
+
+    path.write_text(json.dumps({"bad": {"input": 1}}), encoding="utf-8")
+    with pytest.raises(PriceTableError):
+        PriceTable.load(path)
+
+
+class _CountingProvider(MockProvider):
+    def complete_json_with_usage(self, **kwargs):
+        data = self.complete_json(**kwargs)
+        return data, CallUsage(
+            model="gpt-4o", prompt_tokens=len(kwargs["user"]), completion_tokens=100, ttfb_s=0.01, latency_s=0.02
+        )
+
+
+def test_run_records_usage_in_trace_and_run_report(tmp_path: Path):
+    idx = SkillIndex(discover_skills(roots=[".agents/skills"]).skills)
+    summary = run_mission(
+        mission="Write a PRD for a note app",
+        skill_index=idx,
+        provider=_CountingProvider(),
+        run_dir=tmp_path,
+        workspace=tmp_path / "workspace",
+    )
+    events = [json.loads(line) for line in (tmp_path / "trace.jsonl").open(encoding="utf-8")]
+    responses = [e["payload"]["usage"] for e in events if e["type"] in ("plan.response", "skill.exec.response")]
+    assert len(responses) == summary.usage.calls == len(summary.plan.work_orders) + 1
+    assert all(u["model"] == "gpt-4o" and u["completion_tokens"] == 100 for u in responses)
+
+    done = next(e for e in events if e["type"] == "mission.done")["payload"]["usage"]
+    assert done["completion_tokens"] == 100 * summary.usage.calls
+    assert done["cost_usd"] == pytest.approx(sum(u["cost_usd"] for u in responses), abs=1e-5)
+
+    report = (tmp_path / "RUN.md").read_text(encoding="utf-8")
+    assert "## Usage" in report
+    assert "| WO-1 | pm-prd | gpt-4o |" in report
+    assert f"| **Total** | | | {done['prompt_tokens']} | 0 | {done['completion_tokens']} |" in report